@@ -1,16 +1,22 @@
 import sys
+import json
 import argparse
-import shutil
+import contextlib
 from datetime import datetime
-from src.utils.os_utils import get_current_os, OperatingSystem
+from src.utils.os_utils import get_current_os, OperatingSystem, file_fingerprint
 from src.utils.node_finder.mac import NodeFinderMac, NodeNotFoundError
-from src.installers.cursor.mac.installer import CursorMacInstaller
-from src.installers.claude_desktop.mac.installer import ClaudeDesktopMacInstaller
-from src.installers.claude_code.mac.installer import ClaudeCodeMacInstaller
-from src.installers.windsurf.mac.installer import WindsurfMacInstaller
+from src.installers.registry import installer_registry
 from src.base.base_installer import BaseInstaller
+from src.base.plan import Change, Plan, PlanError
 from src.utils.logger import configure_logger, LogLevel, get_logger
-from src.consts import DOWNLOAD_URLS, PlatformName, PACKAGE_NAME, PACKAGE_VERSION
+from src.utils.config_document import invalidate_document
+from src.utils.backup_store import BackupStore
+from src.utils.client_runner import ClientResult, ClientStatus, run_clients
+from src.utils.receipt import Receipt
+from src.utils.file_watcher import FileWatcher, POLL_INTERVAL_SECONDS
+from src.utils.atomic_write import committed_fingerprint
+from src.utils.manifest import Action, Manifest, ManifestError, load_manifest
+from src.consts import DOWNLOAD_URLS, PlatformName, PACKAGE_NAME, PACKAGE_VERSION, APPLICATION_NAME, ExitCode
 import os
 # Create a logger for this module
 logger = get_logger(__name__)
@@ -18,29 +24,6 @@ logger = get_logger(__name__)
 def print_welcome():
     print(f"\n=== Mint Security Proxy Installer ({PACKAGE_VERSION}) ===\n")
 
-installer_objects = {
-    "cursor": {
-        "mac": CursorMacInstaller(),
-        "linux": None,
-        "windows": None
-    },
-    "claude-desktop": {
-        "mac": ClaudeDesktopMacInstaller(),
-        "linux": None,
-        "windows": None
-    },
-    "claude-code": {
-        "mac": ClaudeCodeMacInstaller(),
-        "linux": None,
-        "windows": None
-    },
-    "windsurf": {
-        "mac": WindsurfMacInstaller(),
-        "linux": None,
-        "windows": None
-    }
-}
-
 def detect_os():
     try:
         os_type = get_current_os()
@@ -87,29 +70,71 @@ def get_client_selection(show_install_all=False):
         print("Invalid selection.")
         return None
 
-def uninstall_all(os_type):
+def client_title(app):
+    return app.replace('-', ' ').title()
+
+def get_client_tasks(os_key):
+    """(client, installer) pairs of every client supported on this OS, in menu order."""
+    return list(installer_registry.installers(os_key))
+
+def install_client(app, installer, os_name):
+    title = client_title(app)
+    if installer.is_client_installed():
+        return ClientResult(app, ClientStatus.SKIPPED, [
+            f"{title} is already installed, skipping installation. Please uninstall it first."])
+    messages = [f"Running installation for {title} on {os_name}"]
+    try:
+        installer.run_client_installation()
+    except Exception as e:
+        messages.append(f"Error installing {app} on {os_name}: {e}")
+        return ClientResult(app, ClientStatus.FAILED, messages, error=str(e))
+    messages.extend(installer.warnings)
+    messages.append(f"Installation for {title} on {os_name} completed")
+    messages.append(f" >>> NOTE: In order for the installation to take effect, restart {installer.APP_NAME}. <<<")
+    return ClientResult(app, ClientStatus.INSTALLED, messages)
+
+def uninstall_client(app, installer):
+    title = client_title(app)
+    messages = [f"Uninstalling {title}..."]
+    if not installer.is_client_installed():
+        messages.append(f"{title} is not installed, skipping uninstallation")
+        return ClientResult(app, ClientStatus.SKIPPED, messages)
+    try:
+        uninstalled = installer.run_client_uninstallation()
+    except Exception as e:
+        messages.append(f"Error uninstalling {app}: {e}")
+        return ClientResult(app, ClientStatus.FAILED, messages, error=str(e))
+    if not uninstalled:
+        messages.append(f"Failed to uninstall {title}")
+        return ClientResult(app, ClientStatus.FAILED, messages)
+    messages.extend(installer.warnings)
+    messages.append(f"Successfully uninstalled {title}")
+    messages.append(f" >>> NOTE: In order for the uninstallation to take effect, restart {installer.APP_NAME}. <<<")
+    return ClientResult(app, ClientStatus.UNINSTALLED, messages)
+
+def print_results(results):
+    """Print each client's messages in client order, then a one-line-per-client summary."""
+    results = list(results)
+    for result in results:
+        for message in result.messages:
+            print(message)
+        if result.error and not result.messages:
+            print(f"Error running {result.client}: {result.error}")
+    if len(results) > 1:
+        print("\nSummary:")
+        for result in results:
+            print(f"  {client_title(result.client)}: {result.status}")
+    return results
+
+def uninstall_all(os_type, max_workers=None):
     os_key = os_type.name.lower()
     print("\nUninstalling all applications...")
         
     # Uninstall application
     BaseInstaller.uninstall_application()
 
-    # Then proceed with application uninstallation
-    for app, os_map in installer_objects.items():
-        try:
-            installer = os_map.get(os_key)
-            if installer:
-                print(f"Uninstalling {app.replace('-', ' ').title()}...")
-                if not installer.is_client_installed():
-                    print(f"{app.replace('-', ' ').title()} is not installed, skipping uninstallation")
-                    continue
-                if installer.run_client_uninstallation():
-                    print(f"Successfully uninstalled {app.replace('-', ' ').title()}")
-                    print(f" >>> NOTE: In order for the uninstallation to take effect, restart {installer.APP_NAME}. <<<")
-                else:
-                    print(f"Failed to uninstall {app.replace('-', ' ').title()}")
-        except Exception as e:
-            print(f"Error uninstalling {app}: {e}")
+    # Then proceed with the clients, concurrently unless max_workers is 1
+    print_results(run_clients(get_client_tasks(os_key), uninstall_client, max_workers))
 
     # Remove the installation folders
     if BaseInstaller.remove_installation_folders():
@@ -119,18 +144,135 @@ def uninstall_all(os_type):
 
 
 
-def get_backup_info(backup_path):
-    """Get backup file creation time information."""
+def wrap_new_servers(app, installer):
+    """Wrap the servers added to a client's config since it was installed; returns how many were wrapped."""
+    changes = installer.config_creator.plan_wrap_new_servers()
+    if not changes:
+        return 0
+    Plan(changes).apply()
+    wrapped = [name for change in changes for name in change.details.get("wrapped", [])]
+    for projects in (change.details.get("projects", {}) for change in changes):
+        wrapped.extend(name for server_changes in projects.values() for name in server_changes.get("wrapped", []))
+    print(f"Wrapped {len(wrapped)} new MCP server(s) in {client_title(app)}: {', '.join(wrapped)}")
+    return len(wrapped)
+
+def watch_clients(os_type, poll_interval=POLL_INTERVAL_SECONDS):
+    """
+    Keep running and wrap MCP servers as users add them to installed clients.
+    Each debounced burst of changes to a config file costs one read and at
+    most one write; files whose last write was ours are ignored.
+    """
+    installers = {}
+    for app, installer in installer_registry.installers(os_type.name.lower()):
+        installers[os.path.abspath(installer.config_creator.config_file_path)] = (app, installer)
+
+    # Catch up on servers added while nothing was watching
+    for path, (app, installer) in installers.items():
+        try:
+            wrap_new_servers(app, installer)
+        except Exception as e:
+            print(f"Error wrapping new servers of {client_title(app)}: {e}")
+
+    with FileWatcher(list(installers), poll_interval=poll_interval) as watcher:
+        print(f"Watching {len(installers)} client config files ({watcher.backend_name}), press Ctrl+C to stop")
+        try:
+            while True:
+                for path in sorted(watcher.wait()):
+                    if file_fingerprint(path) == committed_fingerprint(path):
+                        logger.debug(f"Ignoring our own write to {path}")
+                        continue
+                    app, installer = installers[path]
+                    try:
+                        wrap_new_servers(app, installer)
+                    except Exception as e:
+                        print(f"Error wrapping new servers of {client_title(app)}: {e}")
+                        logger.exception("Exception details:")
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+
+def format_backup_date(created):
+    return datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S")
+
+def legacy_backup_file(config_path):
+    """The single-file backup older installers left next to a config."""
+    return f"{config_path}.backup"
+
+def import_legacy_backup(store, client_name, config_path):
+    """Move a single-file <config>.backup left by older installers into the backup store."""
+    legacy_backup_path = legacy_backup_file(config_path)
+    if not os.path.exists(legacy_backup_path):
+        return
     try:
-        if os.path.exists(backup_path):
-            # Get file modification time
-            mtime = os.path.getmtime(backup_path)
-            backup_date = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
-            return backup_date
-        return None
+        store.snapshot(client_name, legacy_backup_path, created=os.path.getmtime(legacy_backup_path),
+                       source_path=config_path)
+        os.remove(legacy_backup_path)
     except Exception as e:
-        logger.error(f"Error getting backup info: {e}")
+        logger.error(f"Error importing legacy backup {legacy_backup_path}: {e}")
+
+def get_generation_selection(generations):
+    """Ask which backup generation to restore; the newest one is the default."""
+    print("\nAvailable backups:")
+    for number, generation in enumerate(generations, start=1):
+        print(f"{number}. {format_backup_date(generation.created)} ({generation.size} bytes)")
+    choice = input(f"Enter the number of the backup to restore [1]: ").strip() or "1"
+    if not choice.isdigit() or not 1 <= int(choice) <= len(generations):
+        print("Invalid selection.")
         return None
+    return generations[int(choice) - 1]
+
+def revert_client_config(app, installer, generation):
+    """Uninstall `app` if needed and restore its config from `generation`."""
+    title = client_title(app)
+    config_path = installer.config_creator.config_file_path
+    backup_date = format_backup_date(generation.created)
+    messages = []
+    try:
+        # Check if currently installed and uninstall if needed
+        if installer.is_client_installed():
+            messages.append(f"Uninstalling {title} first...")
+            if not installer.run_client_uninstallation():
+                messages.append(f"Failed to uninstall {title}")
+                return ClientResult(app, ClientStatus.FAILED, messages, error="uninstallation failed")
+            messages.append(f"Successfully uninstalled {title}")
+        else:
+            messages.append(f"{title} is not currently installed")
+        
+        # Restore the backup over the original config
+        messages.append(f"Restoring config file from backup...")
+        BackupStore().restore(generation, config_path)
+        invalidate_document(config_path)
+        messages.append(f"Successfully restored config file from backup")
+        messages.append(f"Config file reverted to state from {backup_date}")
+        
+        messages.append(f"\n >>> NOTE: Please restart {installer.APP_NAME} for changes to take effect. <<<")
+        return ClientResult(app, ClientStatus.REVERTED, messages)
+        
+    except Exception as e:
+        messages.append(f"Error during revert operation: {e}")
+        logger.error(f"Revert error: {e}")
+        return ClientResult(app, ClientStatus.FAILED, messages, error=str(e))
+
+def get_client_generations(installer):
+    """Backup generations of a client, newest first, after importing any legacy backup file."""
+    config_creator = installer.config_creator
+    store = BackupStore()
+    import_legacy_backup(store, config_creator.app_name, config_creator.config_file_path)
+    return store.generations(config_creator.app_name)
+
+def list_client_generations(installer):
+    """
+    Backup generations of a client, newest first, as get_client_generations
+    would return them, without importing a legacy backup file or writing anything.
+    """
+    config_creator = installer.config_creator
+    store = BackupStore()
+    legacy_backup_path = legacy_backup_file(config_creator.config_file_path)
+    if not os.path.exists(legacy_backup_path):
+        return store.generations(config_creator.app_name)
+    pending = store.pending_generation(config_creator.app_name, legacy_backup_path,
+                                       created=os.path.getmtime(legacy_backup_path),
+                                       source_path=config_creator.config_file_path)
+    return store.generations_with(pending)
 
 def revert_client(os_type):
     """Revert a client configuration from backup."""
@@ -143,30 +285,24 @@ def revert_client(os_type):
     
     os_key = os_type.name.lower()
     app_key = selection.lower().replace(' ', '-')
-    installer = installer_objects.get(app_key, {}).get(os_key)
+    installer = installer_registry.get(app_key, os_key)
     
     if not installer:
         print(f"No installer available for {selection} on {os_type.name}")
         return
     
-    # Get backup file path
-    config_path = installer.config_creator.config_file_path
-    config_dir = os.path.dirname(config_path)
-    config_filename = os.path.basename(config_path)
-    backup_path = os.path.join(config_dir, f"{config_filename}.backup")
-    
-    # Check if backup exists
-    if not os.path.exists(backup_path):
+    # List the backup generations from the store index
+    generations = get_client_generations(installer)
+    if not generations:
         print(f"No backup file found for {selection}")
         print("Cannot proceed with revert.")
         return
     
-    # Get backup creation date
-    backup_date = get_backup_info(backup_path)
-    if backup_date:
-        print(f"\nNOTE: The revert will restore the config file from backup created on {backup_date}")
-    else:
-        print(f"\nNOTE: The revert will restore the config file from the available backup")
+    generation = get_generation_selection(generations)
+    if not generation:
+        return
+    backup_date = format_backup_date(generation.created)
+    print(f"\nNOTE: The revert will restore the config file from backup created on {backup_date}")
     
     # Ask for user confirmation
     confirm = input("Do you want to proceed with the revert? (y/N): ").strip().lower()
@@ -174,31 +310,182 @@ def revert_client(os_type):
         print("Revert operation cancelled.")
         return
     
-    try:
-        # Check if currently installed and uninstall if needed
+    print_results([revert_client_config(app_key, installer, generation)])
+
+def prepare_package(download, package_path=None, sha256=None):
+    """Download the proxy package (verified against `sha256` when given) or locate the local one; returns its path, or "" on failure."""
+    if download:
+        package_path = BaseInstaller.download_application(DOWNLOAD_URLS[PlatformName.MAC], sha256)
+        if not package_path:
+            print("Could not download the proxy package.")
+            return ""
+        logger.info(f"Downloaded package to: {package_path}")
+        return package_path
+
+    package_path = package_path or os.path.abspath(PACKAGE_NAME)
+    if not os.path.exists(package_path):
+        print(f"Local package {package_path} not found.")
+        return ""
+    logger.info(f"Using local package: {package_path}")
+    return package_path
+
+def run_client_action(client_action, installer, os_name, receipt=None):
+    """Run one manifest entry on its installer, skipping installs the receipt shows are still in place."""
+    app = client_action.client
+    if client_action.action == Action.INSTALL:
+        if receipt is not None and receipt.client_matches(app, installer.touched_paths(), installer.owned_state):
+            return ClientResult(app, ClientStatus.SKIPPED, [f"{client_title(app)} is unchanged since the last run, skipping"])
+        result = install_client(app, installer, os_name)
+        if receipt is not None and result.succeeded:
+            receipt.record_client(app, installer.touched_paths(), installer.owned_state())
+        return result
+
+    if client_action.action == Action.UNINSTALL:
+        result = uninstall_client(app, installer)
+    else:
+        generations = get_client_generations(installer)
+        if len(generations) < client_action.backup:
+            error = f"no backup #{client_action.backup} of {client_title(app)} ({len(generations)} available)"
+            return ClientResult(app, ClientStatus.FAILED, [f"Cannot revert {client_title(app)}: {error}"], error=error)
+        result = revert_client_config(app, installer, generations[client_action.backup - 1])
+    if receipt is not None and result.succeeded:
+        receipt.forget_client(app)
+    return result
+
+def plan_client_action(client_action, installer):
+    """The changes one manifest entry would make on its installer."""
+    if client_action.action == Action.INSTALL:
         if installer.is_client_installed():
-            print(f"Uninstalling {selection} first...")
-            if not installer.run_client_uninstallation():
-                print(f"Failed to uninstall {selection}")
-                return
-            print(f"Successfully uninstalled {selection}")
+            return Plan()
+        return installer.plan_client_installation()
+    if client_action.action == Action.UNINSTALL:
+        return installer.plan_client_uninstallation()
+
+    generations = list_client_generations(installer)
+    if len(generations) < client_action.backup:
+        raise PlanError(f"no backup #{client_action.backup} of {client_title(client_action.client)} "
+                        f"({len(generations)} available)")
+    generation = generations[client_action.backup - 1]
+    config_creator = installer.config_creator
+    plan = Plan()
+    legacy_backup_path = legacy_backup_file(config_creator.config_file_path)
+    if os.path.exists(legacy_backup_path):
+        # Imported into the backup store, and removed, only when the revert runs
+        plan.extend([Change(config_creator.app_name, "import_legacy_backup", legacy_backup_path,
+                            {"source_path": config_creator.config_file_path},
+                            apply=lambda: import_legacy_backup(BackupStore(), config_creator.app_name,
+                                                               config_creator.config_file_path))])
+    plan.extend(installer.plan_client_uninstallation().changes)
+    plan.extend([Change(installer.config_creator.app_name, "restore_backup", installer.config_creator.config_file_path,
+                        {"digest": generation.digest, "created": format_backup_date(generation.created)})])
+    return plan
+
+def plan_batch(manifest, os_type):
+    """
+    Compute every change a manifest would make, without writing anything.
+    Returns a JSON-serializable report of the changes and of the clients
+    that could not be planned.
+    """
+    os_key = os_type.name.lower()
+    plan = Plan()
+    errors = []
+    if manifest.needs_package:
+        package_source = DOWNLOAD_URLS[PlatformName.MAC] if manifest.download else (
+            manifest.package_path or os.path.abspath(PACKAGE_NAME))
+        plan.extend([BaseInstaller.plan_application_installation(package_source, manifest.package_sha256,
+                                                                  manifest.npm_timeout)])
+
+    for client_action in manifest.clients:
+        installer = installer_registry.get(client_action.client, os_key)
+        try:
+            if not installer:
+                raise PlanError("unsupported on this OS")
+            if client_action.action == Action.INSTALL and not installer.validate():
+                raise PlanError(f"validation failed: {installer.validation_error}")
+            plan.extend(plan_client_action(client_action, installer).changes)
+        except Exception as e:
+            logger.error(f"Error planning {client_action.client}: {e}")
+            errors.append({"client": client_action.client, "action": client_action.action, "error": str(e)})
+
+    report = dict(plan.to_dict(), os=os_key, errors=errors)
+    report["exit_code"] = ExitCode.CLIENT_FAILED if errors else ExitCode.SUCCESS
+    return report
+
+def run_batch(manifest, os_type, receipt=None):
+    """
+    Apply a manifest without prompting. Returns a JSON-serializable report
+    whose "exit_code" is one of ExitCode. With a `receipt`, the package and
+    the clients it shows are still installed as left by the last run are
+    skipped, and it is updated with what this run did.
+    """
+    os_key = os_type.name.lower()
+    report = {"os": os_key, "package": None, "clients": []}
+
+    if manifest.needs_package and receipt is not None and receipt.package_matches(PACKAGE_VERSION):
+        print(f"{APPLICATION_NAME} {PACKAGE_VERSION} is already installed, skipping package installation")
+        report["package"] = {"path": None, "installed": True, "unchanged": True}
+    elif manifest.needs_package:
+        try:
+            node_path = NodeFinderMac().get_node_path() if os_type == OperatingSystem.MAC else None
+        except NodeNotFoundError as e:
+            node_path = None
+            logger.error(f"Node.js not found: {e}")
+        package_path = prepare_package(manifest.download, manifest.package_path, manifest.package_sha256) if node_path else ""
+        installed = bool(package_path) and BaseInstaller.install_application(package_path, manifest.npm_timeout)
+        report["package"] = {"path": package_path or None, "installed": installed}
+        if not installed:
+            print("Could not install the proxy package, no client was changed.")
+            report["exit_code"] = ExitCode.PACKAGE_FAILED
+            return report
+        if receipt is not None:
+            receipt.record_package(PACKAGE_VERSION)
+
+    tasks = []
+    for client_action in manifest.clients:
+        installer = installer_registry.get(client_action.client, os_key)
+        if installer:
+            tasks.append((client_action, installer))
         else:
-            print(f"{selection} is not currently installed")
-        
-        # Copy backup file to override the original config
-        print(f"Restoring config file from backup...")
-        shutil.copy2(backup_path, config_path)
-        print(f"Successfully restored config file from backup")
-        print(f"Config file reverted to state from {backup_date if backup_date else 'backup'}")
-        
-        # Remove the backup file after successful revert
-        os.remove(backup_path)
-        
-        print(f"\n >>> NOTE: Please restart {installer.APP_NAME} for changes to take effect. <<<")
-        
-    except Exception as e:
-        print(f"Error during revert operation: {e}")
-        logger.error(f"Revert error: {e}")
+            print(f"No installer available for {client_title(client_action.client)} on {os_type.name}")
+            report["clients"].append({"client": client_action.client, "action": client_action.action,
+                                      "status": ClientStatus.FAILED, "error": "unsupported on this OS"})
+
+    results = print_results(run_clients(
+        [(client_action.client, (client_action, installer)) for client_action, installer in tasks],
+        lambda app, task: run_client_action(task[0], task[1], os_type.name, receipt),
+        manifest.jobs))
+    for (client_action, _), result in zip(tasks, results):
+        report["clients"].append(dict(result.to_dict(), action=client_action.action))
+
+    if manifest.remove_application:
+        BaseInstaller.uninstall_application(manifest.npm_timeout)
+        # The receipt lives in the folders removed here
+        receipt = None
+        report["application_removed"] = BaseInstaller.remove_installation_folders()
+    if receipt is not None:
+        receipt.save()
+
+    failed = any(client["status"] == ClientStatus.FAILED for client in report["clients"])
+    failed = failed or report.get("application_removed") is False
+    report["exit_code"] = ExitCode.CLIENT_FAILED if failed else ExitCode.SUCCESS
+    return report
+
+def get_batch_manifest(args, max_workers):
+    """Build the manifest of a headless run from --manifest and/or --clients, or None for an interactive run."""
+    if not args.manifest and not args.clients:
+        return None
+    if args.manifest:
+        manifest = load_manifest(args.manifest)
+    else:
+        manifest = Manifest.from_dict({
+            "clients": {client.strip(): args.action for client in args.clients.split(",") if client.strip()}
+        })
+    # Flags given on the command line override the manifest
+    if args.download:
+        manifest.download = True
+    if max_workers is not None:
+        manifest.jobs = max_workers
+    return manifest
 
 def main():
     parser = argparse.ArgumentParser(description='Mint Security Proxy Installer')
@@ -206,7 +493,21 @@ def main():
     parser.add_argument('--revert', action='store_true', help='Revert a client configuration from backup')
     parser.add_argument('-d', '--debug', action='store_true', help='Enable debug logging')
     parser.add_argument('--download', action='store_true', help='Download the package from the remote URL (default: use local package)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Number of clients to install or uninstall at once (default: all of them)')
+    parser.add_argument('--sequential', action='store_true', help='Install or uninstall clients one at a time (same as --jobs 1)')
+    parser.add_argument('--manifest', help='Run headless from a JSON or TOML manifest of clients and actions')
+    parser.add_argument('--clients', help='Run headless on these comma-separated clients (or "all")')
+    parser.add_argument('--action', choices=Action.ALL, default=Action.INSTALL, help='Action for --clients (default: install)')
+    parser.add_argument('--json', action='store_true', help='Print a JSON report of a headless run on stdout (messages go to stderr)')
+    parser.add_argument('--force', action='store_true', help='Redo a headless run even where the last run\'s receipt shows nothing changed')
+    parser.add_argument('--watch', action='store_true', help='Keep running and wrap MCP servers added to installed clients')
+    parser.add_argument('--plan', action='store_true', help='Print the changes a headless run would make as JSON, without making them')
     args = parser.parse_args()
+    max_workers = 1 if args.sequential else args.jobs
+    if max_workers is not None and max_workers < 1:
+        parser.error("--jobs must be at least 1")
+    if args.plan and not (args.manifest or args.clients):
+        parser.error("--plan needs --clients or --manifest")
 
     # Configure logger
     if args.debug:
@@ -216,18 +517,44 @@ def main():
         # Default is to keep logging off
         configure_logger(LogLevel.OFF.value)
 
+    try:
+        manifest = get_batch_manifest(args, max_workers)
+    except ManifestError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(ExitCode.USAGE_ERROR)
+
+    if manifest is not None:
+        # Keep stdout for the JSON report
+        with contextlib.redirect_stdout(sys.stderr if args.json or args.plan else sys.stdout):
+            try:
+                print_welcome()
+                if args.plan:
+                    report = plan_batch(manifest, detect_os())
+                else:
+                    report = run_batch(manifest, detect_os(), None if args.force else Receipt())
+            except Exception as e:
+                print(f"Error: {e}")
+                report = {"error": str(e), "exit_code": ExitCode.CLIENT_FAILED}
+        if args.json or args.plan:
+            print(json.dumps(report, indent=2))
+        sys.exit(report["exit_code"])
+
     try:
         print_welcome()
         os_type = detect_os()
         
         if args.uninstall:
-            uninstall_all(os_type)
+            uninstall_all(os_type, max_workers)
             return
         
         if args.revert:
             revert_client(os_type)
             return
 
+        if args.watch:
+            watch_clients(os_type)
+            return
+
         find_node(os_type)
         print_client_menu("What would you like to install?", show_install_all=True)
         selection = get_client_selection(show_install_all=True)
@@ -236,58 +563,27 @@ def main():
         os_key = os_type.name.lower()
         
         # Download or use local application package
-        if args.download:
-            package_path = BaseInstaller.download_application(DOWNLOAD_URLS[PlatformName.MAC])
-            logger.info(f"Downloaded package to: {package_path}")
-        else:
-
-            package_path = os.path.abspath(PACKAGE_NAME)
-            if not os.path.exists(package_path):
-                print(f"Local package {package_path} not found.")
-                sys.exit(1)
-            logger.info(f"Using local package: {package_path}")
+        package_path = prepare_package(args.download)
         if not package_path:
             sys.exit(1)
 
         # Install the application (npm package of mint-mcp-proxy-server)
         BaseInstaller.install_application(package_path)
 
-        #"Install on All" option removed as there's only one option now
         if selection == "Install on All":
-            for app, os_map in installer_objects.items():
-                try:
-                    installer = os_map.get(os_key)
-                    if installer:
-                        if installer.is_client_installed():
-                            print(f"{app.replace('-', ' ').title()} is already installed, skipping installation. Please uninstall it first.")
-                            continue
-                        print(f"Running installation for {app.replace('-', ' ').title()} on {os_type.name}")
-                        installer.run_client_installation()
-                        print(f"Installation for {app.replace('-', ' ').title()} on {os_type.name} completed")
-                        print(f" >>> NOTE: In order for the installation to take effect, restart {installer.APP_NAME}. <<<")
-                except Exception as e:
-                    print(f"Error installing {app} on {os_type.name}: {e}")
+            print_results(run_clients(get_client_tasks(os_key),
+                                      lambda app, installer: install_client(app, installer, os_type.name),
+                                      max_workers))
         else:
-            try:
-                app_key = selection.lower().replace(' ', '-')
-                installer = installer_objects.get(app_key, {}).get(os_key)
-                if installer:
-                    if installer.is_client_installed():
-                        print(f"{selection} is already installed, skipping installation. Please uninstall it first.")
-                        return
-                    print(f"Running installation for {selection} on {os_type.name}")
-                    installer.run_client_installation()
-                    print(f"Installation for {selection} on {os_type.name} completed")
-                    print(f" >>> NOTE: In order for the installation to take effect, restart {installer.APP_NAME}. <<<")
-                else:
-                    print(f"No installer available for {selection} on {os_type.name}")
-            except Exception as e:
-                print(f"Error installing {selection} on {os_type.name}: {e}")
+            app_key = selection.lower().replace(' ', '-')
+            installer = installer_registry.get(app_key, os_key)
+            if installer:
+                print_results([install_client(app_key, installer, os_type.name)])
+            else:
+                print(f"No installer available for {selection} on {os_type.name}")
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
     main()
-
-
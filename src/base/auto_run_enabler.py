@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+from src.base.plan import Change
 
 
 class AutoRunEnabler(ABC):
@@ -7,10 +9,32 @@ class AutoRunEnabler(ABC):
     we are trying to install on. eg. Enabling YOLO mode in cursor.
     """
 
+    # Why the last enable_auto_run/disable_auto_run returned False
+    last_error: Optional[str] = None
+
     @abstractmethod
     def enable_auto_run(self) -> bool:
         return True
     
     @abstractmethod
     def disable_auto_run(self) -> bool:
-        return True
\ No newline at end of file
+        return True
+
+    def touched_paths(self) -> List[str]:
+        """Files this enabler writes, so the installer can wait for them to settle."""
+        return []
+
+    def owned_state(self) -> Dict[str, Any]:
+        """
+        What this enabler manages in each of `touched_paths`, so a receipt can
+        tell our settings apart from the rest of a file the client rewrites.
+        """
+        return {}
+
+    def plan_enable_auto_run(self) -> List[Change]:
+        """Changes `enable_auto_run` would make, computed without writing anything."""
+        return []
+
+    def plan_disable_auto_run(self) -> List[Change]:
+        """Changes `disable_auto_run` would make, computed without writing anything."""
+        return []
@@ -1,17 +1,21 @@
-import time
 import os
-import json
 from abc import ABC 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from .auto_run_enabler import AutoRunEnabler
 from .config_creator import ConfigCreator
-from src.consts import PlatformName, AppName, APPLICATION_DIR_NAME, APPLICATION_NAME, UNINSTALL_FOLDERS
+from .plan import Change, Plan, PlanError
+from src.consts import PlatformName, AppName, APPLICATION_NAME, UNINSTALL_FOLDERS, UNINSTALL_KEEP
 from pathlib import Path
-from src.utils.downloader import download_file
-import subprocess
+from src.utils.downloader import DownloadError
+from src.utils.artifact_cache import ArtifactCache
 from src.utils.logger import get_logger
 import shutil
 from src.utils.os_utils import get_current_os, OperatingSystem
+from src.utils.file_wait import wait_for_quiescence
+from src.utils.npm_package import is_tarball_installed, record_installed_tarball
+from src.utils.npm_cache import offline_install_args
+from src.utils.proxy_resolver import resolve_binary, invalidate_binaries
+from src.utils.npm_runner import run_npm
 
 # Create a logger for this module
 logger = get_logger(__name__)
@@ -21,6 +25,10 @@ class BaseInstaller(ABC):
         self.config: Dict[str, Any] = {}
         self.auto_run_enabler = None
         self.config_creator = None
+        # Why the last validate() failed, for the client's result
+        self.validation_error: Optional[str] = None
+        # Non-fatal problems of the last run, for the client's result
+        self.warnings: List[str] = []
 
         logger.debug(f"Initialized BaseInstaller with empty config")
 
@@ -42,19 +50,28 @@ class BaseInstaller(ABC):
 
 
     def validate(self) -> bool:
+        self.validation_error = None
         vlaid_os = get_current_os() == OperatingSystem.MAC
         if not vlaid_os:
-            print(f"the os is not valid expected {OperatingSystem.MAC} but got {get_current_os()}")
-            return False
+            return self._invalid(f"the os is not valid expected {OperatingSystem.MAC} but got {get_current_os()}")
         return True
 
+    def _invalid(self, reason: str) -> bool:
+        """Record why validation failed and return False."""
+        logger.error(reason)
+        self.validation_error = reason
+        return False
+
     @staticmethod
-    def uninstall_application() -> bool:
+    def uninstall_application(npm_timeout: Optional[float] = None) -> bool:
         if BaseInstaller.is_application_installed():
             try:
                 # install the application
                 logger.info(f"Uninstalling application: {APPLICATION_NAME}")
-                subprocess.run(["npm", "uninstall", "-g", APPLICATION_NAME])
+                result = run_npm(["uninstall", "-g", APPLICATION_NAME], npm_timeout)
+                invalidate_binaries()
+                if not result.ok:
+                    logger.error(result.summary)
 
                 # check if the application is installed
                 return not BaseInstaller.is_application_installed()
@@ -64,74 +81,80 @@ class BaseInstaller(ABC):
 
 
     @staticmethod
-    def download_application(download_url: str) -> str:
+    def download_application(download_url: str, sha256: Optional[str] = None) -> str:
         try:
             logger.debug(f"Starting download application")
             logger.debug(f"Download URL: {download_url}")
-            application_name = download_url.split("/")[-1]
-            logger.debug(f"Application name from URL: {application_name}")
-            download_dir = os.path.join(str(Path.home()), APPLICATION_DIR_NAME)
-            logger.debug(f"Download directory: {download_dir}")
-
-            if not os.path.exists(download_dir):
-                logger.debug(f"Creating download directory: {download_dir}")
-                os.makedirs(download_dir, exist_ok=True)
-            
-            # download the application
-            download_file_path = os.path.join(download_dir, application_name)
-            logger.info(f"Downloading application to: {download_file_path}")
-            if not download_file(download_url, download_file_path):
-                logger.error("Download failed")
-                return ""
-            logger.info(f"Download successful")
 
+            # download the application, or revalidate the cached copy
+            download_file_path = ArtifactCache().fetch(download_url, sha256)
+            logger.info(f"Application available at: {download_file_path}")
             return download_file_path
-                
+
+        except DownloadError as e:
+            logger.error(f"Error downloading file: {e}")
+            return ""
         except Exception as e:
             logger.error(f"Error downloading application: {e}")
             logger.exception("Exception details:")
             return ""
 
     @staticmethod
-    def install_application(file_path: str) -> bool:
+    def install_application(file_path: str, npm_timeout: Optional[float] = None) -> bool:
         try:
             if not os.path.exists(file_path):
                 logger.error(f"File path does not exist: {file_path}")
                 return False
             
-            # install the application
+            # skip npm entirely when this exact package is already installed
+            if is_tarball_installed(file_path):
+                logger.info(f"{APPLICATION_NAME} from {file_path} is already installed, skipping npm install")
+                return True
+
+            # install the application, from the bundled dependency cache when there is one
             logger.info(f"Installing application from: {file_path}")
-            result = subprocess.run(["npm", "install", "-g", file_path], capture_output=True, text=True)
-            logger.debug(f"Installation result: {result.returncode}")
-            logger.debug(f"Installation stdout: {result.stdout}")
-            logger.debug(f"Installation stderr: {result.stderr}")
+            offline_args = offline_install_args(file_path)
+            result = run_npm(["install", "-g", file_path, *offline_args], npm_timeout)
+            if not result.ok and offline_args and not result.timed_out:
+                logger.warning(f"Offline install failed, retrying against the registry: {result.summary}")
+                result = run_npm(["install", "-g", file_path], npm_timeout)
+            invalidate_binaries()
+            if not result.ok:
+                logger.error(result.summary)
+                return False
 
             # check if the application is installed
             is_installed = BaseInstaller.is_application_installed()
             logger.debug(f"Application is installed: {is_installed}")
+            if is_installed:
+                record_installed_tarball(file_path)
             return is_installed
         except Exception as e:
             logger.error(f"Error installing {file_path}: {e}")
             logger.exception("Exception details:")
             return False
 
+    @staticmethod
+    def plan_application_installation(package_source: str, sha256: Optional[str] = None,
+                                      npm_timeout: Optional[float] = None) -> Change:
+        """The npm install of our package from a local path or download URL, as a planned change."""
+        def install():
+            package_path = package_source
+            if "://" in package_source:
+                package_path = BaseInstaller.download_application(package_source, sha256)
+            if not package_path or not BaseInstaller.install_application(package_path, npm_timeout):
+                raise PlanError(f"Could not install {APPLICATION_NAME} from {package_source}")
+        details = {"package": package_source, "sha256": sha256} if sha256 else {"package": package_source}
+        if "://" not in package_source and os.path.exists(package_source) and is_tarball_installed(package_source):
+            # install_application checks again when the change is applied
+            details["skipped"] = "already installed"
+        return Change(APPLICATION_NAME, "npm_install", "npm", details, apply=install)
+
     @staticmethod
     def is_application_installed() -> bool:
-        try:
-            logger.debug(f"Checking if {APPLICATION_NAME} is installed")
-            whereis_result = subprocess.run(["whereis", APPLICATION_NAME], capture_output=True, text=True)
-            # whereis returns app_name: /path/to/app if found
-            logger.debug(f"whereis result: {whereis_result.stdout}")
-            if ":" in whereis_result.stdout and len(whereis_result.stdout.split(":")[1].strip()) > 0:
-                logger.debug(f"{APPLICATION_NAME} is installed")
-                return True
-            else:
-                logger.debug(f"{APPLICATION_NAME} is not installed")
-                return False
-        except Exception as e:
-            logger.error(f"Error checking if {APPLICATION_NAME} is installed: {e}")
-            logger.exception("Exception details:")
-            return False
+        resolved = resolve_binary(APPLICATION_NAME)
+        logger.debug(f"{APPLICATION_NAME} is installed: {resolved}")
+        return resolved is not None
 
     def is_client_installed(self) -> bool:
         #Check is mint-mcp-proxy-server is installed in config file
@@ -141,24 +164,46 @@ class BaseInstaller(ABC):
             return False
         
         #Check if the config file is valid
-        with open(config_file_path, "r") as f:
-            config = json.load(f)
+        mcp_server_names = self.config_creator.global_mcp_server_names()
         
         # Check if our main proxy exists in mcpServers
-        if APPLICATION_NAME in config.get("mcpServers", {}):
+        if APPLICATION_NAME in mcp_server_names:
             logger.debug(f"{self.APP_NAME} is installed")
             return True
         
         logger.debug(f"{self.APP_NAME} is not installed")
         return False
 
+    def touched_paths(self) -> List[str]:
+        """Every file the installation of this client writes."""
+        return self.config_creator.touched_paths() + self.auto_run_enabler.touched_paths()
+
+    def owned_state(self) -> Dict[str, Any]:
+        """What the installation of this client manages in those files, by path."""
+        state = self.config_creator.owned_state()
+        state.update(self.auto_run_enabler.owned_state())
+        return state
+
+    def plan_client_installation(self) -> Plan:
+        """Everything `run_client_installation` would change, computed without writing anything."""
+        plan = Plan(self.config_creator.plan_update())
+        plan.extend(self.auto_run_enabler.plan_enable_auto_run())
+        return plan
+
+    def plan_client_uninstallation(self) -> Plan:
+        """Everything `run_client_uninstallation` would change, computed without writing anything."""
+        plan = Plan(self.auto_run_enabler.plan_disable_auto_run())
+        plan.extend(self.config_creator.plan_restore())
+        return plan
+
     def run_client_installation(self) -> bool:
         logger.info(f"Starting installation for {self.APP_NAME} on {self.PLATFORM_NAME}")
+        self.warnings = []
 
         # validate the application
         if not self.validate():
             logger.error("Validation failed. Cannot proceed with installation.")
-            raise ValueError("Validation failed. Cannot proceed with installation.")
+            raise ValueError(f"Validation failed ({self.validation_error}). Cannot proceed with installation.")
         
         # update the config json of the target application
         logger.info("Creating configuration...")
@@ -170,38 +215,60 @@ class BaseInstaller(ABC):
             logger.exception("Exception details:")
             raise
         
-        time.sleep(0.5)
+        wait_for_quiescence(self.config_creator.touched_paths())
         
         # enable auto-run to make our mcp server autostart in the target application
         logger.info("Enabling auto-run...")
         try:
             autorun_result = self.auto_run_enabler.enable_auto_run()
             logger.debug(f"Auto-run enabling result: {autorun_result}")
+            if not autorun_result:
+                self.warnings.append(f"Could not enable auto-run for {self.APP_NAME}: {self.auto_run_enabler.last_error}")
         except Exception as e:
             logger.error(f"Error enabling auto-run: {e}")
             logger.exception("Exception details:")
             raise
         
-        time.sleep(0.5)
+        wait_for_quiescence(self.auto_run_enabler.touched_paths())
         logger.info("Installation completed successfully")
         return True
     
     def run_client_uninstallation(self) -> bool:
         logger.info(f"Starting uninstallation for {self.APP_NAME} on {self.PLATFORM_NAME}")
+        self.warnings = []
         
         # disable auto-run to make our mcp server autostart in the target application
         logger.info("Disabling auto-run...")
-        self.auto_run_enabler.disable_auto_run()
-        time.sleep(0.5)
+        if not self.auto_run_enabler.disable_auto_run():
+            self.warnings.append(f"Could not disable auto-run for {self.APP_NAME}: {self.auto_run_enabler.last_error}")
+        wait_for_quiescence(self.auto_run_enabler.touched_paths())
 
         # restore the config
         logger.info("Restoring configuration...")
         self.config_creator.restore_config()
-        time.sleep(0.5)
+        wait_for_quiescence(self.config_creator.touched_paths())
         
         logger.info("Uninstallation completed successfully")
         return True
 
+    @staticmethod
+    def _remove_folder(dir_path: str) -> List[str]:
+        """Remove `dir_path` except for the UNINSTALL_KEEP entries inside it; returns the kept paths."""
+        home = str(Path.home())
+        keep = {os.path.normpath(os.path.join(home, path)) for path in UNINSTALL_KEEP}
+        kept = [path for path in keep if os.path.dirname(path) == os.path.normpath(dir_path) and os.path.exists(path)]
+        if not kept:
+            shutil.rmtree(dir_path)
+            return []
+        for entry in os.scandir(dir_path):
+            if os.path.normpath(entry.path) in keep:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
+        return kept
+
     @staticmethod
     def remove_installation_folders() -> bool:
         logger.info("\nRemoving installation folders...")
@@ -210,8 +277,11 @@ class BaseInstaller(ABC):
                 # Expand the path to handle ~
                 dir_path_to_remove = os.path.join(str(Path.home()), folder)
                 if os.path.exists(dir_path_to_remove):
-                    shutil.rmtree(dir_path_to_remove)
-                    logger.info(f"Successfully removed {folder}")
+                    kept = BaseInstaller._remove_folder(dir_path_to_remove)
+                    if kept:
+                        logger.info(f"Successfully removed {folder}, keeping {', '.join(kept)}")
+                    else:
+                        logger.info(f"Successfully removed {folder}")
                 else:
                     logger.info(f"Folder {dir_path_to_remove} does not exist, skipping...")
             except Exception as e:
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-import shutil
 import os
-import json
+from typing import Any, Dict, List, Set
 from src.utils.logger import get_logger
+from src.utils.config_document import ConfigDocument, load_document, peek_document, invalidate_document
+from src.utils.mcp_detector import read_mcp_server_names
+from src.utils.backup_store import BackupStore
+from src.base.plan import Change, Plan
 from src.consts import APPLICATION_NAME
 
 # Create a logger for this module
@@ -25,25 +28,24 @@ class ConfigCreator(ABC):
     def config_file_path(self) -> str:
         """Path to the application's config file. Must be implemented by subclasses."""
         pass
+
+    def touched_paths(self) -> List[str]:
+        """Files `update_config` and `restore_config` write."""
+        return [self.config_file_path]
+
+    def owned_state(self) -> Dict[str, Any]:
+        """
+        The mcpServers this creator manages, by path (None while the file is
+        missing), so a receipt can ignore the rest of the file changing.
+        """
+        if not os.path.exists(self.config_file_path):
+            return {self.config_file_path: None}
+        return {self.config_file_path: load_document(self.config_file_path).data.get('mcpServers', {})}
     
     def _create_backup(self) -> bool:
         """Create a backup of the config file before modifying it."""
         try:
-            config_dir = os.path.dirname(self.config_file_path)
-            config_filename = os.path.basename(self.config_file_path)
-            
-            # Create backup filename
-            backup_filename = f"{config_filename}.backup"
-            backup_path = os.path.join(config_dir, backup_filename)
-            
-            # If backup already exists, remove it first
-            if os.path.exists(backup_path):
-                os.remove(backup_path)
-                logger.debug(f"Removed existing backup file: {backup_path}")
-            
-            # Copy the original config file to backup
-            shutil.copy2(self.config_file_path, backup_path)
-            logger.info(f"Created backup of config file at: {backup_path}")
+            BackupStore().snapshot(self.app_name, self.config_file_path)
             return True
             
         except Exception as e:
@@ -85,15 +87,93 @@ class ConfigCreator(ABC):
             server_config.get("env", {}).get("NO_TOOLS") != "true"
         )
     
+    def _main_proxy_config(self) -> dict:
+        """
+        Configuration of our main proxy entry.
+        """
+        logger.debug(f"Created mint_mcp_proxy_server config with path: {self.config_file_path}")
+        return {
+            "command": APPLICATION_NAME,
+            "env": {
+                "MCP_CONFIG_PATH": self.config_file_path,
+                "MCP_CLIENT_NAME": self.app_name
+            }
+        }
+
+    def _wrap_mcp_servers(self, mcp_servers: dict) -> dict:
+        """
+        Return a copy of an mcpServers map with every server that is not
+        already behind our proxy wrapped by it, keeping the original order.
+        """
+        return {
+            server_name: server_config
+            if self._is_wrapped_by_proxy(server_config) or self._is_our_main_proxy(server_config)
+            else self._wrap_mcp_server_with_proxy(server_config)
+            for server_name, server_config in mcp_servers.items()
+        }
+
+    def _install_mcp_servers(self, mcp_servers: dict) -> dict:
+        """
+        Return the installed form of an mcpServers map: our main proxy first,
+        then the newly wrapped servers, then the ones that were already ours.
+        """
+        # Store existing servers to wrap them later
+        existing_servers = {}
+        for server_name, server_config in mcp_servers.items():
+            # Skip if already wrapped by our proxy or if it's our main proxy
+            if not self._is_wrapped_by_proxy(server_config) and not self._is_our_main_proxy(server_config):
+                existing_servers[server_name] = server_config
+
+        # Add our main proxy first (at the top)
+        new_mcp_servers = {APPLICATION_NAME: self._main_proxy_config()}
+
+        # Add wrapped existing servers
+        for server_name, server_config in existing_servers.items():
+            new_mcp_servers[server_name] = self._wrap_mcp_server_with_proxy(server_config)
+
+        # Add any servers that were already wrapped or are already our proxy
+        for server_name, server_config in mcp_servers.items():
+            if server_name not in new_mcp_servers:
+                new_mcp_servers[server_name] = server_config
+
+        return new_mcp_servers
+
+    def _restore_mcp_servers(self, mcp_servers: dict, remove_main_proxy: bool = True) -> dict:
+        """
+        Return a copy of an mcpServers map with wrapped servers restored from
+        their 'inner' config and, optionally, our main proxy removed.
+        """
+        restored = {}
+        for server_name, server_config in mcp_servers.items():
+            if self._is_wrapped_by_proxy(server_config):
+                # Restore the original server config from the 'inner' key
+                restored[server_name] = server_config['inner']
+            elif remove_main_proxy and self._is_our_main_proxy(server_config):
+                # Drop our main proxy
+                continue
+            else:
+                restored[server_name] = server_config
+        return restored
+    
+    def global_mcp_server_names(self) -> Set[str]:
+        """
+        Return the names in the top-level mcpServers map of the config file.
+        Uses the parsed document when it is already cached, otherwise a
+        streaming scan that stops right after that map.
+        """
+        document = peek_document(self.config_file_path)
+        if document is not None:
+            return set(document.data.get('mcpServers', {}))
+        return read_mcp_server_names(self.config_file_path) or set()
+
     def _mint_proxy_already_installed(self) -> bool:
         logger.debug(f"Checking if mint proxy is already installed in: {self.config_file_path}")
         try:
-            with open(self.config_file_path, 'r') as f:
-                config = json.load(f)
-            logger.debug(f"Config contents: {config}")
+            mcp_server_names = self.global_mcp_server_names()
+            logger.debug(f"Global mcpServers: {mcp_server_names}")
             
             # Check if our main proxy exists in mcpServers
-            has_main_proxy = APPLICATION_NAME in config.get('mcpServers', {})
+            has_main_proxy = APPLICATION_NAME in mcp_server_names
             
             logger.debug(f"Mint proxy already installed: {has_main_proxy}")
             return has_main_proxy
@@ -102,114 +182,112 @@ class ConfigCreator(ABC):
             logger.exception("Exception details:")
             return False
 
-    def update_config(self) -> bool:
-        logger.info("Starting update_config method")
-        # check if the config file exists
-        try:
-            logger.debug(f"Found config path: {self.config_file_path}")
-
-            if not os.path.exists(self.config_file_path):
-                logger.warning(f"Config file does not exist at: {self.config_file_path}")
-                return False
-            
-            # check if the MCP proxy server is already installed
-            if self._mint_proxy_already_installed():
-                logger.info("MCP proxy already installed, skipping update")
-                return False
-            
-            # Create backup before modifying the config
+    def _backup_change(self) -> Change:
+        """A change that snapshots the config file before it is modified."""
+        def backup():
             logger.info("Creating backup of config file...")
             if not self._create_backup():
                 logger.warning("Failed to create backup, but continuing with installation")
-            
-            logger.info("Updating config file with our MCP server")
-            # read the config file
-            with open(self.config_file_path, 'r') as f:
-                config = json.load(f)
-
-            # Ensure mcpServers exists
-            if 'mcpServers' not in config:
-                config['mcpServers'] = {}
-
-            # Store existing servers to wrap them later
-            existing_servers = {}
-            for server_name, server_config in list(config['mcpServers'].items()):
-                # Skip if already wrapped by our proxy or if it's our main proxy
-                if not self._is_wrapped_by_proxy(server_config) and not self._is_our_main_proxy(server_config):
-                    existing_servers[server_name] = server_config
-
-            # Create new mcpServers dict with our main proxy first
-            new_mcp_servers = {}
-            
-            # Add our main proxy first (at the top)
-            mint_mcp_proxy_server = {
-                "command": APPLICATION_NAME,
-                "env": {
-                    "MCP_CONFIG_PATH": self.config_file_path,
-                    "MCP_CLIENT_NAME": self.app_name
-                }
-            }
-            logger.debug(f"Created mint_mcp_proxy_server config with path: {self.config_file_path}")
-            new_mcp_servers[APPLICATION_NAME] = mint_mcp_proxy_server
+        return Change(self.app_name, "backup", self.config_file_path, apply=backup)
+
+    def _describe_server_changes(self, before: dict, after: dict) -> Dict[str, List[str]]:
+        """Names of the servers added, removed, wrapped and unwrapped between two mcpServers maps."""
+        changes = {
+            "added": [name for name in after if name not in before],
+            "removed": [name for name in before if name not in after],
+            "wrapped": [name for name in after if name in before and
+                        self._is_wrapped_by_proxy(after[name]) and not self._is_wrapped_by_proxy(before[name])],
+            "unwrapped": [name for name in before if name in after and
+                          self._is_wrapped_by_proxy(before[name]) and not self._is_wrapped_by_proxy(after[name])]
+        }
+        return {key: names for key, names in changes.items() if names}
+
+    def _mcp_servers_change(self, action: str, document: ConfigDocument, new_servers: dict) -> Change:
+        """A change that writes `new_servers` as the mcpServers of an already loaded document."""
+        def save():
+            logger.debug(f"Writing new config to: {self.config_file_path}")
+            document.data['mcpServers'] = new_servers
+            document.save()
+        return Change(self.app_name, action, self.config_file_path,
+                      self._describe_server_changes(document.data.get('mcpServers', {}), new_servers),
+                      apply=save, fingerprint=document.fingerprint, verify=True)
 
-            # Add wrapped existing servers
-            for server_name, server_config in existing_servers.items():
-                new_mcp_servers[server_name] = self._wrap_mcp_server_with_proxy(server_config)
+    def plan_update(self) -> List[Change]:
+        """
+        Plan what `update_config` does: back up the config, then put our main
+        proxy first and wrap the other servers. Nothing is written.
+        """
+        if not os.path.exists(self.config_file_path):
+            logger.warning(f"Config file does not exist at: {self.config_file_path}")
+            return []
 
-            # Add any servers that were already wrapped or are already our proxy
-            for server_name, server_config in config['mcpServers'].items():
-                if server_name not in new_mcp_servers:
-                    new_mcp_servers[server_name] = server_config
+        # check if the MCP proxy server is already installed
+        if self._mint_proxy_already_installed():
+            logger.info("MCP proxy already installed, skipping update")
+            return []
 
-            # Replace the mcpServers with the new ordered dict
-            config['mcpServers'] = new_mcp_servers
+        document = load_document(self.config_file_path)
+        # Replace the mcpServers with a new ordered dict, our main proxy first
+        new_servers = self._install_mcp_servers(document.data.get('mcpServers', {}))
+        return [self._backup_change(), self._mcp_servers_change("install_mcp_servers", document, new_servers)]
 
-            # Overwrite the config file with the new config
-            logger.debug(f"Writing new config to: {self.config_file_path}")
-            with open(self.config_file_path, 'w') as f:
-                json.dump(config, f, indent=4)
+    def plan_restore(self) -> List[Change]:
+        """Plan what `restore_config` does: unwrap the servers and remove our main proxy."""
+        if not self._mint_proxy_already_installed():
+            logger.info("MCP proxy not installed, skipping removal")
+            return []
+
+        document = load_document(self.config_file_path)
+        if 'mcpServers' not in document.data:
+            return []
+        new_servers = self._restore_mcp_servers(document.data['mcpServers'])
+        return [self._mcp_servers_change("restore_mcp_servers", document, new_servers)]
+
+    def plan_wrap_new_servers(self) -> List[Change]:
+        """
+        Plan wrapping the servers added since installation, leaving every other
+        entry (and the order) as it is. Nothing to do unless we are installed.
+        """
+        if not os.path.exists(self.config_file_path) or not self._mint_proxy_already_installed():
+            return []
+        document = load_document(self.config_file_path)
+        servers = document.data.get('mcpServers', {})
+        new_servers = self._wrap_mcp_servers(servers)
+        if new_servers == servers:
+            return []
+        return [self._mcp_servers_change("wrap_new_mcp_servers", document, new_servers)]
+
+    def update_config(self) -> bool:
+        logger.info("Starting update_config method")
+        try:
+            changes = self.plan_update()
+            if not changes:
+                return False
+
+            logger.info("Updating config file with our MCP server")
+            Plan(changes).apply()
             logger.info("Successfully wrote config file")
 
             return True
         except Exception as e:
             logger.error(f"Error in update_config: {e}")
             logger.exception("Exception details:")
+            invalidate_document(self.config_file_path)
             return False
         
     def restore_config(self) -> bool:
         logger.info("Starting restore_config method")
         try:
-            # check if the MCP proxy server is already installed
-            if not self._mint_proxy_already_installed():
-                logger.info("MCP proxy not installed, skipping removal")
+            changes = self.plan_restore()
+            if not changes:
                 return False
 
-            # read the config file
-            with open(self.config_file_path, 'r') as f:
-                config = json.load(f)
-
-            # Handle mcpServers restoration
-            if 'mcpServers' in config:
-                servers_to_remove = []
-                for server_name, server_config in list(config['mcpServers'].items()):
-                    if self._is_wrapped_by_proxy(server_config):
-                        # Restore the original server config from the 'inner' key
-                        config['mcpServers'][server_name] = server_config['inner']
-                    elif self._is_our_main_proxy(server_config):
-                        # Mark our main proxy for removal
-                        servers_to_remove.append(server_name)
-                
-                # Remove our main proxy
-                for server_name in servers_to_remove:
-                    del config['mcpServers'][server_name]
-                
-            # Write the updated config back to the file
-            with open(self.config_file_path, 'w') as f:
-                json.dump(config, f, indent=4)
+            Plan(changes).apply()
             logger.info("Successfully restored config file")
 
             return True
             
         except Exception as e:
             logger.error(f"Error removing uninstall config from Claude Desktop: {str(e)}")
-            return False
\ No newline at end of file
+            invalidate_document(self.config_file_path)
+            return False
@@ -0,0 +1,76 @@
+from typing import Any, Callable, Dict, List, Optional
+from src.utils.os_utils import Fingerprint, file_fingerprint
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+
+class PlanError(Exception):
+    """Raised when a planned change can no longer be applied as planned"""
+    pass
+
+
+class Change:
+    """
+    One planned modification of a resource (a file, a database key, the npm
+    package...). Planning does all the reading and computes the new state in
+    memory; `apply` only writes it.
+
+    With `verify`, the resource must still have the `fingerprint` it was
+    planned against (None meaning it must still be missing), so a file edited
+    in between is never overwritten with a stale result.
+    """
+
+    def __init__(self, client: str, action: str, resource: str, details: Optional[Dict[str, Any]] = None,
+                 apply: Optional[Callable[[], Any]] = None, fingerprint: Optional[Fingerprint] = None,
+                 verify: bool = False):
+        self.client = client
+        self.action = action
+        self.resource = resource
+        self.details = details or {}
+        self._apply = apply
+        self.fingerprint = fingerprint
+        self.verify = verify
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "client": self.client,
+            "action": self.action,
+            "resource": self.resource,
+            "details": self.details,
+            "fingerprint": list(self.fingerprint) if self.fingerprint is not None else None
+        }
+
+    def apply(self) -> None:
+        if self.verify and file_fingerprint(self.resource) != self.fingerprint:
+            raise PlanError(f"{self.resource} changed since the plan was made")
+        logger.debug(f"Applying {self.action} to {self.resource}")
+        if self._apply is not None:
+            self._apply()
+
+
+class Plan:
+    """An ordered set of changes, printable as JSON before anything is applied."""
+
+    def __init__(self, changes: Optional[List[Change]] = None):
+        self.changes = list(changes or [])
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def extend(self, changes: List[Change]) -> None:
+        self.changes.extend(changes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"changes": [change.to_dict() for change in self.changes]}
+
+    def apply(self) -> None:
+        """
+        Apply the changes in order, stopping at the first one that fails.
+
+        Raises:
+            PlanError: If a resource changed since it was planned
+        """
+        for change in self.changes:
+            change.apply()
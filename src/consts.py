@@ -1,10 +1,24 @@
+import os
+
 APPLICATION_DIR_NAME = ".mint/mcp_proxy/"
 APPLICATION_NAME = "mint-mcp-proxy-server"
 
+# Config backups, relative to APPLICATION_DIR_NAME
+BACKUP_DIR_NAME = "backups"
+# Number of backup generations kept per client (override with MINT_BACKUP_RETENTION)
+BACKUP_RETENTION_GENERATIONS = 5
+# Age in days past which older backup generations are evicted too, None for no limit
+# (override with MINT_BACKUP_MAX_AGE_DAYS)
+BACKUP_RETENTION_MAX_AGE_DAYS = None
+
 # Folders to remove during uninstallation
 UNINSTALL_FOLDERS = [
    APPLICATION_DIR_NAME
 ]
+# Entries of UNINSTALL_FOLDERS kept by an uninstall, so --revert still works afterwards
+UNINSTALL_KEEP = [
+   os.path.join(APPLICATION_DIR_NAME, BACKUP_DIR_NAME)
+]
 
 class PlatformName:
     MAC = "mac"
@@ -19,9 +33,27 @@ class AppName:
 
 PACKAGE_VERSION = "2.1.0"
 PACKAGE_NAME = f"mint-mcp-proxy-server-{PACKAGE_VERSION}.tgz"
+# Dependency closure of the package, built by `python -m src.utils.npm_cache`
+NPM_CACHE_NAME = f"mint-mcp-proxy-server-{PACKAGE_VERSION}-npm-cache.tgz"
+# Where the bundled npm cache is unpacked, relative to APPLICATION_DIR_NAME
+NPM_CACHE_DIR_NAME = "npm-cache"
+# Downloaded packages, relative to APPLICATION_DIR_NAME, and the most they may take up
+ARTIFACT_CACHE_DIR_NAME = "artifacts"
+ARTIFACT_CACHE_MAX_BYTES = 100 * 1024 * 1024
+# Used when the bundled package.json has no engines.node; express 5 and the MCP SDK need Node.js 18
+MIN_NODE_VERSION = "18.0.0"
 
 DOWNLOAD_URLS = {
     PlatformName.MAC: f"https://wsrzmzgrflfrgovxedjl.supabase.co/storage/v1/object/public/storage/{PACKAGE_NAME}",
     PlatformName.LINUX: "UNSUPPORTED",
     PlatformName.WINDOWS: "UNSUPPORTED"
 }
+
+class ExitCode:
+    SUCCESS = 0
+    # At least one client failed
+    CLIENT_FAILED = 1
+    # Invalid arguments or manifest
+    USAGE_ERROR = 2
+    # Node.js or the proxy package could not be set up
+    PACKAGE_FAILED = 3
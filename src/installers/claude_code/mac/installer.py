@@ -4,6 +4,10 @@ from src.consts import AppName, PlatformName
 from src.base.base_installer import BaseInstaller
 from src.installers.claude_code.mac.mcp_config_creator import ClaudeCodeMacMCPConfigEditor
 from src.installers.claude_code.mac.yolo_enabler import ClaudeCodeMacYOLOEnabler
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
 
 class ClaudeCodeMacInstaller(BaseInstaller):
 
@@ -12,7 +16,7 @@ class ClaudeCodeMacInstaller(BaseInstaller):
             super().__init__()
             self.set_objects(ClaudeCodeMacYOLOEnabler, ClaudeCodeMacMCPConfigEditor)
         except Exception as e:
-            print(f"Error initializing ClaudeCodeMacInstaller: {e}")
+            logger.error(f"Error initializing ClaudeCodeMacInstaller: {e}")
 
     PLATFORM_NAME = PlatformName.MAC
     APP_NAME = AppName.CLAUDE_CODE
@@ -29,8 +33,7 @@ class ClaudeCodeMacInstaller(BaseInstaller):
         claude_code_installed_path2 = shutil.which("claude", path=custom_path) is not None
 
         if not (claude_code_installed_path1 or claude_code_installed_path2):
-            print(f"Claude Code is not installed {claude_code_installed_path1} {claude_code_installed_path2}")
-            return False
+            return self._invalid("Claude Code is not installed")
         
         return True
 
@@ -1,9 +1,11 @@
 import os
-import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Set
 from src.base.config_creator import ConfigCreator
-from src.utils.node_finder.mac import NodeFinderMac
+from src.base.plan import Change, Plan
 from src.utils.logger import get_logger
+from src.utils.config_document import invalidate_document
+from src.utils.json_splice import write_spliced
+from src.utils.mcp_index import get_mcp_index, peek_mcp_index, record_splice, save_mcp_index
 
 # Create a logger for this module
 logger = get_logger(__name__)
@@ -14,7 +16,6 @@ class ClaudeCodeMacMCPConfigEditor(ConfigCreator):
     def __init__(self, config: Dict[str, Any]):
         super().__init__()
         self.config = config
-        self.node_finder = NodeFinderMac()
 
     @property
     def app_name(self) -> str:
@@ -59,85 +60,110 @@ class ClaudeCodeMacMCPConfigEditor(ConfigCreator):
             server_config.get("env", {}).get("NO_TOOLS") != "true"
         )
     
+    def global_mcp_server_names(self) -> Set[str]:
+        """
+        Read only the global mcpServers object when the file is already
+        indexed, otherwise fall back to the early-exit streaming scan.
+        """
+        index = peek_mcp_index(self.config_file_path)
+        if index is not None:
+            return set(index.read_global_servers())
+        return super().global_mcp_server_names()
+
+    def owned_state(self) -> Dict[str, Any]:
+        """The global and per-project mcpServers, read through the index rather than the whole file."""
+        if not os.path.exists(self.config_file_path):
+            return {self.config_file_path: None}
+        index = get_mcp_index(self.config_file_path)
+        return {self.config_file_path: [[list(location.path), servers] for location, servers in index.read_servers()]}
+
+    def _plan_splice(self, install: bool, wrap_only: bool = False) -> List[Change]:
+        """
+        Plan a rewrite of only the global and per-project mcpServers objects of
+        the config file, copying the rest of it (mostly project history) untouched.
+        Only the indexed locations are read, so the cost follows the number
+        of servers rather than the number of projects. With `wrap_only`, servers
+        that are not ours yet are wrapped and nothing else changes.
+        """
+        index = get_mcp_index(self.config_file_path)
+
+        replacements = []
+        details: Dict[str, Any] = {}
+        for location, servers in index.read_servers():
+            if wrap_only:
+                new_servers = self._wrap_mcp_servers(servers)
+            elif location.is_global:
+                if install:
+                    new_servers = self._install_mcp_servers(servers)
+                else:
+                    new_servers = self._restore_mcp_servers(servers)
+            elif install:
+                new_servers = self._wrap_mcp_servers(servers)
+            else:
+                new_servers = self._restore_mcp_servers(servers, remove_main_proxy=False)
+
+            if new_servers != servers:
+                replacements.append(index.replace(location, new_servers))
+                server_changes = self._describe_server_changes(servers, new_servers)
+                if location.is_global:
+                    details.update(server_changes)
+                else:
+                    details.setdefault("projects", {})[location.path[1]] = server_changes
+
+        # Add the global mcpServers with our main proxy if it doesn't exist
+        if install and not wrap_only and index.global_location is None:
+            new_servers = self._install_mcp_servers({})
+            replacements.append(index.insert_global(new_servers))
+            details.update(self._describe_server_changes({}, new_servers))
+
+        if not replacements:
+            logger.debug(f"No mcpServers changes needed in: {self.config_file_path}")
+            return []
+
+        def splice():
+            logger.debug(f"Rewriting {len(replacements)} mcpServers span(s) in: {self.config_file_path}")
+            try:
+                write_spliced(self.config_file_path, replacements)
+                record_splice(index, replacements)
+            finally:
+                invalidate_document(self.config_file_path)
+
+        if wrap_only:
+            action = "wrap_new_mcp_servers"
+        else:
+            action = "install_mcp_servers" if install else "restore_mcp_servers"
+        return [Change(self.app_name, action, self.config_file_path, details,
+                       apply=splice, fingerprint=index.fingerprint, verify=True)]
+
+    def plan_update(self) -> List[Change]:
+        if not os.path.exists(self.config_file_path):
+            logger.warning(f"Config file does not exist at: {self.config_file_path}")
+            return []
+
+        # Only back up the pristine config, not one we already modified
+        changes = [] if self._mint_proxy_already_installed() else [self._backup_change()]
+        return changes + self._plan_splice(install=True)
+
+    def plan_restore(self) -> List[Change]:
+        return self._plan_splice(install=False)
+
+    def plan_wrap_new_servers(self) -> List[Change]:
+        if not os.path.exists(self.config_file_path) or not self._mint_proxy_already_installed():
+            return []
+        return self._plan_splice(install=True, wrap_only=True)
+
     def update_config(self) -> bool:
-        super().update_config()
-
-        # read config file
-        with open(self.config_file_path, 'r') as f:
-            config = json.load(f)
-
-        # Handle global mcpServers (if they exist)
-        if 'mcpServers' in config:
-            for server_name, server_config in list(config['mcpServers'].items()):
-                # Skip if already wrapped by our proxy or if it's our main proxy
-                if not self._is_wrapped_by_proxy(server_config) and not self._is_our_main_proxy(server_config):
-                    config['mcpServers'][server_name] = self._wrap_mcp_server_with_proxy(server_config)
-        
-        # Add our main proxy to global mcpServers if it doesn't exist
-        if 'mcpServers' not in config:
-            config['mcpServers'] = {}
-        
-        # Check if our main proxy already exists
-        main_proxy_exists = any(self._is_our_main_proxy(server_config) for server_config in config['mcpServers'].values())
-        
-        if not main_proxy_exists:
-            config['mcpServers']['mint-mcp-proxy-server'] = {
-                "command": "mint-mcp-proxy-server",
-                "env": {
-                    "MCP_CONFIG_PATH": self.config_file_path,
-                    "MCP_CLIENT_NAME": "Claude Code"
-                }
-            }
-
-        # Handle project-specific mcpServers
-        for project_path, project_config in config['projects'].items():
-            if 'mcpServers' in project_config:
-                for server_name, server_config in list(project_config['mcpServers'].items()):
-                    # Skip if already wrapped by our proxy or if it's our main proxy
-                    if not self._is_wrapped_by_proxy(server_config) and not self._is_our_main_proxy(server_config):
-                        project_config['mcpServers'][server_name] = self._wrap_mcp_server_with_proxy(
-                            server_config, 
-                            client_name="Claude Code"
-                        )
-
-        # write config file
-        with open(self.config_file_path, 'w') as f:
-            json.dump(config, f, indent=4)
+        logger.info("Starting update_config method")
+        if not os.path.exists(self.config_file_path):
+            logger.warning(f"Config file does not exist at: {self.config_file_path}")
+            return False
 
+        Plan(self.plan_update()).apply()
+        save_mcp_index(self.config_file_path)
         return True
     
     def restore_config(self) -> bool:
-        super().restore_config()
-
-        # read config file
-        with open(self.config_file_path, 'r') as f:
-            config = json.load(f)
-
-        # Handle global mcpServers restoration
-        if 'mcpServers' in config:
-            servers_to_remove = []
-            for server_name, server_config in list(config['mcpServers'].items()):
-                if self._is_wrapped_by_proxy(server_config):
-                    # Restore the original server config from the 'inner' key
-                    config['mcpServers'][server_name] = server_config['inner']
-                elif self._is_our_main_proxy(server_config):
-                    # Mark our main proxy for removal
-                    servers_to_remove.append(server_name)
-            
-            # Remove our main proxy
-            for server_name in servers_to_remove:
-                del config['mcpServers'][server_name]
-
-        # Handle project-specific mcpServers restoration
-        for project_path, project_config in config['projects'].items():
-            if 'mcpServers' in project_config:
-                for server_name, server_config in list(project_config['mcpServers'].items()):
-                    if self._is_wrapped_by_proxy(server_config):
-                        # Restore the original server config from the 'inner' key
-                        project_config['mcpServers'][server_name] = server_config['inner']
-
-        # write config file
-        with open(self.config_file_path, 'w') as f:
-            json.dump(config, f, indent=4)
-
-        return True
\ No newline at end of file
+        logger.info("Starting restore_config method")
+        Plan(self.plan_restore()).apply()
+        save_mcp_index(self.config_file_path)
+        return True
@@ -1,7 +1,13 @@
 import os
-import json
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List
 from src.base.auto_run_enabler import AutoRunEnabler
+from src.base.plan import Change, Plan
+from src.utils.config_document import ConfigDocument, load_document, new_document
+from src.utils.json_format import JsonFormat
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
 
 class ClaudeCodeMacYOLOEnabler(AutoRunEnabler):
     REQUIRED_PERMISSIONS = [
@@ -10,84 +16,110 @@ class ClaudeCodeMacYOLOEnabler(AutoRunEnabler):
         "proxy-server__proxy_server"
     ]
 
+    # Format used when creating a settings file that doesn't exist yet
+    SETTINGS_FORMAT = JsonFormat(indent=2)
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__()
         self.config = config
-        
-    def enable_auto_run(self) -> bool:
-        try:
-            # Get path to settings.json
-            settings_path = os.path.expanduser("~/.claude/settings.json")
-            settings_local_path = os.path.expanduser("~/.claude/settings.local.json")
-            settings_paths = [settings_path, settings_local_path]
 
-            for settings_path in settings_paths:
+    @property
+    def settings_paths(self) -> List[str]:
+        return [
+            os.path.expanduser("~/.claude/settings.json"),
+            os.path.expanduser("~/.claude/settings.local.json")
+        ]
+
+    def touched_paths(self) -> List[str]:
+        return self.settings_paths
+
+    def owned_state(self) -> Dict[str, Any]:
+        """Which of our permissions each settings file allows."""
+        state: Dict[str, Any] = {}
+        for settings_path in self.settings_paths:
+            if not os.path.exists(settings_path):
+                state[settings_path] = None
+                continue
+            allowed = load_document(settings_path).data.get("permissions", {}).get("allow", [])
+            state[settings_path] = [perm for perm in self.REQUIRED_PERMISSIONS if perm in allowed]
+        return state
+        
+    def _permissions_change(self, document: ConfigDocument, action: str, permissions: List[str],
+                            apply: Callable[[], None]) -> Change:
+        return Change("Claude Code", action, document.path, {"permissions": permissions},
+                      apply=apply, fingerprint=document.fingerprint, verify=True)
+
+    def plan_enable_auto_run(self) -> List[Change]:
+        changes = []
+        for settings_path in self.settings_paths:
+            # Read existing settings or create new
+            if os.path.exists(settings_path):
+                document = load_document(settings_path)
+            else:
+                document = new_document(settings_path, {"permissions": {"allow": [], "deny": []}}, self.SETTINGS_FORMAT)
+            settings = document.data
+
+            # Add any missing required permissions
+            allowed = settings.get("permissions", {}).get("allow", [])
+            missing = [perm for perm in self.REQUIRED_PERMISSIONS if perm not in allowed]
+            if not missing:
+                continue
+
+            def add_permissions(document=document, missing=missing):
                 # Create directory if it doesn't exist
-                os.makedirs(os.path.dirname(settings_path), exist_ok=True)
-
-                # Read existing settings or create new
-                settings = {"permissions": {"allow": [], "deny": []}}
-                if os.path.exists(settings_path):
-                    with open(settings_path, 'r') as f:
-                        settings = json.load(f)
-
+                os.makedirs(os.path.dirname(document.path), exist_ok=True)
                 # Ensure permissions structure exists
-                if "permissions" not in settings:
-                    settings["permissions"] = {"allow": [], "deny": []}
-                if "allow" not in settings["permissions"]:
-                    settings["permissions"]["allow"] = []
-
-                # Add any missing required permissions
-                modified = False
-                for perm in self.REQUIRED_PERMISSIONS:
-                    if perm not in settings["permissions"]["allow"]:
-                        settings["permissions"]["allow"].append(perm)
-                        modified = True
-
-                # Write back if modified
-                if modified:
-                    with open(settings_path, 'w') as f:
-                        json.dump(settings, f, indent=2)
+                permissions = document.data.setdefault("permissions", {"allow": [], "deny": []})
+                permissions.setdefault("allow", []).extend(missing)
+                document.save()
 
-            return True
+            changes.append(self._permissions_change(document, "add_permissions", missing, add_permissions))
+        return changes
 
-        except Exception as e:
-            print(f"Error enabling YOLO mode: {str(e)}")
-            return False
-        
-    def disable_auto_run(self) -> bool:
-        try:
-            # Get path to settings.json
-            settings_path = os.path.expanduser("~/.claude/settings.json")
-            settings_local_path = os.path.expanduser("~/.claude/settings.local.json")
-            settings_paths = [settings_path, settings_local_path]
+    def plan_disable_auto_run(self) -> List[Change]:
+        changes = []
+        for settings_path in self.settings_paths:
+            if not os.path.exists(settings_path):
+                continue
 
-            for settings_path in settings_paths:
-                if not os.path.exists(settings_path):
-                    continue
+            # Read existing settings
+            document = load_document(settings_path)
+            settings = document.data
 
-                # Read existing settings
-                with open(settings_path, 'r') as f:
-                    settings = json.load(f)
+            # Skip if no permissions section
+            if "permissions" not in settings or "allow" not in settings["permissions"]:
+                continue
 
-                # Skip if no permissions section
-                if "permissions" not in settings or "allow" not in settings["permissions"]:
-                    continue
+            present = [perm for perm in self.REQUIRED_PERMISSIONS if perm in settings["permissions"]["allow"]]
+            if not present:
+                continue
 
+            def remove_permissions(document=document, present=present):
                 # Remove required permissions from allow list
-                modified = False
-                for perm in self.REQUIRED_PERMISSIONS:
-                    if perm in settings["permissions"]["allow"]:
-                        settings["permissions"]["allow"].remove(perm)
-                        modified = True
+                allowed = document.data["permissions"]["allow"]
+                for perm in present:
+                    allowed.remove(perm)
+                document.save()
+
+            changes.append(self._permissions_change(document, "remove_permissions", present, remove_permissions))
+        return changes
 
-                # Write back if modified
-                if modified:
-                    with open(settings_path, 'w') as f:
-                        json.dump(settings, f, indent=2)
+    def enable_auto_run(self) -> bool:
+        try:
+            Plan(self.plan_enable_auto_run()).apply()
+            return True
 
+        except Exception as e:
+            self.last_error = f"Error enabling YOLO mode: {str(e)}"
+            logger.error(self.last_error)
+            return False
+        
+    def disable_auto_run(self) -> bool:
+        try:
+            Plan(self.plan_disable_auto_run()).apply()
             return True
 
         except Exception as e:
-            print(f"Error disabling YOLO mode: {str(e)}")
-            return False
\ No newline at end of file
+            self.last_error = f"Error disabling YOLO mode: {str(e)}"
+            logger.error(self.last_error)
+            return False
@@ -3,6 +3,10 @@ from src.consts import AppName, PlatformName
 from src.base.base_installer import BaseInstaller
 from src.installers.claude_desktop.mac.mcp_config_creator import ClaudeDesktopMacMCPConfigCreator
 from src.installers.claude_desktop.mac.yolo_enabler import ClaudeDesktopMacYOLOEnabler
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
 
 class ClaudeDesktopMacInstaller(BaseInstaller):
 
@@ -11,7 +15,7 @@ class ClaudeDesktopMacInstaller(BaseInstaller):
             super().__init__()
             self.set_objects(ClaudeDesktopMacYOLOEnabler, ClaudeDesktopMacMCPConfigCreator)
         except Exception as e:
-            print(f"Error initializing ClaudeDesktopMacInstaller: {e}")
+            logger.error(f"Error initializing ClaudeDesktopMacInstaller: {e}")
 
     PLATFORM_NAME = PlatformName.MAC
     APP_NAME = AppName.CLAUDE_DESKTOP
@@ -26,7 +30,6 @@ class ClaudeDesktopMacInstaller(BaseInstaller):
         claude_app_path = "/Applications/Claude.app"
         claude_installed = os.path.exists(claude_app_path)
         if not claude_installed:
-            print("Claude Desktop is not installed")
-            return False
+            return self._invalid("Claude Desktop is not installed")
         
         return True
\ No newline at end of file
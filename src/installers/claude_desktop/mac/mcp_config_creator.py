@@ -2,7 +2,6 @@ import os
 import json
 from typing import Dict, Any
 from src.base.config_creator import ConfigCreator
-from src.utils.node_finder.mac import NodeFinderMac
 from src.consts import  APPLICATION_NAME
 from src.utils.logger import get_logger
 
@@ -16,7 +15,6 @@ class ClaudeDesktopMacMCPConfigCreator(ConfigCreator):
     def __init__(self, config: Dict[str, Any]):
         super().__init__()
         self.config = config
-        self.node_finder = NodeFinderMac()
         logger.debug("ClaudeDesktopMacMCPConfigCreator initialized")
         
     @property
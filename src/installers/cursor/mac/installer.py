@@ -4,6 +4,10 @@ from src.base.base_installer import BaseInstaller
 from src.installers.cursor.mac.mcp_config_creator import CursorMacMCPConfigEditor
 from src.installers.cursor.mac.yolo_enabler import CursorMacYOLOEnabler
 from src.consts import PlatformName, AppName
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
 
 class CursorMacInstaller(BaseInstaller):
 
@@ -12,7 +16,7 @@ class CursorMacInstaller(BaseInstaller):
             super().__init__()
             self.set_objects(CursorMacYOLOEnabler, CursorMacMCPConfigEditor)
         except Exception as e:
-            print(f"Error initializing CursorMacInstaller: {e}")
+            logger.error(f"Error initializing CursorMacInstaller: {e}")
 
     PLATFORM_NAME = PlatformName.MAC
     APP_NAME = AppName.CURSOR
@@ -29,7 +33,6 @@ class CursorMacInstaller(BaseInstaller):
         cursor_app_path = "/Applications/Cursor.app"
         cursor_installed = os.path.exists(cursor_app_path)
         if not (cursor_installed_path or cursor_installed):
-            print("Cursor is not installed")
-            return False
+            return self._invalid("Cursor is not installed")
         
         return True
\ No newline at end of file
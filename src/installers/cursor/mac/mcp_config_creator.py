@@ -2,7 +2,6 @@ import os
 import json
 from typing import Dict, Any
 from src.base.config_creator import ConfigCreator
-from src.utils.node_finder.mac import NodeFinderMac
 from src.utils.logger import get_logger
 
 # Create a logger for this module
@@ -15,7 +14,6 @@ class CursorMacMCPConfigEditor(ConfigCreator):
     def __init__(self, config: Dict[str, Any]):
         super().__init__()
         self.config = config
-        self.node_finder = NodeFinderMac()
 
     @property
     def app_name(self) -> str:
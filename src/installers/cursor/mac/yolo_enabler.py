@@ -1,8 +1,14 @@
 import os
-import sqlite3
 import json
 from src.base.auto_run_enabler import AutoRunEnabler
-from typing import Dict, Any
+from src.utils import json_codec
+from src.base.plan import Change, Plan, PlanError
+from typing import Dict, Any, List, Optional
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
 class CursorMacYOLOEnabler(AutoRunEnabler):
 
     DATABASE_FILE_PATH = os.path.join(os.path.expanduser("~/Library/Application Support/Cursor/User/globalStorage"), "state.vscdb")
@@ -11,70 +17,115 @@ class CursorMacYOLOEnabler(AutoRunEnabler):
     def __init__(self, config: Dict[str, Any]):
         super().__init__()
         self.config = config
+
+    def touched_paths(self) -> List[str]:
+        return [self.DATABASE_FILE_PATH]
         
+    def _read_value(self) -> Optional[str]:
+        """The settings row of STORAGE_KEY, or None if there is none."""
+        # Imported here so that runs not touching Cursor don't load sqlite3
+        import sqlite3
+        conn = sqlite3.connect(self.DATABASE_FILE_PATH)
+        try:
+            row = conn.execute("SELECT value FROM ItemTable WHERE key = ?", (self.STORAGE_KEY,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def owned_state(self) -> Dict[str, Any]:
+        """
+        Only the agent mode's autoRun flag: Cursor rewrites the rest of the
+        database, and of the settings row, all the time.
+        """
+        if not os.path.exists(self.DATABASE_FILE_PATH):
+            return {self.DATABASE_FILE_PATH: None}
+        value = self._read_value()
+        modes = json_codec.loads(value).get('composerState', {}).get('modes4', []) if value else []
+        auto_run = next((mode.get('autoRun') for mode in modes if mode.get('id') == 'agent'), None)
+        return {self.DATABASE_FILE_PATH: auto_run}
+
     def disable_auto_run(self) -> bool:
         # we don't know what was there before, so we just return true
         return True
 
+    def plan_enable_auto_run(self) -> List[Change]:
+        """
+        Read the Cursor settings row once and plan setting autoRun on the agent
+        mode. Applying it only writes if the row still holds what was read.
+        """
+        # Imported here so that runs not touching Cursor don't load sqlite3
+        import sqlite3
+        if not os.path.exists(self.DATABASE_FILE_PATH):
+            raise FileNotFoundError(f"Database file not found at {self.DATABASE_FILE_PATH}")
+        original_value = self._read_value()
+        if original_value is None:
+            raise PlanError(f"No row found for key: {self.STORAGE_KEY}")
+            
+        # Parse the JSON value
+        settings = json_codec.loads(original_value)
+        
+        # Ensure composerState exists
+        if 'composerState' not in settings:
+            settings['composerState'] = {}
+        
+        # Update the autoRun setting for agent mode
+        if 'modes4' not in settings['composerState']:
+            settings['composerState']['modes4'] = []
+        
+        # Find and update the agent mode
+        agent_mode_found = False
+        for mode in settings['composerState']['modes4']:
+            if mode.get('id') == 'agent':
+                agent_mode_found = True
+                if mode.get('autoRun') is True:
+                    return []
+                mode['autoRun'] = True
+                break
+        
+        if not agent_mode_found:
+            # Add agent mode if it doesn't exist
+            settings['composerState']['modes4'].append({
+                'id': 'agent',
+                'autoRun': True
+            })
+        
+        # Convert back to JSON string
+        updated_value = json_codec.dumps(settings)
+
+        def write_value():
+            conn = sqlite3.connect(self.DATABASE_FILE_PATH)
+            try:
+                with conn:
+                    # Cursor may have rewritten the row since it was planned
+                    current = conn.execute("SELECT value FROM ItemTable WHERE key = ?", (self.STORAGE_KEY,)).fetchone()
+                    if current is None or current[0] != original_value:
+                        raise PlanError(f"{self.STORAGE_KEY} changed since the plan was made")
+                    # Insert or replace the value
+                    conn.execute("INSERT OR REPLACE INTO ItemTable (key, value) VALUES (?, ?)",
+                                 (self.STORAGE_KEY, updated_value))
+            finally:
+                conn.close()
+
+        return [Change("Cursor", "set_sqlite_key", self.DATABASE_FILE_PATH,
+                       {"key": self.STORAGE_KEY, "set": "composerState.modes4[agent].autoRun = true"},
+                       apply=write_value)]
+
     def enable_auto_run(self) -> bool:
+        # Imported here so that runs not touching Cursor don't load sqlite3
+        import sqlite3
         try:
-            if not os.path.exists(self.DATABASE_FILE_PATH):
-                raise FileNotFoundError(f"Database file not found at {self.DATABASE_FILE_PATH}")
-            conn = sqlite3.connect(self.DATABASE_FILE_PATH)
-            cursor = conn.cursor()
-            
-            # Read current value
-            cursor.execute("SELECT value FROM ItemTable WHERE key = ?", (self.STORAGE_KEY,))
-            row = cursor.fetchone()
-            
-            if not row:
-                print("No row found for key:", self.STORAGE_KEY)
-                return False
-                
-            # Parse the JSON value
-            settings = json.loads(row[0])
-            
-            # Ensure composerState exists
-            if 'composerState' not in settings:
-                settings['composerState'] = {}
-            
-            # Update the autoRun setting for agent mode
-            if 'modes4' not in settings['composerState']:
-                settings['composerState']['modes4'] = []
-            
-            # Find and update the agent mode
-            agent_mode_found = False
-            for mode in settings['composerState']['modes4']:
-                if mode.get('id') == 'agent':
-                    agent_mode_found = True
-                    mode['autoRun'] = True
-                    break
-            
-            if not agent_mode_found:
-                # Add agent mode if it doesn't exist
-                settings['composerState']['modes4'].append({
-                    'id': 'agent',
-                    'autoRun': True
-                })
-            
-            # Convert back to JSON string
-            updated_value = json.dumps(settings)
-            
-            # Insert or replace the value
-            cursor.execute("INSERT OR REPLACE INTO ItemTable (key, value) VALUES (?, ?)", 
-                         (self.STORAGE_KEY, updated_value))
-            
-            conn.commit()
-            conn.close()
-            
+            Plan(self.plan_enable_auto_run()).apply()
             return True
             
         except sqlite3.Error as e:
-            print(f"Error enabling auto run for Cursor: {e}")
+            self.last_error = f"Error enabling auto run for Cursor: {e}"
+            logger.error(self.last_error)
             return False
         except json.JSONDecodeError as e:
-            print(f"Error decoding JSON: {e}")
+            self.last_error = f"Error decoding JSON: {e}"
+            logger.error(self.last_error)
             return False
         except Exception as e:
-            print(f"Error enabling auto run for Cursor: {e}")
-            return False
\ No newline at end of file
+            self.last_error = f"Error enabling auto run for Cursor: {e}"
+            logger.error(self.last_error)
+            return False
@@ -0,0 +1,75 @@
+import importlib
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.base.base_installer import BaseInstaller
+from src.consts import AppName, PlatformName
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+
+class ClientDescriptor:
+    """
+    A supported client and where its installer lives on each platform, as
+    "module:Class" strings, so nothing is imported until it is needed.
+    """
+
+    def __init__(self, key: str, title: str, installers: Dict[str, str]):
+        self.key = key
+        self.title = title
+        self.installers = installers
+
+    def supports(self, os_key: str) -> bool:
+        return os_key in self.installers
+
+
+class InstallerRegistry:
+    """
+    Lazily imports and instantiates installers: an installer is only built
+    the first time its client is selected or iterated, then reused.
+    """
+
+    def __init__(self, descriptors: List[ClientDescriptor]):
+        self._descriptors = {descriptor.key: descriptor for descriptor in descriptors}
+        self._installers: Dict[Tuple[str, str], BaseInstaller] = {}
+
+    def descriptors(self) -> List[ClientDescriptor]:
+        return list(self._descriptors.values())
+
+    def get(self, client: str, os_key: str) -> Optional[BaseInstaller]:
+        """Return the installer of `client` on `os_key`, or None if there is none."""
+        descriptor = self._descriptors.get(client)
+        if descriptor is None or not descriptor.supports(os_key):
+            return None
+        installer = self._installers.get((client, os_key))
+        if installer is None:
+            module_name, class_name = descriptor.installers[os_key].split(":")
+            logger.debug(f"Loading installer {class_name} for {client}")
+            installer = getattr(importlib.import_module(module_name), class_name)()
+            self._installers[(client, os_key)] = installer
+        return installer
+
+    def installers(self, os_key: str) -> Iterator[Tuple[str, BaseInstaller]]:
+        """Yield (client, installer) for every client supported on `os_key`, in registration order."""
+        for descriptor in self._descriptors.values():
+            installer = self.get(descriptor.key, os_key)
+            if installer is not None:
+                yield descriptor.key, installer
+
+
+CLIENT_DESCRIPTORS = [
+    ClientDescriptor(AppName.CURSOR, "Cursor", {
+        PlatformName.MAC: "src.installers.cursor.mac.installer:CursorMacInstaller",
+    }),
+    ClientDescriptor(AppName.CLAUDE_DESKTOP, "Claude Desktop", {
+        PlatformName.MAC: "src.installers.claude_desktop.mac.installer:ClaudeDesktopMacInstaller",
+    }),
+    ClientDescriptor(AppName.CLAUDE_CODE, "Claude Code", {
+        PlatformName.MAC: "src.installers.claude_code.mac.installer:ClaudeCodeMacInstaller",
+    }),
+    ClientDescriptor(AppName.WINDSURF, "Windsurf", {
+        PlatformName.MAC: "src.installers.windsurf.mac.installer:WindsurfMacInstaller",
+    }),
+]
+
+installer_registry = InstallerRegistry(CLIENT_DESCRIPTORS)
@@ -4,6 +4,10 @@ from src.base.base_installer import BaseInstaller
 from src.installers.windsurf.mac.mcp_config_creator import WindsurfMacMCPConfigEditor
 from src.installers.windsurf.mac.yolo_enabler import WindsurfMacYOLOEnabler
 from src.consts import PlatformName, AppName
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
 
 class WindsurfMacInstaller(BaseInstaller):
 
@@ -12,7 +16,7 @@ class WindsurfMacInstaller(BaseInstaller):
             super().__init__()
             self.set_objects(WindsurfMacYOLOEnabler, WindsurfMacMCPConfigEditor)
         except Exception as e:
-            print(f"Error initializing WindsurfMacInstaller: {e}")
+            logger.error(f"Error initializing WindsurfMacInstaller: {e}")
 
     PLATFORM_NAME = PlatformName.MAC
     APP_NAME = AppName.WINDSURF
@@ -29,8 +33,7 @@ class WindsurfMacInstaller(BaseInstaller):
         windsurf_app_path = "/Applications/Windsurf.app"
         windsurf_installed = os.path.exists(windsurf_app_path)
         if not (windsurf_installed_path or windsurf_installed):
-            print("Windsurf is not installed")
-            return False
+            return self._invalid("Windsurf is not installed")
         
         return True
         
\ No newline at end of file
@@ -0,0 +1,127 @@
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.consts import APPLICATION_DIR_NAME, ARTIFACT_CACHE_DIR_NAME, ARTIFACT_CACHE_MAX_BYTES
+from src.utils.atomic_write import commit_text
+from src.utils.downloader import fetch_file, file_sha256
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+_INDEX_FILE_NAME = "index.json"
+
+# Serializes fetches: each one reads and rewrites the index and may evict files
+_cache_lock = threading.Lock()
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+
+
+class ArtifactCache:
+    """
+    Downloaded artifacts under ~/.mint/mcp_proxy/artifacts, one directory per
+    content version (<sha256 prefix>/<file name>). The index keeps, per URL,
+    the current version with its ETag and Last-Modified, so fetching an
+    unchanged artifact again is a single conditional GET answered with 304.
+    Least recently used versions are evicted beyond `max_bytes`.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = ARTIFACT_CACHE_MAX_BYTES):
+        self.root = root or os.path.join(str(Path.home()), APPLICATION_DIR_NAME, ARTIFACT_CACHE_DIR_NAME)
+        self.max_bytes = max_bytes
+        self._index_path = os.path.join(self.root, _INDEX_FILE_NAME)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._index_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable artifact index: {e}")
+            return {}
+
+    def _conditional_headers(self, entry: Optional[Dict[str, Any]], sha256: Optional[str]) -> Dict[str, str]:
+        """Validators of the cached version, when it is still on disk and is the one wanted."""
+        if not entry or not os.path.isfile(os.path.join(self.root, entry["path"])):
+            return {}
+        if sha256 and entry["sha256"] != sha256.lower():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def fetch(self, url: str, sha256: Optional[str] = None) -> str:
+        """
+        Return the local path of the current version of `url`, downloading it
+        only if the server reports a change (or the cache has no usable copy).
+
+        Raises:
+            DownloadError: If the download failed
+        """
+        with _cache_lock:
+            os.makedirs(self.root, exist_ok=True)
+            index = self._load_index()
+            entry = index.get(url)
+            conditional_headers = self._conditional_headers(entry, sha256)
+
+            # Staged per URL, so an interrupted download resumes on the next run
+            staging_path = os.path.join(self.root, _url_key(url) + ".download")
+            headers = fetch_file(url, staging_path, sha256, conditional_headers=conditional_headers)
+            if headers is None:
+                logger.info(f"Cached {entry['path']} is up to date")
+                path = os.path.join(self.root, entry["path"])
+                os.utime(os.path.dirname(path))
+                return path
+
+            digest = file_sha256(staging_path)
+            relative_path = os.path.join(digest[:16], url.split("/")[-1] or "artifact")
+            path = os.path.join(self.root, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(staging_path, path)
+            os.utime(os.path.dirname(path))
+            index[url] = {
+                "path": relative_path,
+                "sha256": digest,
+                "size": os.path.getsize(path),
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified")
+            }
+            logger.info(f"Cached {url} as {relative_path}")
+
+            self._evict(index, keep=os.path.dirname(relative_path))
+            commit_text(self._index_path, json.dumps(index, indent=2))
+            return path
+
+    def _evict(self, index: Dict[str, Dict[str, Any]], keep: str) -> None:
+        """Remove the least recently used versions, other than `keep`, until the cache fits in max_bytes."""
+        versions = []
+        total = 0
+        for entry in os.scandir(self.root):
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file(follow_symlinks=False))
+            versions.append((entry.stat().st_mtime_ns, entry.name, size))
+            total += size
+
+        for _, name, size in sorted(versions):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            logger.debug(f"Evicting cached artifact version {name} ({size} bytes)")
+            for f in os.scandir(os.path.join(self.root, name)):
+                os.remove(f.path)
+            os.rmdir(os.path.join(self.root, name))
+            total -= size
+
+        for url in [url for url, entry in index.items() if not os.path.isfile(os.path.join(self.root, entry["path"]))]:
+            del index[url]
@@ -0,0 +1,114 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Dict, Iterator, Optional
+from src.utils.logger import get_logger
+from src.utils.os_utils import Fingerprint, file_fingerprint
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Fingerprints of the files committed by this process, keyed by absolute path
+_committed: Dict[str, Fingerprint] = {}
+
+
+def committed_fingerprint(path: str) -> Optional[Fingerprint]:
+    """Return the fingerprint `path` had right after this process last committed it."""
+    return _committed.get(os.path.abspath(path))
+
+
+def _same_content(path: str, data: bytes) -> bool:
+    """Check whether the file at `path` already holds exactly `data`."""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def _fsync_directory(dir_name: str) -> None:
+    try:
+        dir_fd = os.open(dir_name, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def _current_umask() -> int:
+    # The only way to read the umask is to set it; done once, at import, before any thread starts
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _current_umask()
+
+
+@contextmanager
+def atomic_writer(path: str, mode: str = 'wb', **open_kwargs) -> Iterator[IO]:
+    """
+    Open a temporary file next to `path` for writing. When the block exits
+    cleanly the file is fsynced and renamed over `path`, otherwise it is
+    removed and `path` is left untouched.
+
+    A symlinked `path` (as dotfile managers set up) is written through: the
+    link is kept and its target replaced. The target keeps its permissions
+    and, where allowed, its owner; a new file gets the umask default mode.
+    """
+    target = os.path.realpath(path)
+    dir_name = os.path.dirname(target)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(target)}.", suffix=".tmp", dir=dir_name)
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            stat = os.stat(target)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        else:
+            os.chmod(tmp_path, stat.st_mode & 0o7777)
+            if hasattr(os, "chown") and (stat.st_uid, stat.st_gid) != (os.getuid(), os.getgid()):
+                try:
+                    os.chown(tmp_path, stat.st_uid, stat.st_gid)
+                except OSError as e:
+                    logger.debug(f"Could not keep the owner of {target}: {e}")
+        os.replace(tmp_path, target)
+        _fsync_directory(dir_name)
+        _committed[os.path.abspath(path)] = file_fingerprint(path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def commit_file(path: str, data: bytes) -> bool:
+    """
+    Atomically replace the contents of `path` with `data`, skipping the write
+    entirely when the file already holds the same bytes.
+
+    Returns:
+        bool: True if the file was written, False if it was already up to date
+    """
+    if _same_content(path, data):
+        logger.debug(f"Content unchanged, skipping write: {path}")
+        _committed[os.path.abspath(path)] = file_fingerprint(path)
+        return False
+
+    with atomic_writer(path) as f:
+        f.write(data)
+    logger.debug(f"Committed {len(data)} bytes to: {path}")
+    return True
+
+
+def commit_text(path: str, text: str) -> bool:
+    """Text variant of `commit_file`, encoded as UTF-8."""
+    return commit_file(path, text.encode('utf-8'))
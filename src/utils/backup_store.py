@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from src.consts import APPLICATION_DIR_NAME, BACKUP_DIR_NAME, BACKUP_RETENTION_GENERATIONS, BACKUP_RETENTION_MAX_AGE_DAYS
+from src.utils.atomic_write import commit_file, commit_text
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+INDEX_FILE_NAME = "index.json"
+OBJECTS_DIR_NAME = "objects"
+COMPRESSION_LEVEL = 6
+# Size of the slices a config is hashed and compressed in
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Serializes object writes and index updates when several clients are backed up concurrently
+_index_lock = threading.Lock()
+
+
+class BackupError(Exception):
+    """Raised when a backup cannot be stored or restored"""
+    pass
+
+
+class BackupGeneration:
+    """One backup of a client config file, as recorded in the store index."""
+
+    def __init__(self, client: str, source_path: str, digest: str, size: int, created: float):
+        self.client = client
+        self.source_path = source_path
+        self.digest = digest
+        self.size = size
+        self.created = created
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source_path": self.source_path,
+            "digest": self.digest,
+            "size": self.size,
+            "created": self.created
+        }
+
+    @classmethod
+    def from_dict(cls, client: str, data: Dict[str, Any]) -> "BackupGeneration":
+        return cls(client, data["source_path"], data["digest"], data["size"], data["created"])
+
+
+def _read_config(path: str, compress: bool) -> Tuple[str, int, bytes]:
+    """
+    Hash (and compress) a config file in chunks, so only the compressed copy
+    is held in memory. Returns its SHA-256, its size and the compressed bytes.
+    """
+    sha256 = hashlib.sha256()
+    compressor = zlib.compressobj(COMPRESSION_LEVEL)
+    compressed: List[bytes] = []
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            size += len(chunk)
+            if compress:
+                compressed.append(compressor.compress(chunk))
+    if compress:
+        compressed.append(compressor.flush())
+    return sha256.hexdigest(), size, b"".join(compressed)
+
+
+class BackupStore:
+    """
+    Content-addressed store of config backups under ~/.mint/mcp_proxy/backups.
+
+    Each snapshot is stored once, zlib-compressed, under its SHA-256. An index
+    keeps the generations of every client (oldest first) so listing them never
+    touches the objects themselves. Generations beyond `max_generations`, or
+    older than `max_age_days`, are evicted along with objects nobody references.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_generations: Optional[int] = None,
+                 max_age_days: Optional[float] = None):
+        self.root = root or os.path.join(str(Path.home()), APPLICATION_DIR_NAME, BACKUP_DIR_NAME)
+        if max_generations is None:
+            max_generations = int(os.environ.get("MINT_BACKUP_RETENTION", BACKUP_RETENTION_GENERATIONS))
+        self.max_generations = max_generations
+        if max_age_days is None:
+            max_age_days = os.environ.get("MINT_BACKUP_MAX_AGE_DAYS") or BACKUP_RETENTION_MAX_AGE_DAYS
+        self.max_age_days = float(max_age_days) if max_age_days is not None else None
+        self._index: Optional[Dict[str, List[Dict[str, Any]]]] = None
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, INDEX_FILE_NAME)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, OBJECTS_DIR_NAME, digest[:2], f"{digest}.zz")
+
+    def _load_index(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r') as f:
+                    self._index = json.load(f).get("clients", {})
+            except FileNotFoundError:
+                self._index = {}
+            except (OSError, ValueError) as e:
+                logger.error(f"Backup index is unreadable, starting a new one: {e}")
+                self._index = {}
+        return self._index
+
+    def _save_index(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        commit_text(self.index_path, json.dumps({"clients": self._load_index()}, indent=2))
+
+    def generations(self, client: str) -> List[BackupGeneration]:
+        """Return the backups of `client`, newest first."""
+        entries = self._load_index().get(client, [])
+        return [BackupGeneration.from_dict(client, entry) for entry in reversed(entries)]
+
+    def pending_generation(self, client: str, path: str, created: Optional[float] = None,
+                           source_path: Optional[str] = None) -> BackupGeneration:
+        """The generation `snapshot` would record for `path`, computed without writing anything."""
+        digest, size, _ = _read_config(path, compress=False)
+        return BackupGeneration(client, source_path or path, digest, size,
+                                created if created is not None else time.time())
+
+    def generations_with(self, generation: BackupGeneration) -> List[BackupGeneration]:
+        """
+        The backups of `generation.client`, newest first, as they would be
+        once `generation` is snapshotted and the retention policy applied.
+        Nothing is written.
+        """
+        entries = list(self._load_index().get(generation.client, []))
+        if not entries or entries[-1]["digest"] != generation.digest or entries[-1]["source_path"] != generation.source_path:
+            entries.append(generation.to_dict())
+            entries.sort(key=lambda entry: entry["created"])
+            entries = self._retained(entries)
+        return [BackupGeneration.from_dict(generation.client, entry) for entry in reversed(entries)]
+
+    def snapshot(self, client: str, path: str, created: Optional[float] = None,
+                 source_path: Optional[str] = None) -> BackupGeneration:
+        """
+        Back up the current contents of `path` as a new generation of `client`,
+        to be restored to `source_path` (`path` itself by default).
+        Content that is already stored is not written again, and a snapshot identical
+        to the client's latest generation does not add a new one.
+        """
+        source_path = source_path or path
+        digest, size, compressed = _read_config(path, compress=True)
+
+        # The object is written under the same lock as the index: another
+        # snapshot's eviction removes any object the index does not reference yet
+        with _index_lock:
+            object_path = self._object_path(digest)
+            if os.path.exists(object_path):
+                logger.debug(f"Backup content already stored: {digest}")
+            else:
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                commit_file(object_path, compressed)
+                logger.debug(f"Stored backup object: {object_path}")
+
+            # Another store may have updated the index since it was loaded
+            self._index = None
+            entries = self._load_index().setdefault(client, [])
+            if entries and entries[-1]["digest"] == digest and entries[-1]["source_path"] == source_path:
+                logger.info(f"Config unchanged since the last backup of {client}, keeping it")
+                return BackupGeneration.from_dict(client, entries[-1])
+
+            generation = BackupGeneration(client, source_path, digest, size,
+                                          created if created is not None else time.time())
+            entries.append(generation.to_dict())
+            entries.sort(key=lambda entry: entry["created"])
+            self._evict()
+            self._save_index()
+            logger.info(f"Created backup of {path} ({digest[:12]})")
+            return generation
+
+    def restore(self, generation: BackupGeneration, target_path: Optional[str] = None) -> bool:
+        """
+        Write the contents of `generation` back to `target_path` (its source path by default).
+
+        Returns:
+            bool: True if the file was written, False if it already held that content
+        """
+        try:
+            with open(self._object_path(generation.digest), 'rb') as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error) as e:
+            raise BackupError(f"Backup {generation.digest[:12]} of {generation.client} is unreadable: {e}")
+        if hashlib.sha256(data).hexdigest() != generation.digest:
+            raise BackupError(f"Backup {generation.digest[:12]} of {generation.client} is corrupted")
+        return commit_file(target_path or generation.source_path, data)
+
+    def _retained(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """The entries (oldest first) the retention policy keeps."""
+        # Always keep the newest generation, whatever the policy
+        kept = entries[-max(self.max_generations, 1):]
+        if self.max_age_days is not None:
+            min_created = time.time() - self.max_age_days * 86400
+            kept = [entry for entry in kept[:-1] if entry["created"] >= min_created] + kept[-1:]
+        return kept
+
+    def _evict(self) -> None:
+        index = self._load_index()
+        for client, entries in index.items():
+            kept = self._retained(entries)
+            if len(kept) != len(entries):
+                logger.debug(f"Evicting {len(entries) - len(kept)} backup generation(s) of {client}")
+                index[client] = kept
+
+        referenced = {entry["digest"] for entries in index.values() for entry in entries}
+        objects_dir = os.path.join(self.root, OBJECTS_DIR_NAME)
+        if not os.path.isdir(objects_dir):
+            return
+        for prefix in os.listdir(objects_dir):
+            prefix_dir = os.path.join(objects_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                if name.endswith(".zz") and name[:-3] not in referenced:
+                    os.remove(os.path.join(prefix_dir, name))
+                    logger.debug(f"Removed unreferenced backup object: {name}")
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+
+class ClientStatus:
+    INSTALLED = "installed"
+    UNINSTALLED = "uninstalled"
+    REVERTED = "reverted"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+class ClientResult:
+    """Outcome of running one client's installation or uninstallation."""
+
+    def __init__(self, client: str, status: str, messages: Optional[List[str]] = None,
+                 error: Optional[str] = None):
+        self.client = client
+        self.status = status
+        # User-facing lines, printed by the caller in client order
+        self.messages = messages or []
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status != ClientStatus.FAILED
+
+    def to_dict(self) -> dict:
+        return {"client": self.client, "status": self.status, "error": self.error}
+
+
+# One unit of work: the client key and the installer it runs on
+ClientTask = Tuple[str, Any]
+
+
+def run_clients(tasks: List[ClientTask], action: Callable[[str, Any], ClientResult],
+                max_workers: Optional[int] = None) -> Iterator[ClientResult]:
+    """
+    Run `action` for every (client, installer) task and yield the results in
+    the order of `tasks`, whatever order they finish in, so output stays
+    deterministic. Clients touch independent files and run on a thread pool
+    of `max_workers` threads (one per client by default); with
+    `max_workers=1` they run one after another on the calling thread.
+
+    An exception raised by `action` is reported as a failed result of that
+    client rather than aborting the others.
+    """
+    def run(task: ClientTask) -> ClientResult:
+        client, installer = task
+        try:
+            return action(client, installer)
+        except Exception as e:
+            logger.error(f"Error running {client}: {e}")
+            logger.exception("Exception details:")
+            return ClientResult(client, ClientStatus.FAILED, error=str(e))
+
+    workers = min(max_workers or len(tasks), len(tasks))
+    if workers <= 1:
+        for task in tasks:
+            yield run(task)
+        return
+
+    logger.debug(f"Running {len(tasks)} clients on {workers} threads")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="client") as executor:
+        futures = [executor.submit(run, task) for task in tasks]
+        for future in futures:
+            yield future.result()
@@ -0,0 +1,100 @@
+import os
+from typing import Dict, Any, Optional
+from src.utils.logger import get_logger
+from src.utils import json_codec
+from src.utils.atomic_write import commit_text
+from src.utils.os_utils import Fingerprint, file_fingerprint
+from src.utils.json_format import JsonFormat, detect_format
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+class ConfigDocument:
+    """
+    A parsed client config file together with the fingerprint of the
+    bytes it was parsed from and their formatting, so that it is written
+    back in the style the client uses.
+    """
+
+    def __init__(self, path: str, data: Any, fingerprint: Optional[Fingerprint], json_format: JsonFormat):
+        self.path = path
+        self.data = data
+        self.fingerprint = fingerprint
+        self.format = json_format
+
+    def is_fresh(self) -> bool:
+        """Check that the file on disk is still the one this document was parsed from."""
+        return file_fingerprint(self.path) == self.fingerprint
+
+    def save(self) -> bool:
+        """
+        Write the (possibly mutated) data back to disk in the document's
+        original format and refresh the fingerprint.
+
+        Returns:
+            bool: True if the file was written, False if it already held the same bytes
+        """
+        written = commit_text(self.path, self.format.dumps_document(self.data))
+        self.fingerprint = file_fingerprint(self.path)
+        _documents[self.path] = self
+        logger.debug(f"Saved config document: {self.path} (written: {written})")
+        return written
+
+
+# Documents parsed during this process, keyed by absolute path
+_documents: Dict[str, ConfigDocument] = {}
+
+
+def _normalize_path(path: str) -> str:
+    return os.path.abspath(os.path.expanduser(path))
+
+
+def load_document(path: str) -> ConfigDocument:
+    """
+    Return the parsed config file at `path`.
+
+    Each file is parsed at most once per process and re-read only when its
+    (inode, size, mtime_ns) fingerprint changed on disk. Callers share the
+    returned document, so code that mutates `document.data` must either
+    `save()` it or `invalidate_document()` the path.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    path = _normalize_path(path)
+    fingerprint = file_fingerprint(path)
+    if fingerprint is None:
+        _documents.pop(path, None)
+        raise FileNotFoundError(f"Config file not found: {path}")
+
+    cached = _documents.get(path)
+    if cached is not None and cached.fingerprint == fingerprint:
+        logger.debug(f"Using cached config document: {path}")
+        return cached
+
+    logger.debug(f"Parsing config document: {path}")
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    document = ConfigDocument(path, json_codec.loads(text), fingerprint, detect_format(text))
+    _documents[path] = document
+    return document
+
+
+def peek_document(path: str) -> Optional[ConfigDocument]:
+    """Return the cached document for `path` if it is still fresh, without parsing anything."""
+    path = _normalize_path(path)
+    cached = _documents.get(path)
+    if cached is not None and cached.is_fresh():
+        return cached
+    return None
+
+
+def new_document(path: str, data: Any, json_format: JsonFormat) -> ConfigDocument:
+    """Create a document for a file that does not exist yet; it is cached once saved."""
+    return ConfigDocument(_normalize_path(path), data, None, json_format)
+
+
+def invalidate_document(path: str) -> None:
+    """Drop the cached document for `path` so the next load re-parses it."""
+    _documents.pop(_normalize_path(path), None)
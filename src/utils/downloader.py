@@ -1,13 +1,159 @@
-import requests
-
-def download_file(url: str, local_path: str):
-    try:        
-        response = requests.get(url)
-        with open(local_path, "wb") as file:
-            file.write(response.content)
-    except Exception as e:
-        print(f"Error downloading file: {e}")
-        return False
-    
-    return True
-    
\ No newline at end of file
+import os
+import time
+import hashlib
+from typing import Dict, Optional
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# (connect, read) timeouts; the read timeout applies between chunks, not to the whole transfer
+DOWNLOAD_TIMEOUT = (10, 30)
+DOWNLOAD_RETRIES = 4
+DOWNLOAD_BACKOFF_SECONDS = 1.0
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot complete; `retryable` tells whether trying again may help"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _validator(headers) -> Optional[str]:
+    """What to send as If-Range: a strong ETag, else Last-Modified (weak ETags are not allowed there)."""
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
+
+
+def _discard_part(part_path: str) -> None:
+    for path in (part_path, part_path + ".validator"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _fetch_to_part(requests, url: str, part_path: str, timeout, conditional_headers: Optional[Dict[str, str]] = None,
+                   verified: bool = False) -> Optional[Dict[str, str]]:
+    """
+    Stream `url` into `part_path`, resuming after whatever an earlier attempt
+    left there with a Range request. The resumed request carries If-Range
+    with the validator saved from the first response, so a changed artifact
+    is sent whole instead of being appended to the old prefix. A part file
+    without a validator is only resumed when the result is `verified` by
+    hash, and is discarded otherwise. `conditional_headers` are only sent
+    for a fresh transfer. Returns the response headers once the whole body
+    is on disk, or None if the server answered 304 Not Modified.
+    """
+    validator_path = part_path + ".validator"
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    validator = None
+    if offset and os.path.exists(validator_path):
+        with open(validator_path, 'r') as f:
+            validator = f.read().strip() or None
+    if offset and validator is None and not verified:
+        logger.debug(f"Discarding {part_path}: nothing to check a resumed download against")
+        _discard_part(part_path)
+        offset = 0
+
+    if offset:
+        headers = {"Range": f"bytes={offset}-"}
+        if validator:
+            headers["If-Range"] = validator
+    else:
+        headers = dict(conditional_headers or {})
+    with requests.get(url, stream=True, timeout=timeout, headers=headers) as response:
+        if response.status_code == 304 and not offset:
+            return None
+        if response.status_code == 416 and offset:
+            # Only reached when the part file matches the current artifact (If-Range) or gets hashed
+            logger.debug(f"Server has nothing past byte {offset}, treating {part_path} as complete")
+            return response.headers
+        if response.status_code >= 400:
+            raise DownloadError(f"HTTP {response.status_code} for {url}", retryable=response.status_code >= 500)
+
+        if response.status_code == 206 and response.headers.get("Content-Range", "").startswith(f"bytes {offset}-"):
+            logger.debug(f"Resuming download at byte {offset}")
+            mode = 'ab'
+        else:
+            # A fresh transfer, or the artifact changed (If-Range failed) or the server ignored Range
+            offset = 0
+            mode = 'wb'
+            new_validator = _validator(response.headers)
+            if new_validator:
+                with open(validator_path, 'w') as f:
+                    f.write(new_validator)
+            elif os.path.exists(validator_path):
+                os.remove(validator_path)
+
+        expected = response.headers.get("Content-Length")
+        received = 0
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                received += len(chunk)
+        if expected is not None and received < int(expected):
+            raise DownloadError(f"Connection closed after {offset + received} bytes")
+        return response.headers
+
+
+def fetch_file(url: str, local_path: str, sha256: Optional[str] = None, retries: int = DOWNLOAD_RETRIES,
+               timeout=DOWNLOAD_TIMEOUT, conditional_headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+    """
+    Download `url` to `local_path` in chunks through `local_path`.part, so an
+    interrupted transfer is resumed rather than restarted, retrying with
+    exponential backoff. When `sha256` is given the file must match it. The
+    file is only renamed into place once complete and verified.
+
+    Returns the response headers, or None when `conditional_headers`
+    (If-None-Match / If-Modified-Since) got a 304 and nothing was written.
+
+    Raises:
+        DownloadError: If the download failed for good
+    """
+    # Only --download needs requests, so don't pay for importing it on every run
+    import requests
+
+    part_path = local_path + ".part"
+    for attempt in range(retries + 1):
+        if attempt:
+            delay = DOWNLOAD_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            logger.info(f"Retrying download in {delay:.0f}s (attempt {attempt + 1}/{retries + 1})")
+            time.sleep(delay)
+        try:
+            headers = _fetch_to_part(requests, url, part_path, timeout, conditional_headers, verified=bool(sha256))
+            if headers is None:
+                logger.debug(f"{url} not modified")
+                return None
+            if sha256:
+                actual = file_sha256(part_path)
+                if actual != sha256.lower():
+                    # A corrupt part file cannot be resumed, start over next time
+                    _discard_part(part_path)
+                    raise DownloadError(f"SHA-256 mismatch for {url}: expected {sha256}, got {actual}")
+            os.replace(part_path, local_path)
+            if os.path.exists(part_path + ".validator"):
+                os.remove(part_path + ".validator")
+            return headers
+        except DownloadError as e:
+            logger.warning(f"Download attempt {attempt + 1} failed: {e}")
+            if not e.retryable:
+                raise
+            error = e
+        except (requests.RequestException, OSError) as e:
+            logger.warning(f"Download attempt {attempt + 1} failed: {e}")
+            error = e
+
+    raise DownloadError(str(error))
+
@@ -1,9 +1,111 @@
+import os
+import shutil
 import zipfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from src.utils.logger import get_logger
 
-def decrypt_zip(zip_path: str, save_to: str ,key: str):
+# Create a logger for this module
+logger = get_logger(__name__)
+
+EXTRACT_CHUNK_SIZE = 1024 * 1024
+# Below this much compressed data, starting worker processes costs more than it saves
+PARALLEL_EXTRACT_MIN_BYTES = 8 * 1024 * 1024
+
+
+def _member_path(filename: str) -> Optional[str]:
+    """Relative path to extract a member to, sanitized the way ZipFile.extract does (no absolute paths, no ..)."""
+    arcname = filename.replace('/', os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [part for part in arcname.split(os.path.sep) if part not in ('', os.path.curdir, os.path.pardir)]
+    return os.path.join(*parts) if parts else None
+
+
+def _extract_members(zip_path: str, names: List[str], staging_dir: str, pwd: Optional[bytes]) -> int:
+    """
+    Worker: extract `names` into `staging_dir` with a ZipFile handle of its
+    own, streaming each member in bounded chunks. Reading a member to the
+    end checks its CRC-32, so a wrong password or corrupt data raises
+    BadZipFile. Returns the number of bytes written.
+    """
+    written = 0
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for name in names:
+            info = zip_ref.getinfo(name)
+            relative_path = _member_path(info.filename)
+            if relative_path is None:
+                continue
+            target = os.path.join(staging_dir, relative_path)
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with zip_ref.open(info, pwd=pwd) as source, open(target, 'wb') as destination:
+                shutil.copyfileobj(source, destination, EXTRACT_CHUNK_SIZE)
+            written += info.file_size
+    return written
+
+
+def _balance(infos: List[zipfile.ZipInfo], workers: int) -> List[List[str]]:
+    """Split members into `workers` batches of similar compressed size, largest members first."""
+    sizes = [0] * workers
+    batches: List[List[str]] = [[] for _ in range(workers)]
+    for info in sorted(infos, key=lambda info: info.compress_size, reverse=True):
+        smallest = sizes.index(min(sizes))
+        sizes[smallest] += info.compress_size
+        batches[smallest].append(info.filename)
+    return [names for names in batches if names]
+
+
+def _move_into_place(staging_dir: str, save_to: str) -> None:
+    """Publish a completed staging directory: a single rename when `save_to` is new, else file by file."""
+    if not os.path.exists(save_to):
+        os.replace(staging_dir, save_to)
+        return
+    for root, dirs, files in os.walk(staging_dir):
+        destination_root = os.path.join(save_to, os.path.relpath(root, staging_dir))
+        os.makedirs(destination_root, exist_ok=True)
+        for file_name in files:
+            os.replace(os.path.join(root, file_name), os.path.join(destination_root, file_name))
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def decrypt_zip(zip_path: str, save_to: str ,key: str, workers: Optional[int] = None):
+    """
+    Extract the password-protected `zip_path` into `save_to`. Members are
+    spread over a process pool (ZipCrypto is decrypted in pure Python, so
+    threads would not help) and written to a staging directory next to
+    `save_to`; nothing lands in `save_to` unless every member decrypted and
+    passed its CRC check.
+    """
+    save_to = os.path.abspath(save_to)
+    parent_dir = os.path.dirname(save_to)
+    os.makedirs(parent_dir, exist_ok=True)
+    # Not mkdtemp: its 0700 mode would carry over when the directory is renamed into place
+    staging_dir = os.path.join(parent_dir, f".{os.path.basename(save_to)}.extract-{uuid.uuid4().hex[:8]}")
+    os.makedirs(staging_dir)
     try:
+        pwd = key.encode('utf-8')
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(path=save_to, pwd=key.encode('utf-8'))
+            infos = zip_ref.infolist()
+        total = sum(info.compress_size for info in infos)
+        workers = min(workers or os.cpu_count() or 1, len(infos))
+
+        if workers <= 1 or total < PARALLEL_EXTRACT_MIN_BYTES:
+            written = _extract_members(zip_path, [info.filename for info in infos], staging_dir, pwd)
+        else:
+            logger.debug(f"Extracting {len(infos)} members ({total} bytes) with {workers} processes")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_extract_members, zip_path, names, staging_dir, pwd)
+                           for names in _balance(infos, workers)]
+                written = sum(future.result() for future in futures)
+
+        _move_into_place(staging_dir, save_to)
+        logger.debug(f"Extracted {written} bytes from {zip_path} to {save_to}")
     except Exception as e:
+        shutil.rmtree(staging_dir, ignore_errors=True)
         print(f"Error decrypting zip file: {e}")
         raise e
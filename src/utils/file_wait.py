@@ -0,0 +1,62 @@
+import time
+import json
+from typing import Dict, Iterable, Optional
+from src.utils.atomic_write import committed_fingerprint
+from src.utils.os_utils import Fingerprint, file_fingerprint
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+QUIESCENCE_TIMEOUT = 2.0
+QUIESCENCE_POLL_INTERVAL = 0.05
+
+
+def _is_readable(path: str) -> bool:
+    """A JSON file only counts as settled once it parses; other files once they are stable."""
+    if not path.endswith(".json"):
+        return True
+    try:
+        with open(path, 'rb') as f:
+            json.loads(f.read())
+        return True
+    except FileNotFoundError:
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def wait_for_quiescence(paths: Iterable[str], timeout: float = QUIESCENCE_TIMEOUT,
+                        poll_interval: float = QUIESCENCE_POLL_INTERVAL) -> bool:
+    """
+    Wait until the files in `paths` have stopped changing.
+
+    A file this process committed last, and that still has the fingerprint it
+    was committed with, is settled right away. Anything else is polled until
+    two consecutive fingerprints match (and, for JSON files, it parses), so
+    the common case returns without sleeping at all.
+
+    Returns:
+        bool: True if every file settled, False if `timeout` expired first
+    """
+    pending: Dict[str, Optional[Fingerprint]] = {}
+    for path in paths:
+        fingerprint = file_fingerprint(path)
+        if fingerprint is None or fingerprint == committed_fingerprint(path):
+            continue
+        pending[path] = fingerprint
+
+    deadline = time.monotonic() + timeout
+    while pending:
+        if time.monotonic() >= deadline:
+            logger.warning(f"Files still changing after {timeout}s: {', '.join(pending)}")
+            return False
+        time.sleep(poll_interval)
+        for path, previous in list(pending.items()):
+            fingerprint = file_fingerprint(path)
+            if fingerprint == previous and _is_readable(path):
+                logger.debug(f"File settled: {path}")
+                del pending[path]
+            else:
+                pending[path] = fingerprint
+    return True
@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+import select
+import struct
+from typing import Dict, List, Optional, Set
+from src.utils.os_utils import Fingerprint, file_fingerprint
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Quiet period after the last event before a burst of changes is reported
+DEBOUNCE_SECONDS = 0.5
+POLL_INTERVAL_SECONDS = 1.0
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _InotifyBackend:
+    """
+    Linux inotify through libc. Parent directories are watched rather than
+    the files, because editors and our own atomic writes replace a config
+    file with a rename, which a watch on the old inode would not see.
+    """
+
+    def __init__(self, paths: List[str]):
+        import ctypes
+        import ctypes.util
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._get_errno = ctypes.get_errno
+
+        self._watches: Dict[int, Dict[str, str]] = {}
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        for path in paths:
+            directory = os.path.dirname(path)
+            if not os.path.isdir(directory):
+                logger.debug(f"Not watching {path}: {directory} does not exist")
+                continue
+            wd = self._libc.inotify_add_watch(self._fd, directory.encode(), mask)
+            if wd < 0:
+                self.close()
+                raise OSError(self._get_errno(), f"inotify_add_watch failed for {directory}")
+            self._watches.setdefault(wd, {})[os.path.basename(path)] = path
+
+    def next_events(self, timeout: Optional[float]) -> Set[str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, _, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b"\0").decode(errors="replace")
+            offset += name_length
+            path = self._watches.get(wd, {}).get(name)
+            if path is not None:
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingBackend:
+    """Portable fallback: compares (inode, size, mtime_ns) fingerprints every `interval` seconds."""
+
+    def __init__(self, paths: List[str], interval: float):
+        self._interval = interval
+        self._fingerprints: Dict[str, Optional[Fingerprint]] = {path: file_fingerprint(path) for path in paths}
+
+    def next_events(self, timeout: Optional[float]) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, previous in self._fingerprints.items():
+                fingerprint = file_fingerprint(path)
+                if fingerprint != previous:
+                    self._fingerprints[path] = fingerprint
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            remaining = self._interval if deadline is None else min(self._interval, deadline - time.monotonic())
+            time.sleep(max(remaining, 0))
+
+    def close(self) -> None:
+        pass
+
+
+class FileWatcher:
+    """
+    Watches a set of files and reports changes in debounced bursts: `wait`
+    returns once no further event arrived for `debounce` seconds, so a client
+    saving a file several times in a row is handled once.
+    Uses inotify on Linux and polling everywhere else.
+    """
+
+    def __init__(self, paths: List[str], debounce: float = DEBOUNCE_SECONDS,
+                 poll_interval: float = POLL_INTERVAL_SECONDS):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.debounce = debounce
+        self._backend = None
+        if sys.platform.startswith("linux"):
+            try:
+                self._backend = _InotifyBackend(self.paths)
+                logger.debug("Watching config files with inotify")
+            except (OSError, AttributeError) as e:
+                logger.debug(f"inotify unavailable, polling instead: {e}")
+        if self._backend is None:
+            self._backend = _PollingBackend(self.paths, poll_interval)
+            logger.debug(f"Polling config files every {poll_interval}s")
+
+    @property
+    def backend_name(self) -> str:
+        return "inotify" if isinstance(self._backend, _InotifyBackend) else "polling"
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until a burst of changes has settled and return the changed paths (empty on timeout)."""
+        changed = self._backend.next_events(timeout)
+        if not changed:
+            return changed
+        while True:
+            more = self._backend.next_events(self.debounce)
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self) -> None:
+        self._backend.close()
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,164 @@
+import os
+import re
+import json
+import math
+from typing import Any, Callable, Optional, Tuple, Union
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+CODEC_ENV_VAR = "MINT_JSON_CODEC"
+
+COMPACT_SEPARATORS = (",", ":")
+PRETTY_SEPARATORS = (",", ": ")
+
+# orjson reads integers beyond 64 bits as floats; any run of digits this long
+# (which may also be a long fraction or part of a string) goes to the stdlib
+_LONG_DIGITS = re.compile(r"\d{19,}")
+_LONG_DIGITS_BYTES = re.compile(rb"\d{19,}")
+
+
+class JsonCodec:
+    """
+    A JSON backend: a decoder plus an encoder that may decline a layout.
+
+    Fast backends only ever produce the values the stdlib would: all of them
+    keep key order, input they are stricter about (NaN, lone surrogates, huge
+    integers...) is decoded by the stdlib, and their output is only used when
+    it matches the requested layout and ASCII escaping and the value holds no
+    NaN or infinity, which they would write as null.
+    """
+
+    def __init__(self, name: str,
+                 decode: Callable[[Union[str, bytes]], Any],
+                 encode: Optional[Callable[[Any, Optional[int], Tuple[str, str]], Optional[bytes]]] = None):
+        self.name = name
+        self._decode = decode
+        self._encode = encode
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return self._decode(data)
+        except Exception as e:
+            if self.name == "stdlib":
+                raise
+            # Let the stdlib decide on input the fast decoder is stricter about
+            logger.debug(f"{self.name} could not decode, falling back to stdlib: {e}")
+            return json.loads(data)
+
+    def dumps(self, value: Any, indent: Optional[Union[int, str]] = None,
+              separators: Optional[Tuple[str, str]] = None, ensure_ascii: bool = True) -> str:
+        if separators is None:
+            separators = (", ", ": ") if indent is None else PRETTY_SEPARATORS
+        if self._encode is not None and not isinstance(indent, str):
+            try:
+                encoded = self._encode(value, indent, tuple(separators))
+            except Exception as e:
+                logger.debug(f"{self.name} could not encode, falling back to stdlib: {e}")
+                encoded = None
+            # Non-finite floats come out as null, so only a document with a null can hold one
+            if encoded is not None and b"null" in encoded and _has_non_finite(value):
+                logger.debug(f"{self.name} would write NaN or infinity as null, falling back to stdlib")
+                encoded = None
+            # The fast encoders never escape non-ASCII, which only matters if there is any
+            if encoded is not None and (not ensure_ascii or encoded.isascii()):
+                return encoded.decode('utf-8')
+        return json.dumps(value, indent=indent, separators=separators, ensure_ascii=ensure_ascii)
+
+
+def _has_non_finite(value: Any) -> bool:
+    """Whether `value` contains a NaN or infinite float anywhere."""
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+    return False
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec("stdlib", json.loads)
+
+
+def _orjson_codec() -> JsonCodec:
+    import orjson
+
+    def decode(data: Union[str, bytes]) -> Any:
+        pattern = _LONG_DIGITS_BYTES if isinstance(data, (bytes, bytearray)) else _LONG_DIGITS
+        if pattern.search(data):
+            raise ValueError("possible integer beyond 64 bits")
+        return orjson.loads(data)
+
+    def encode(value: Any, indent: Optional[int], separators: Tuple[str, str]) -> Optional[bytes]:
+        if indent is None and separators == COMPACT_SEPARATORS:
+            return orjson.dumps(value)
+        if indent == 2 and separators == PRETTY_SEPARATORS:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+        return None
+
+    return JsonCodec("orjson", decode, encode)
+
+
+def _msgspec_codec() -> JsonCodec:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def encode(value: Any, indent: Optional[int], separators: Tuple[str, str]) -> Optional[bytes]:
+        if indent is None and separators == COMPACT_SEPARATORS:
+            return encoder.encode(value)
+        return None
+
+    return JsonCodec("msgspec", decoder.decode, encode)
+
+
+_FACTORIES = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "stdlib": _stdlib_codec,
+}
+
+_codec: Optional[JsonCodec] = None
+
+
+def get_codec() -> JsonCodec:
+    """
+    Return the active codec, choosing it on first use: orjson or msgspec when
+    installed, stdlib `json` otherwise. MINT_JSON_CODEC=stdlib|orjson|msgspec
+    forces a backend, e.g. for A/B testing.
+    """
+    global _codec
+    if _codec is not None:
+        return _codec
+
+    requested = os.environ.get(CODEC_ENV_VAR, "auto").lower()
+    candidates = ["orjson", "msgspec", "stdlib"] if requested == "auto" else [requested, "stdlib"]
+    for name in candidates:
+        factory = _FACTORIES.get(name)
+        if factory is None:
+            logger.warning(f"Unknown JSON codec '{name}' in {CODEC_ENV_VAR}, ignoring it")
+            continue
+        try:
+            _codec = factory()
+            break
+        except ImportError:
+            if requested != "auto":
+                logger.warning(f"JSON codec '{name}' is not installed, falling back")
+    logger.debug(f"Using JSON codec: {_codec.name}")
+    return _codec
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    return get_codec().loads(data)
+
+
+def dumps(value: Any, indent: Optional[Union[int, str]] = None,
+          separators: Optional[Tuple[str, str]] = None, ensure_ascii: bool = True) -> str:
+    return get_codec().dumps(value, indent=indent, separators=separators, ensure_ascii=ensure_ascii)
@@ -0,0 +1,136 @@
+import re
+from typing import Any, Dict, Optional, Tuple, Union
+from src.utils import json_codec
+
+# How much of a document is inspected to detect its formatting
+FORMAT_SAMPLE_SIZE = 64 * 1024
+
+# Strings (skipped) and separators together with the whitespace that follows them
+_SEPARATOR = re.compile(r'"(?:[^"\\]|\\.)*"|([,:])([ \t\r\n]*)')
+
+
+class JsonFormat:
+    """
+    Formatting of a JSON document: indentation, separators, line endings
+    and whether non-ASCII characters are escaped.
+    """
+
+    def __init__(self,
+                 indent: Optional[Union[int, str]] = 4,
+                 separators: Tuple[str, str] = (",", ": "),
+                 newline: str = "\n",
+                 trailing_newline: bool = False,
+                 ensure_ascii: bool = True):
+        self.indent = indent
+        self.separators = separators
+        self.newline = newline
+        self.trailing_newline = trailing_newline
+        self.ensure_ascii = ensure_ascii
+
+    def dumps(self, value: Any, base_indent: str = "") -> str:
+        """
+        Serialize `value` in this format. `base_indent` is prepended to every
+        line after the first, for values spliced into a nested position.
+        """
+        text = json_codec.dumps(value, indent=self.indent, separators=self.separators, ensure_ascii=self.ensure_ascii)
+        if self.indent is not None:
+            # JSON escapes newlines inside strings, so every '\n' is a line break
+            text = text.replace("\n", self.newline + base_indent)
+        return text
+
+    def dumps_document(self, value: Any) -> str:
+        """Serialize a whole document, including the trailing newline if the original had one."""
+        return self.dumps(value) + (self.newline if self.trailing_newline else "")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "indent": self.indent,
+            "separators": list(self.separators),
+            "newline": self.newline,
+            "trailing_newline": self.trailing_newline,
+            "ensure_ascii": self.ensure_ascii
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JsonFormat":
+        return cls(
+            indent=data["indent"],
+            separators=tuple(data["separators"]),
+            newline=data["newline"],
+            trailing_newline=data["trailing_newline"],
+            ensure_ascii=data["ensure_ascii"]
+        )
+
+    def __repr__(self) -> str:
+        return (f"JsonFormat(indent={self.indent!r}, separators={self.separators!r}, "
+                f"newline={self.newline!r}, trailing_newline={self.trailing_newline}, "
+                f"ensure_ascii={self.ensure_ascii})")
+
+
+def _detect_indent(sample: str) -> Optional[Union[int, str]]:
+    """Return the indentation unit of a pretty-printed document (the indent of its first member)."""
+    root = len(sample) - len(sample.lstrip())
+    line_start = sample.find("\n", root) + 1
+    line_end = line_start
+    while line_end < len(sample) and sample[line_end] in " \t":
+        line_end += 1
+    indent = sample[line_start:line_end]
+    if not indent:
+        return 0
+    if set(indent) == {" "}:
+        return len(indent)
+    return indent
+
+
+def detect_format(text: str, default: Optional[JsonFormat] = None,
+                  trailing_newline: Optional[bool] = None, is_ascii: Optional[bool] = None) -> JsonFormat:
+    """
+    Detect the formatting of a JSON document so it can be re-emitted in the
+    same style. Falls back to `default` for empty documents.
+
+    `text` may be just the head of a document read in a streaming pass, in
+    which case that pass supplies the whole-document `trailing_newline` and
+    `is_ascii` facts.
+    """
+    if not text.strip():
+        return default or JsonFormat()
+
+    sample = text[:FORMAT_SAMPLE_SIZE]
+    item_whitespace = None
+    key_whitespace = None
+    for match in _SEPARATOR.finditer(sample):
+        separator, whitespace = match.group(1), match.group(2)
+        if separator == "," and item_whitespace is None:
+            item_whitespace = whitespace
+        elif separator == ":" and key_whitespace is None:
+            key_whitespace = whitespace
+        if item_whitespace is not None and key_whitespace is not None:
+            break
+
+    stripped = text.lstrip()
+    first_break = stripped[1:].lstrip(" \t")[:1] in ("\r", "\n")
+    pretty = first_break or (item_whitespace is not None and "\n" in item_whitespace)
+    if key_whitespace is not None and "\n" in key_whitespace:
+        key_whitespace = None
+
+    if pretty:
+        indent = _detect_indent(sample)
+        separators = (",", ":" + (key_whitespace if key_whitespace is not None else " "))
+    else:
+        indent = None
+        # A document with only one kind of separator ({"a":1}, [1, 2]) pairs it
+        # with the other one in the same style: compact with compact
+        if item_whitespace is None:
+            item_whitespace = "" if key_whitespace == "" else " "
+        if key_whitespace is None:
+            key_whitespace = "" if item_whitespace == "" else " "
+        separators = ("," + item_whitespace, ":" + key_whitespace)
+
+    return JsonFormat(
+        indent=indent,
+        separators=separators,
+        newline="\r\n" if "\r\n" in sample else "\n",
+        trailing_newline=text.endswith("\n") if trailing_newline is None else trailing_newline,
+        # Keep raw non-ASCII characters raw; otherwise stay with JSON's default escaping
+        ensure_ascii=text.isascii() if is_ascii is None else is_ascii,
+    )
@@ -0,0 +1,224 @@
+import re
+import json
+from typing import Any, BinaryIO, List, Optional, Tuple
+from src.utils.logger import get_logger
+from src.utils.atomic_write import atomic_writer
+from src.utils.json_format import JsonFormat
+from src.utils.json_stream import ByteStream
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Size of the slices copied through untouched when writing a spliced file
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Bytes that end a scalar value
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+# A number, true, false or null
+_SCALAR = re.compile(rb'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null')
+
+# A replacement of the bytes [start:end) of a file with new bytes
+Replacement = Tuple[int, int, bytes]
+
+
+class McpServersSpan:
+    """
+    Location of one `mcpServers` object inside a config file.
+    `start`/`end` are byte offsets of the object's `{` and one past its `}`,
+    `indent` the leading whitespace of the line it starts on.
+    """
+
+    def __init__(self, path: Tuple[str, ...], start: int, end: int, indent: str):
+        self.path = path
+        self.start = start
+        self.end = end
+        self.indent = indent
+
+    @property
+    def is_global(self) -> bool:
+        return self.path == ("mcpServers",)
+
+
+class ScanResult:
+    """All `mcpServers` spans of a document plus where a missing global one can be inserted."""
+
+    def __init__(self, spans: List[McpServersSpan], root_start: int, root_last_value_end: Optional[int],
+                 member_indent: str, trailing_newline: bool, is_ascii: bool):
+        self.spans = spans
+        # Byte offset just after the root `{`
+        self.root_start = root_start
+        # Byte offset just after the last member value of the root object (None if it is empty)
+        self.root_last_value_end = root_last_value_end
+        # Indentation of the root object's first member
+        self.member_indent = member_indent
+        self.trailing_newline = trailing_newline
+        self.is_ascii = is_ascii
+
+    @property
+    def global_span(self) -> Optional[McpServersSpan]:
+        for span in self.spans:
+            if span.is_global:
+                return span
+        return None
+
+
+def _is_mcp_servers_path(path: Tuple[str, ...]) -> bool:
+    # Global servers, or servers of a single Claude Code project
+    return path == ("mcpServers",) or (len(path) == 3 and path[0] == "projects" and path[2] == "mcpServers")
+
+
+def _leads_to_mcp_servers(path: Tuple[str, ...]) -> bool:
+    return path == ("projects",) or (len(path) == 2 and path[0] == "projects")
+
+
+def _skip_scalar(stream: ByteStream, first: bytes) -> None:
+    """Consume a string, number, true, false or null whose first byte was already read."""
+    if first == b'"':
+        stream.read_string_body(keep=False)
+        return
+    start = stream.tell() - 1
+    parts = [first]
+    while True:
+        match = _SCALAR_END.search(stream.buf, stream.pos)
+        end = match.start() if match is not None else len(stream.buf)
+        parts.append(stream.buf[stream.pos:end])
+        stream.pos = end
+        if match is not None or not stream.fill():
+            break
+    if _SCALAR.fullmatch(b"".join(parts)) is None:
+        raise ValueError(f"Invalid value at offset {start}")
+
+
+def _scan_object(stream: ByteStream, path: Tuple[str, ...], spans: List[McpServersSpan],
+                 member_indents: List[str]) -> Optional[int]:
+    """
+    Scan the members of an object whose `{` was already consumed, recording
+    `mcpServers` spans. Values that cannot contain one are skipped by the
+    tokenizer without being decoded.
+
+    Returns:
+        The byte offset just after the last member value (None if the object is empty).
+    """
+    byte = stream.next_significant()
+    if byte == b"}":
+        return None
+
+    while True:
+        if byte != b'"':
+            raise ValueError(f"Expected a property name at offset {stream.tell() - 1}")
+        if not member_indents:
+            member_indents.append(stream.line_indent(stream.tell() - 1).decode('utf-8'))
+        child_path = path + (stream.read_key(),)
+        if stream.next_significant() != b":":
+            raise ValueError(f"Expected ':' at offset {stream.tell() - 1}")
+
+        first = stream.next_significant()
+        if first == b"{" and _is_mcp_servers_path(child_path):
+            start = stream.tell() - 1
+            indent = stream.line_indent(start).decode('utf-8')
+            stream.skip_value(first)
+            spans.append(McpServersSpan(child_path, start, stream.tell(), indent))
+        elif first == b"{" and _leads_to_mcp_servers(child_path):
+            # Most projects have no servers: skip those whole. A key can only
+            # spell mcpServers literally or with a \u escape
+            if not stream.skip_container_without(b'"mcpServers"', b"\\u"):
+                # Only the root's first member indent is wanted, so nested objects get a filled list
+                _scan_object(stream, child_path, spans, [""])
+        elif first in (b"{", b"["):
+            stream.skip_value(first)
+        elif first:
+            _skip_scalar(stream, first)
+        else:
+            raise ValueError("Unexpected end of file")
+        value_end = stream.tell()
+
+        separator = stream.next_significant()
+        if separator == b",":
+            byte = stream.next_significant()
+        elif separator == b"}":
+            return value_end
+        else:
+            raise ValueError(f"Expected ',' or '}}' at offset {stream.tell() - 1}")
+
+
+def scan_mcp_servers(path: str) -> ScanResult:
+    """
+    Find the global and per-project `mcpServers` objects of a config file
+    with the streaming byte tokenizer, so the file is never held in memory
+    and every offset is a byte offset. Only the objects on the way to those
+    spans are checked member by member; other values are skipped, and the
+    spans themselves are validated when they are parsed.
+
+    Raises:
+        ValueError: If the document is not a JSON object
+    """
+    with open(path, 'rb') as f:
+        stream = ByteStream(f)
+        stream.skip_byte_order_mark()
+        first = stream.next_significant()
+        if first != b"{":
+            raise ValueError("Config document is not a JSON object")
+        root_start = stream.tell()
+        spans: List[McpServersSpan] = []
+        member_indents: List[str] = []
+        root_last_value_end = _scan_object(stream, (), spans, member_indents)
+        root_end = stream.tell()
+        if stream.next_significant():
+            raise ValueError(f"Extra data after offset {root_end}")
+        return ScanResult(spans, root_start, root_last_value_end, member_indents[0] if member_indents else "",
+                          stream.last_byte == b"\n", stream.is_ascii)
+
+
+def build_root_member(key: str, value: Any, json_format: JsonFormat, member_indent: str, root_is_empty: bool) -> Tuple[str, int]:
+    """
+    Serialize `key: value` for appending as the last member of the root object.
+
+    Returns:
+        The text to insert after the root's last value (or after `{` when the
+        root is empty), and the offset of the value within that text.
+    """
+    key_text = json.dumps(key) + json_format.separators[1]
+    if json_format.indent is None or root_is_empty:
+        separator = "" if root_is_empty else json_format.separators[0]
+        value_text = json_format.dumps(value)
+    else:
+        # Pretty-printed root: put the member on its own line, indented like the first one
+        separator = "," + json_format.newline + member_indent
+        value_text = json_format.dumps(value, base_indent=member_indent)
+    prefix = separator + key_text
+    return prefix + value_text, len(prefix)
+
+
+def write_spliced(path: str, replacements: List[Replacement]) -> None:
+    """
+    Rewrite `path` with byte-range `replacements` applied. Everything outside
+    the replaced spans is streamed through untouched from the original file in
+    chunks, and the result is committed atomically.
+    """
+    replacements = sorted(replacements)
+    with open(path, 'rb') as source, atomic_writer(path) as f:
+        position = 0
+        for start, end, new_bytes in replacements:
+            if start < position:
+                raise ValueError(f"Overlapping replacement at offset {start}")
+            _copy_range(source, f, position, start)
+            f.write(new_bytes)
+            position = end
+        source.seek(position)
+        while True:
+            chunk = source.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            f.write(chunk)
+    logger.debug(f"Spliced {len(replacements)} span(s) into {path}")
+
+
+def _copy_range(source: BinaryIO, target: BinaryIO, start: int, end: int) -> None:
+    source.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = source.read(min(COPY_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise ValueError(f"File shrank while splicing, expected data at offset {end - remaining}")
+        target.write(chunk)
+        remaining -= len(chunk)
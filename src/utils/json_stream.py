@@ -0,0 +1,254 @@
+import re
+import json
+import codecs
+from typing import BinaryIO, Optional, Tuple
+
+READ_CHUNK_SIZE = 64 * 1024
+
+_SIGNIFICANT = re.compile(rb'[^ \t\r\n]')
+_STRUCTURAL_OR_QUOTE = re.compile(rb'["{}\[\]]')
+_QUOTE_OR_BACKSLASH = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+_NON_BRACKETS = bytes(byte for byte in range(256) if byte not in b"{}[]")
+# Containers up to this size are skipped with the C decoder, larger ones by balancing brackets
+DECODE_WINDOW_LIMIT = 1024 * 1024
+_MIN_DECODE_WINDOW = 4096
+
+_decoder = json.JSONDecoder()
+
+
+class ByteStream:
+    """
+    Forward-only reader over a file that keeps at most a chunk or two in
+    memory: consumed bytes are dropped as the scan moves on. It keeps track
+    of the file offset of the buffer and of the indentation of the line the
+    buffer starts in, so both stay known for any buffered byte.
+    """
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self.buf = b""
+        self.pos = 0
+        self.eof = False
+        # File offset of buf[0]
+        self.base = 0
+        # Leading whitespace of the line buf[0] is on, and whether that line has anything else before buf[0]
+        self._line_indent = b""
+        self._line_indent_done = False
+        self.is_ascii = True
+        self.last_byte = b""
+
+    def fill(self) -> bool:
+        """Read another chunk; returns False at end of file."""
+        if self.eof:
+            return False
+        chunk = self._f.read(READ_CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self._drop(self.buf[:self.pos])
+        self.base += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        self.is_ascii = self.is_ascii and chunk.isascii()
+        self.last_byte = chunk[-1:]
+        return True
+
+    def _drop(self, consumed: bytes) -> None:
+        newline = consumed.rfind(b"\n")
+        if newline >= 0:
+            self._line_indent, self._line_indent_done = b"", False
+            consumed = consumed[newline + 1:]
+        if not self._line_indent_done:
+            rest = consumed.lstrip(b" \t")
+            self._line_indent += consumed[:len(consumed) - len(rest)]
+            self._line_indent_done = bool(rest)
+
+    def tell(self) -> int:
+        """File offset of the next byte to consume."""
+        return self.base + self.pos
+
+    def line_indent(self, offset: int) -> bytes:
+        """Leading whitespace of the line holding the byte at file `offset`, which must still be buffered."""
+        idx = offset - self.base
+        newline = self.buf.rfind(b"\n", 0, idx)
+        if newline < 0 and self._line_indent_done:
+            return self._line_indent
+        line = self.buf[newline + 1:idx]
+        indent = line[:len(line) - len(line.lstrip(b" \t"))]
+        return indent if newline >= 0 else self._line_indent + indent
+
+    def skip_byte_order_mark(self) -> None:
+        """Step over a UTF-8 byte order mark at the start of the file."""
+        while len(self.buf) < 3 and self.fill():
+            pass
+        if self.tell() == 0 and self.buf.startswith(b"\xef\xbb\xbf"):
+            self.pos = 3
+
+    def next_significant(self) -> bytes:
+        """Skip whitespace and consume the next byte (b'' at end of file)."""
+        while True:
+            match = _SIGNIFICANT.search(self.buf, self.pos)
+            if match is not None:
+                self.pos = match.end()
+                return match.group()
+            self.pos = len(self.buf)
+            if not self.fill():
+                return b""
+
+    def read_string_body(self, keep: bool) -> Optional[bytes]:
+        """Consume a string whose opening quote was already read, returning its raw body if `keep`."""
+        parts = []
+        while True:
+            match = _QUOTE_OR_BACKSLASH.search(self.buf, self.pos)
+            if match is None:
+                if keep:
+                    parts.append(self.buf[self.pos:])
+                self.pos = len(self.buf)
+                if not self.fill():
+                    raise ValueError("Unterminated string")
+                continue
+            if match.group() == b'"':
+                if keep:
+                    parts.append(self.buf[self.pos:match.start()])
+                self.pos = match.end()
+                return b"".join(parts) if keep else None
+            # An escape: make sure the escaped byte is buffered, then step over both
+            while match.end() >= len(self.buf):
+                if keep:
+                    parts.append(self.buf[self.pos:match.start()])
+                    self.pos = match.start()
+                if not self.fill():
+                    raise ValueError("Unterminated string")
+                match = _QUOTE_OR_BACKSLASH.search(self.buf, self.pos)
+            if keep:
+                parts.append(self.buf[self.pos:match.end() + 1])
+            self.pos = match.end() + 1
+
+    def read_key(self) -> str:
+        raw = self.read_string_body(keep=True)
+        if b"\\" not in raw:
+            return raw.decode('utf-8')
+        return json.loads(b'"' + raw + b'"')
+
+    def skip_value(self, first: bytes) -> None:
+        """Skip a value whose first byte was already consumed."""
+        if first == b'"':
+            self.read_string_body(keep=False)
+            return
+        if first not in (b"{", b"["):
+            # Number, true, false or null
+            while True:
+                match = _SCALAR_END.search(self.buf, self.pos)
+                if match is not None:
+                    self.pos = match.start()
+                    return
+                self.pos = len(self.buf)
+                if not self.fill():
+                    return
+
+        if self._skip_decoded():
+            return
+        depth, in_string = self._skip_whole_chunks()
+        if in_string:
+            self.read_string_body(keep=False)
+        while depth:
+            match = _STRUCTURAL_OR_QUOTE.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self.fill():
+                    raise ValueError("Unterminated container")
+                continue
+            self.pos = match.end()
+            char = match.group()
+            if char == b'"':
+                self.read_string_body(keep=False)
+            elif char in (b"{", b"["):
+                depth += 1
+            else:
+                depth -= 1
+
+    def skip_container_without(self, *markers: bytes) -> bool:
+        """
+        Skip a container whose first byte was already consumed, provided it
+        fits the decode window and none of `markers` occurs in its bytes.
+        Returns False, with nothing consumed, otherwise.
+        """
+        end = self._decoded_end()
+        if end is not None and all(self.buf.find(marker, self.pos, end) < 0 for marker in markers):
+            self.pos = end
+            return True
+        self.pos += 1
+        return False
+
+    def _skip_decoded(self) -> bool:
+        """
+        Fast path of `skip_value` for containers that fit in a window.
+        Gives up with nothing consumed on larger ones.
+        """
+        end = self._decoded_end()
+        if end is None:
+            self.pos += 1
+            return False
+        self.pos = end
+        return True
+
+    def _decoded_end(self) -> Optional[int]:
+        """
+        Find the end of a container whose first byte was just consumed with
+        the C decoder, which also validates it, on a window that doubles until
+        it holds the whole value. Leaves `pos` on the opening bracket and
+        returns the buffer index just past the container, or None when it is
+        larger than DECODE_WINDOW_LIMIT.
+        """
+        # Step back onto the opening bracket so the window starts with it
+        self.pos -= 1
+        size = _MIN_DECODE_WINDOW
+        while size <= DECODE_WINDOW_LIMIT:
+            while len(self.buf) - self.pos < size and self.fill():
+                pass
+            window = self.buf[self.pos:self.pos + size]
+            # Stops before a character cut in half by the window
+            text, _ = codecs.utf_8_decode(window, 'strict', False)
+            try:
+                _, end = _decoder.raw_decode(text)
+            except json.JSONDecodeError as e:
+                if len(window) < size:
+                    # The window already reaches the end of the file
+                    raise ValueError(f"Invalid value at offset {self.tell()}: {e.msg}")
+                size *= 2
+                continue
+            return self.pos + (end if window.isascii() else len(text[:end].encode('utf-8')))
+        return None
+
+    def _skip_whole_chunks(self) -> Tuple[int, bool]:
+        """
+        Fast path of `skip_value` for containers: consume buffered chunks in
+        which the container provably stays open, using only C-level bytes
+        operations. Returns the nesting depth and whether the scan stopped
+        inside a string; the caller finishes the last chunk byte by byte.
+        """
+        depth = 1
+        in_string = False
+        while True:
+            region_end = len(self.buf)
+            # A trailing backslash may escape the first byte of the next chunk
+            while region_end > self.pos and self.buf[region_end - 1] == 0x5c:
+                region_end -= 1
+            region = self.buf[self.pos:region_end]
+            if region:
+                # Drop escaped backslashes and quotes, so every quote left delimits a string
+                parts = region.replace(b"\\\\", b"").replace(b'\\"', b"").split(b'"')
+                outside = b"".join(parts[1::2] if in_string else parts[0::2])
+                brackets = outside.translate(None, _NON_BRACKETS)
+                # Cancel matched pairs, leaving the unmatched closers followed by the unmatched openers
+                while b"{}" in brackets or b"[]" in brackets:
+                    brackets = brackets.replace(b"{}", b"").replace(b"[]", b"")
+                closers = len(brackets) - len(brackets.lstrip(b"}]"))
+                if closers >= depth:
+                    return depth, in_string
+                depth += len(brackets) - 2 * closers
+                in_string = in_string != (len(parts) % 2 == 0)
+                self.pos = region_end
+            if not self.fill():
+                raise ValueError("Unterminated container")
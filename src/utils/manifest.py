@@ -0,0 +1,158 @@
+import os
+import re
+from typing import Any, Dict, List, Optional
+from src.consts import AppName
+from src.utils import json_codec
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+ALL_CLIENTS = [AppName.CURSOR, AppName.CLAUDE_DESKTOP, AppName.CLAUDE_CODE, AppName.WINDSURF]
+_SHA256_PATTERN = re.compile(r"[0-9a-fA-F]{64}")
+
+
+class ManifestError(Exception):
+    """Raised when a batch manifest cannot be read or is invalid"""
+    pass
+
+
+class Action:
+    INSTALL = "install"
+    UNINSTALL = "uninstall"
+    REVERT = "revert"
+
+    ALL = (INSTALL, UNINSTALL, REVERT)
+
+
+class ClientAction:
+    """What to do with one client; `backup` picks the generation to revert to (1 is the newest)."""
+
+    def __init__(self, client: str, action: str, backup: int = 1):
+        self.client = client
+        self.action = action
+        self.backup = backup
+
+
+class Manifest:
+    """
+    A headless run: the clients and what to do with each, where the proxy
+    package comes from and how many clients to process at once.
+
+    JSON example (TOML uses the same keys):
+
+        {
+            "package": {"source": "download", "sha256": "<hex digest of the package>"},
+            "jobs": 4,
+            "npm_timeout": 300,
+            "clients": {
+                "cursor": "install",
+                "claude-code": {"action": "revert", "backup": 2}
+            }
+        }
+
+    `"all"` as a client name stands for every supported client.
+    """
+
+    def __init__(self, clients: List[ClientAction], download: bool = False, package_path: Optional[str] = None,
+                 jobs: Optional[int] = None, remove_application: bool = False, package_sha256: Optional[str] = None,
+                 npm_timeout: Optional[float] = None):
+        self.clients = clients
+        self.download = download
+        self.package_path = package_path
+        self.package_sha256 = package_sha256
+        self.npm_timeout = npm_timeout
+        self.jobs = jobs
+        self.remove_application = remove_application
+
+    @property
+    def needs_package(self) -> bool:
+        return any(client.action == Action.INSTALL for client in self.clients)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Manifest":
+        if not isinstance(data, dict):
+            raise ManifestError("Manifest must be an object")
+        unknown = set(data) - {"package", "jobs", "clients", "remove_application", "npm_timeout"}
+        if unknown:
+            raise ManifestError(f"Unknown manifest keys: {', '.join(sorted(unknown))}")
+
+        clients_data = data.get("clients")
+        if not isinstance(clients_data, dict) or not clients_data:
+            raise ManifestError("Manifest must name at least one client under 'clients'")
+        clients: Dict[str, ClientAction] = {}
+        for name, spec in clients_data.items():
+            if isinstance(spec, str):
+                spec = {"action": spec}
+            if not isinstance(spec, dict):
+                raise ManifestError(f"Invalid entry for client '{name}'")
+            action = spec.get("action", Action.INSTALL)
+            if action not in Action.ALL:
+                raise ManifestError(f"Invalid action '{action}' for client '{name}', expected one of {', '.join(Action.ALL)}")
+            backup = spec.get("backup", 1)
+            if not isinstance(backup, int) or isinstance(backup, bool) or backup < 1:
+                raise ManifestError(f"Invalid backup number for client '{name}': {backup}")
+            names = ALL_CLIENTS if name == "all" else [name]
+            for client in names:
+                if client not in ALL_CLIENTS:
+                    raise ManifestError(f"Unknown client '{client}', expected one of {', '.join(ALL_CLIENTS)} or all")
+                clients[client] = ClientAction(client, action, backup)
+
+        package = data.get("package", {})
+        if not isinstance(package, dict):
+            raise ManifestError("'package' must be an object")
+        source = package.get("source", "local")
+        if source not in ("local", "download"):
+            raise ManifestError(f"Invalid package source '{source}', expected local or download")
+        package_path = package.get("path")
+        if package_path is not None:
+            package_path = os.path.abspath(os.path.expanduser(package_path))
+        package_sha256 = package.get("sha256")
+        if package_sha256 is not None and not _SHA256_PATTERN.fullmatch(str(package_sha256)):
+            raise ManifestError(f"'package.sha256' must be a hex SHA-256 digest, got {package_sha256}")
+
+        jobs = data.get("jobs")
+        if jobs is not None and (not isinstance(jobs, int) or isinstance(jobs, bool) or jobs < 1):
+            raise ManifestError(f"'jobs' must be a positive integer, got {jobs}")
+        npm_timeout = data.get("npm_timeout")
+        if npm_timeout is not None and (not isinstance(npm_timeout, (int, float)) or isinstance(npm_timeout, bool)
+                                        or npm_timeout <= 0):
+            raise ManifestError(f"'npm_timeout' must be a positive number of seconds, got {npm_timeout}")
+
+        # Run the clients in menu order, whatever order the manifest lists them in
+        ordered = [clients[client] for client in ALL_CLIENTS if client in clients]
+        return cls(ordered, source == "download", package_path, jobs, bool(data.get("remove_application", False)),
+                   package_sha256.lower() if package_sha256 else None, npm_timeout)
+
+
+def _load_toml(raw: bytes) -> Dict[str, Any]:
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ManifestError("TOML manifests need Python 3.11+ or the tomli package; use JSON instead")
+    return tomllib.loads(raw.decode('utf-8'))
+
+
+def load_manifest(path: str) -> Manifest:
+    """
+    Read a JSON or TOML (by `.toml` extension) manifest.
+
+    Raises:
+        ManifestError: If the file is unreadable or invalid
+    """
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        raise ManifestError(f"Cannot read manifest {path}: {e}")
+    try:
+        data = _load_toml(raw) if path.endswith(".toml") else json_codec.loads(raw)
+    except ManifestError:
+        raise
+    except Exception as e:
+        raise ManifestError(f"Cannot parse manifest {path}: {e}")
+    logger.debug(f"Loaded manifest {path}: {data}")
+    return Manifest.from_dict(data)
@@ -0,0 +1,59 @@
+from typing import Optional, Set
+from src.utils.json_stream import ByteStream
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+def _read_object_keys(stream: ByteStream, wanted: Optional[str]) -> Optional[Set[str]]:
+    """
+    Walk the members of an object whose `{` was already consumed.
+    With `wanted`, return the key set of that member's object value as soon
+    as it has been read (None if the member is missing or not an object).
+    Without it, return the object's own key set.
+    """
+    keys: Set[str] = set()
+    byte = stream.next_significant()
+    if byte == b"}":
+        return keys if wanted is None else None
+    while True:
+        if byte != b'"':
+            raise ValueError("Expected a property name")
+        key = stream.read_key()
+        if stream.next_significant() != b":":
+            raise ValueError("Expected ':'")
+        first = stream.next_significant()
+        if wanted is not None and key == wanted:
+            if first != b"{":
+                return None
+            return _read_object_keys(stream, None)
+        keys.add(key)
+        stream.skip_value(first)
+
+        byte = stream.next_significant()
+        if byte == b"}":
+            return keys if wanted is None else None
+        if byte != b",":
+            raise ValueError("Expected ',' or '}'")
+        byte = stream.next_significant()
+
+
+def read_mcp_server_names(path: str) -> Optional[Set[str]]:
+    """
+    Return the names in the top-level `mcpServers` map of a config file, or
+    None if there is none. The file is tokenized incrementally with bounded
+    memory and the scan stops as soon as that map has been read, so nothing
+    after it is looked at.
+
+    Raises:
+        ValueError: If the file is not a JSON object
+    """
+    with open(path, 'rb') as f:
+        stream = ByteStream(f)
+        stream.skip_byte_order_mark()
+        first = stream.next_significant()
+        if first != b"{":
+            raise ValueError(f"Config file is not a JSON object: {path}")
+        names = _read_object_keys(stream, "mcpServers")
+    logger.debug(f"Top-level mcpServers of {path}: {names}")
+    return names
@@ -0,0 +1,260 @@
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from src.consts import APPLICATION_DIR_NAME
+from src.utils import json_codec
+from src.utils.atomic_write import commit_text
+from src.utils.os_utils import Fingerprint, file_fingerprint
+from src.utils.json_format import FORMAT_SAMPLE_SIZE, JsonFormat, detect_format
+from src.utils.json_splice import Replacement, scan_mcp_servers, build_root_member
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+INDEX_FILE_NAME = "mcp_index.json"
+
+
+class McpServerLocation:
+    """
+    Byte range of one `mcpServers` object inside a config file, and the
+    indentation of the line it starts on.
+    """
+
+    def __init__(self, path: Tuple[str, ...], start: int, end: int, indent: str):
+        self.path = tuple(path)
+        self.start = start
+        self.end = end
+        self.indent = indent
+
+    @property
+    def is_global(self) -> bool:
+        return self.path == ("mcpServers",)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"path": list(self.path), "start": self.start, "end": self.end, "indent": self.indent}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "McpServerLocation":
+        return cls(data["path"], data["start"], data["end"], data["indent"])
+
+
+class McpServerIndex:
+    """
+    Every JSON path of a config file that holds an `mcpServers` map, with its
+    byte range. Built once by a streaming scan and valid for as long as the
+    file keeps the same (inode, size, mtime_ns) fingerprint, so update,
+    restore and detection read only those ranges instead of the whole file.
+    """
+
+    def __init__(self, file_path: str, fingerprint: Fingerprint, locations: List[McpServerLocation],
+                 root_start: int, root_last_value_end: Optional[int], member_indent: str,
+                 json_format: JsonFormat):
+        self.file_path = file_path
+        self.fingerprint = fingerprint
+        self.locations = locations
+        # Byte offset just after the root `{`
+        self.root_start = root_start
+        # Byte offset just after the last member value of the root object (None if it is empty)
+        self.root_last_value_end = root_last_value_end
+        # Indentation of the root object's members
+        self.member_indent = member_indent
+        self.format = json_format
+
+    @property
+    def global_location(self) -> Optional[McpServerLocation]:
+        for location in self.locations:
+            if location.is_global:
+                return location
+        return None
+
+    def read_servers(self) -> Iterator[Tuple[McpServerLocation, Dict[str, Any]]]:
+        """Read and parse only the indexed `mcpServers` objects."""
+        with open(self.file_path, 'rb') as f:
+            for location in self.locations:
+                f.seek(location.start)
+                yield location, json_codec.loads(f.read(location.end - location.start))
+
+    def read_global_servers(self) -> Dict[str, Any]:
+        """Return the top-level `mcpServers` map, or an empty one if there is none."""
+        location = self.global_location
+        if location is None:
+            return {}
+        with open(self.file_path, 'rb') as f:
+            f.seek(location.start)
+            return json_codec.loads(f.read(location.end - location.start))
+
+    def replace(self, location: McpServerLocation, servers: Dict[str, Any]) -> Replacement:
+        """Build a replacement of `location` with `servers`, in the file's own format."""
+        return (location.start, location.end, self.format.dumps(servers, base_indent=location.indent).encode('utf-8'))
+
+    def insert_global(self, servers: Dict[str, Any]) -> Replacement:
+        """Build a replacement that adds a top-level `mcpServers` map to the file."""
+        root_is_empty = self.root_last_value_end is None
+        member, _ = build_root_member("mcpServers", servers, self.format, self.member_indent, root_is_empty)
+        offset = self.root_start if root_is_empty else self.root_last_value_end
+        return (offset, offset, member.encode('utf-8'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": list(self.fingerprint),
+            "locations": [location.to_dict() for location in self.locations],
+            "root_start": self.root_start,
+            "root_last_value_end": self.root_last_value_end,
+            "member_indent": self.member_indent,
+            "format": self.format.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, file_path: str, data: Dict[str, Any]) -> "McpServerIndex":
+        return cls(
+            file_path,
+            tuple(data["fingerprint"]),
+            [McpServerLocation.from_dict(location) for location in data["locations"]],
+            data["root_start"],
+            data["root_last_value_end"],
+            data["member_indent"],
+            JsonFormat.from_dict(data["format"])
+        )
+
+    @classmethod
+    def build(cls, file_path: str) -> "McpServerIndex":
+        """Scan `file_path` once and index its `mcpServers` objects."""
+        fingerprint = file_fingerprint(file_path)
+        scan = scan_mcp_servers(file_path)
+        with open(file_path, 'rb') as f:
+            head = f.read(FORMAT_SAMPLE_SIZE).decode('utf-8-sig', errors='ignore')
+        locations = [McpServerLocation(span.path, span.start, span.end, span.indent) for span in scan.spans]
+        return cls(file_path, fingerprint, locations, scan.root_start, scan.root_last_value_end, scan.member_indent,
+                   detect_format(head, trailing_newline=scan.trailing_newline, is_ascii=scan.is_ascii))
+
+    def after_splice(self, replacements: List[Replacement]) -> Optional["McpServerIndex"]:
+        """
+        Return the index of the file produced by applying `replacements` (as made by
+        `replace`) to it, or None when the layout changed in a way that needs a rescan.
+        """
+        by_start = {start: (end, new_bytes) for start, end, new_bytes in replacements}
+        if any(start == end for start, end, _ in replacements):
+            # An inserted member; cheaper to rescan than to track
+            return None
+
+        shift = 0
+        shifted = []
+        for location in sorted(self.locations, key=lambda location: location.start):
+            start = location.start + shift
+            if location.start in by_start:
+                end, new_bytes = by_start.pop(location.start)
+                shift += len(new_bytes) - (end - location.start)
+                shifted.append(McpServerLocation(location.path, start, start + len(new_bytes), location.indent))
+            else:
+                shifted.append(McpServerLocation(location.path, start, location.end + shift, location.indent))
+        if by_start:
+            return None
+
+        root_last_value_end = self.root_last_value_end + shift if self.root_last_value_end is not None else None
+        return McpServerIndex(self.file_path, file_fingerprint(self.file_path), shifted, self.root_start,
+                              root_last_value_end, self.member_indent, self.format)
+
+
+# Indexes loaded or built during this process, keyed by absolute path
+_indexes: Dict[str, McpServerIndex] = {}
+# Paths whose index was built by this process and not stored yet
+_unsaved: Set[str] = set()
+# Serializes read-modify-write of the stored indexes
+_store_lock = threading.Lock()
+
+
+def _index_store_path() -> str:
+    return os.path.join(str(Path.home()), APPLICATION_DIR_NAME, INDEX_FILE_NAME)
+
+
+def _load_stored_index(file_path: str) -> Optional[McpServerIndex]:
+    try:
+        with open(_index_store_path(), 'r') as f:
+            stored = json.load(f).get(file_path)
+        return McpServerIndex.from_dict(file_path, stored) if stored else None
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.debug(f"Ignoring unreadable MCP server index: {e}")
+        return None
+
+
+def _store_index(index: McpServerIndex) -> None:
+    """Persist `index` so later runs can skip the scan while the file is unchanged."""
+    store_path = _index_store_path()
+    try:
+        with _store_lock:
+            try:
+                with open(store_path, 'r') as f:
+                    stored = json.load(f)
+            except (OSError, ValueError):
+                stored = {}
+            stored[index.file_path] = index.to_dict()
+            os.makedirs(os.path.dirname(store_path), exist_ok=True)
+            commit_text(store_path, json.dumps(stored))
+    except OSError as e:
+        logger.debug(f"Could not persist MCP server index: {e}")
+
+
+def peek_mcp_index(file_path: str) -> Optional[McpServerIndex]:
+    """Return the index of `file_path` only if a valid one exists in memory or on disk, without scanning."""
+    file_path = os.path.abspath(os.path.expanduser(file_path))
+    fingerprint = file_fingerprint(file_path)
+    if fingerprint is None:
+        return None
+    index = _indexes.get(file_path)
+    if index is None or index.fingerprint != fingerprint:
+        index = _load_stored_index(file_path)
+    if index is None or index.fingerprint != fingerprint:
+        return None
+    _indexes[file_path] = index
+    return index
+
+
+def get_mcp_index(file_path: str) -> McpServerIndex:
+    """
+    Return the `mcpServers` index of `file_path`, from memory or from
+    ~/.mint/mcp_proxy while the file's fingerprint still matches, or by
+    scanning the file once.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not a JSON object
+    """
+    file_path = os.path.abspath(os.path.expanduser(file_path))
+    if file_fingerprint(file_path) is None:
+        _indexes.pop(file_path, None)
+        raise FileNotFoundError(f"Config file not found: {file_path}")
+
+    index = peek_mcp_index(file_path)
+    if index is None:
+        logger.debug(f"Scanning for mcpServers locations: {file_path}")
+        index = McpServerIndex.build(file_path)
+        # Stored by save_mcp_index once the changes are applied, so planning writes nothing
+        _unsaved.add(file_path)
+    _indexes[file_path] = index
+    return index
+
+
+def save_mcp_index(file_path: str) -> None:
+    """Persist the index `get_mcp_index` built for `file_path`, if the file has not changed since."""
+    file_path = os.path.abspath(os.path.expanduser(file_path))
+    index = _indexes.get(file_path)
+    if file_path not in _unsaved or index is None:
+        return
+    _unsaved.discard(file_path)
+    if index.fingerprint == file_fingerprint(file_path):
+        _store_index(index)
+
+
+def record_splice(index: McpServerIndex, replacements: List[Replacement]) -> None:
+    """Update the stored index after `replacements` were written to its file."""
+    new_index = index.after_splice(replacements)
+    _indexes.pop(index.file_path, None)
+    _unsaved.discard(index.file_path)
+    if new_index is not None:
+        _indexes[index.file_path] = new_index
+        _store_index(new_index)
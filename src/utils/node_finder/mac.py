@@ -1,7 +1,14 @@
 import os
+import shutil
 import subprocess
-from pathlib import Path
+from typing import Optional, Tuple
 from .node_finder_base import NodeFinderBase
+from .node_cache import NodeCache
+from .node_index import NodeIndex, NodeInstall, Version, binary_version, format_version, minimum_node_version
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
 
 class NodeNotFoundError(Exception):
     """Raised when Node.js is not found on the system"""
@@ -10,22 +17,15 @@ class NodeNotFoundError(Exception):
 class NodeFinderMac(NodeFinderBase):
 
     def __init__(self):
-        self.common_paths = [
-            "/usr/local/bin/node",
-            "/usr/bin/node",
-            "/opt/homebrew/bin/node",
-            "/opt/local/bin/node",
-            str(Path.home() / ".nvm" / "versions" / "node"),  # NVM installations
-            str(Path.home() / ".nodenv" / "versions"),        # nodenv installations
-        ]
+        self.cache = NodeCache()
 
     def is_node_installed(self) -> bool:
         """
         Check if Node.js is installed on the system.
         Attempts multiple methods to detect Node.js:
         1. Check PATH for node executable
-        2. Check common installation locations
-        3. Try running node --version
+        2. Index the installs of version managers, Homebrew and system paths
+        3. Ask brew for its node prefix
         
         Returns:
             bool: True if Node.js is installed, False otherwise
@@ -37,38 +37,39 @@ class NodeFinderMac(NodeFinderBase):
             return False
 
     def get_node_path(self) -> str:
-        try:
-            which_result = subprocess.run(
-                ["which", "node"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            if which_result.returncode == 0:
-                node_path = which_result.stdout.strip()
-                if os.path.isfile(node_path) and os.access(node_path, os.X_OK):
-                    return node_path
-        except subprocess.SubprocessError:
-            pass
+        cached = self.cache.lookup()
+        if cached:
+            logger.debug(f"Using cached Node.js path: {cached['node_path']}")
+            return cached["node_path"]
+
+        node_path, version = self._search_node_path()
+        self.cache.store(node_path, format_version(version) if version else None)
+        return node_path
 
-        for path in self.common_paths:
-            if "versions" in path:
-                if os.path.isdir(path):
-                    # Look for the latest version in version manager directories
-                    try:
-                        versions = [d for d in os.listdir(path) if os.path.isdir(os.path.join(path, d))]
-                        if versions:
-                            latest = sorted(versions)[-1]
-                            node_path = os.path.join(path, latest, "bin", "node")
-                            if os.path.isfile(node_path) and os.access(node_path, os.X_OK):
-                                return node_path
-                    except (OSError, IndexError):
-                        continue
-            else:
-                # Direct path check
-                if os.path.isfile(path) and os.access(path, os.X_OK):
-                    return path
+    def _search_node_path(self) -> Tuple[str, Optional[Version]]:
+        """
+        The `node` on PATH if it is recent enough for the proxy, else the
+        newest install that is, else whatever Node.js there is.
+        """
+        minimum = minimum_node_version()
+        # Same lookup as `which node`, without spawning it
+        path_node = shutil.which("node")
+        path_version = binary_version(path_node) if path_node else None
+        if path_node and (path_version is None or path_version >= minimum):
+            return path_node, path_version
 
+        index = NodeIndex()
+        best = index.best(minimum)
+        if best:
+            logger.info(f"Using {best.path} ({format_version(best.version)}, {best.source})")
+            return best.path, best.version
+
+        fallback = NodeInstall(path_node, path_version, "PATH") if path_node else (index.installs or [None])[0]
+        if fallback:
+            logger.warning(f"No Node.js {format_version(minimum)} or later found, using {fallback}")
+            return fallback.path, fallback.version
+
+        # Last resort, brew alone can take a second or more
         try:
             brew_result = subprocess.run(
                 ["brew", "--prefix", "node"],
@@ -79,21 +80,28 @@ class NodeFinderMac(NodeFinderBase):
             if brew_result.returncode == 0:
                 node_path = os.path.join(brew_result.stdout.strip(), "bin", "node")
                 if os.path.isfile(node_path) and os.access(node_path, os.X_OK):
-                    return node_path
+                    return node_path, None
         except (subprocess.SubprocessError, FileNotFoundError):
             pass
 
         raise NodeNotFoundError("Node.js not found on the system")
 
     def get_node_version(self) -> str:
+        cached = self.cache.lookup()
+        if cached and cached.get("version"):
+            return cached["version"]
+
+        node_path = self.get_node_path()
         try:
             result = subprocess.run(
-                ["node", "--version"],
+                [node_path, "--version"],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
                 check=True
             )
-            return result.stdout.strip()
         except (subprocess.SubprocessError, FileNotFoundError):
             raise NodeNotFoundError("Unable to determine Node.js version")
+        version = result.stdout.strip()
+        self.cache.store(node_path, version)
+        return version
@@ -0,0 +1,63 @@
+import os
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.consts import APPLICATION_DIR_NAME
+from src.utils.atomic_write import commit_text
+from src.utils.os_utils import file_fingerprint
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+NODE_CACHE_FILE_NAME = "node.json"
+
+
+class NodeCache:
+    """
+    The Node.js binary found by an earlier run and its version, stored in
+    ~/.mint/mcp_proxy. An entry is keyed by the PATH it was found with and
+    by the binary's path, inode and mtime, so revalidating it costs a single
+    stat; upgrading or switching Node.js invalidates it.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(str(Path.home()), APPLICATION_DIR_NAME, NODE_CACHE_FILE_NAME)
+        try:
+            with open(self.path, 'r') as f:
+                self._entry: Dict[str, Any] = json.load(f)
+        except FileNotFoundError:
+            self._entry = {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable Node.js cache: {e}")
+            self._entry = {}
+
+    def lookup(self) -> Optional[Dict[str, Any]]:
+        """The cached {"node_path", "version"} entry if it is still valid, else None."""
+        entry = self._entry
+        if not entry or entry.get("search_path") != os.environ.get("PATH", ""):
+            return None
+        fingerprint = file_fingerprint(entry["node_path"])
+        if fingerprint is None or list(fingerprint) != entry.get("fingerprint"):
+            logger.debug(f"Cached Node.js {entry['node_path']} changed, searching again")
+            return None
+        return entry
+
+    def store(self, node_path: str, version: Optional[str] = None) -> None:
+        fingerprint = file_fingerprint(node_path)
+        if fingerprint is None:
+            return
+        entry = {
+            "search_path": os.environ.get("PATH", ""),
+            "node_path": node_path,
+            "fingerprint": list(fingerprint),
+            "version": version
+        }
+        if entry == self._entry:
+            return
+        self._entry = entry
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            commit_text(self.path, json.dumps(entry))
+        except OSError as e:
+            logger.debug(f"Could not write the Node.js cache: {e}")
@@ -0,0 +1,172 @@
+import os
+import re
+import sys
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from src.consts import MIN_NODE_VERSION, PACKAGE_NAME
+from src.utils.npm_package import read_tarball_manifest
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# (major, minor, patch, is_release, prerelease); a prerelease ranks below its release
+Version = Tuple[int, int, int, int, str]
+
+_VERSION_PATTERN = re.compile(r"v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:_\d+)?$")
+_HEADER_PATTERN = re.compile(r"#define NODE_(MAJOR|MINOR|PATCH)_VERSION (\d+)")
+SYSTEM_NODE_PATHS = ["/opt/homebrew/bin/node", "/usr/local/bin/node", "/opt/local/bin/node", "/usr/bin/node"]
+
+
+def parse_version(text: str) -> Optional[Version]:
+    """
+    Parse "v20.11.1", "18.19.0_1" (Homebrew revision), "21.0.0-nightly2023"
+    or a partial "20" as semver; None for aliases such as "lts" or "system".
+    """
+    match = _VERSION_PATTERN.match(text.strip())
+    if not match:
+        return None
+    major, minor, patch, prerelease = match.groups()
+    return int(major), int(minor or 0), int(patch or 0), 0 if prerelease else 1, prerelease or ""
+
+
+def format_version(version: Version) -> str:
+    text = f"v{version[0]}.{version[1]}.{version[2]}"
+    return f"{text}-{version[4]}" if version[4] else text
+
+
+class NodeInstall:
+    """One Node.js binary found on disk, with the version manager (or "system") it belongs to."""
+
+    def __init__(self, path: str, version: Optional[Version], source: str):
+        self.path = path
+        self.version = version
+        self.source = source
+
+    def __repr__(self) -> str:
+        version = format_version(self.version) if self.version else "unknown"
+        return f"NodeInstall({self.path!r}, {version}, {self.source})"
+
+
+def _is_executable(path: str) -> bool:
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _scan_versions_dir(source: str, versions_dir: str, binary: str) -> List[NodeInstall]:
+    """Installs laid out as <versions_dir>/<version>/<binary>, as most version managers do."""
+    installs = []
+    try:
+        entries = list(os.scandir(versions_dir))
+    except OSError:
+        return installs
+    for entry in entries:
+        version = parse_version(entry.name)
+        node_path = os.path.join(entry.path, binary)
+        if version is not None and _is_executable(node_path):
+            installs.append(NodeInstall(node_path, version, source))
+    return installs
+
+
+def binary_version(node_path: str) -> Optional[Version]:
+    """
+    Version of a Node.js binary, read from the node_version.h installed next
+    to it when there is one, else by running `node --version`.
+    """
+    prefix = Path(os.path.realpath(node_path)).parent.parent
+    try:
+        with open(prefix / "include" / "node" / "node_version.h", 'r') as f:
+            parts = dict(_HEADER_PATTERN.findall(f.read()))
+        if len(parts) == 3:
+            return int(parts["MAJOR"]), int(parts["MINOR"]), int(parts["PATCH"]), 1, ""
+    except OSError:
+        pass
+    try:
+        result = subprocess.run([node_path, "--version"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Could not get the version of {node_path}: {e}")
+        return None
+    return parse_version(result.stdout) if result.returncode == 0 else None
+
+
+def _home_dir(env_var: str, default: Path) -> Path:
+    return Path(os.environ[env_var]) if os.environ.get(env_var) else default
+
+
+def _version_manager_scanners() -> List[Callable[[], List[NodeInstall]]]:
+    home = Path.home()
+    fnm_dirs = [_home_dir("FNM_DIR", home / ".local" / "share" / "fnm")]
+    if sys.platform == "darwin":
+        fnm_dirs.append(home / "Library" / "Application Support" / "fnm")
+    layouts = [
+        ("nvm", _home_dir("NVM_DIR", home / ".nvm") / "versions" / "node", "bin/node"),
+        ("nodenv", _home_dir("NODENV_ROOT", home / ".nodenv") / "versions", "bin/node"),
+        ("volta", _home_dir("VOLTA_HOME", home / ".volta") / "tools" / "image" / "node", "bin/node"),
+        ("asdf", _home_dir("ASDF_DATA_DIR", home / ".asdf") / "installs" / "nodejs", "bin/node"),
+    ] + [("fnm", fnm_dir / "node-versions", "installation/bin/node") for fnm_dir in fnm_dirs]
+    return [lambda layout=layout: _scan_versions_dir(*layout) for layout in layouts]
+
+
+def _scan_homebrew() -> List[NodeInstall]:
+    """Every keg of node and node@<major> in the Apple silicon and Intel Cellars."""
+    installs = []
+    for cellar in ("/opt/homebrew/Cellar", "/usr/local/Cellar"):
+        try:
+            formulae = [entry.path for entry in os.scandir(cellar) if entry.name == "node" or entry.name.startswith("node@")]
+        except OSError:
+            continue
+        for formula in formulae:
+            installs.extend(_scan_versions_dir("homebrew", formula, "bin/node"))
+    return installs
+
+
+def _scan_system() -> List[NodeInstall]:
+    installs = []
+    seen = set()
+    for node_path in SYSTEM_NODE_PATHS:
+        real_path = os.path.realpath(node_path)
+        if real_path in seen or not _is_executable(node_path):
+            continue
+        seen.add(real_path)
+        installs.append(NodeInstall(node_path, binary_version(node_path), "system"))
+    return installs
+
+
+def minimum_node_version(package_path: Optional[str] = None) -> Version:
+    """
+    The lowest Node.js version the proxy supports: the first version in the
+    bundled package.json's engines.node (">=18", "^18.17.0"...), or
+    MIN_NODE_VERSION when it declares none.
+    """
+    try:
+        engines = read_tarball_manifest(package_path or os.path.abspath(PACKAGE_NAME)).get("engines") or {}
+        match = re.search(r"\d+(?:\.\d+){0,2}", engines.get("node") or "")
+        if match:
+            return parse_version(match.group(0))
+    except Exception as e:
+        logger.debug(f"Could not read engines.node from the bundled package: {e}")
+    return parse_version(MIN_NODE_VERSION)
+
+
+class NodeIndex:
+    """
+    Every Node.js install on the machine: nvm, nodenv, fnm, volta, asdf,
+    Homebrew kegs and the usual system paths, each scanned in its own
+    thread. Installs are ranked newest first by semver, never by string.
+    """
+
+    def __init__(self):
+        scanners = _version_manager_scanners() + [_scan_homebrew, _scan_system]
+        with ThreadPoolExecutor(max_workers=len(scanners)) as executor:
+            self.installs = [install for installs in executor.map(lambda scan: scan(), scanners) for install in installs]
+        # Unknown versions last
+        self.installs.sort(key=lambda install: install.version or (-1, 0, 0, 0, ""), reverse=True)
+        logger.debug(f"Found {len(self.installs)} Node.js installs")
+
+    def best(self, minimum: Optional[Version] = None) -> Optional[NodeInstall]:
+        """The newest install at or above `minimum`, preferring releases over prereleases, or None."""
+        candidates = [install for install in self.installs
+                      if install.version is not None and (minimum is None or install.version >= minimum)]
+        releases = [install for install in candidates if install.version[3]]
+        return (releases or candidates or [None])[0]
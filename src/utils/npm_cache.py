@@ -0,0 +1,104 @@
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+from src.consts import APPLICATION_DIR_NAME, PACKAGE_NAME, NPM_CACHE_NAME, NPM_CACHE_DIR_NAME
+from src.utils.npm_package import tarball_digest
+from src.utils.npm_runner import run_npm
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+_UNPACKED_MARKER = ".unpacked"
+
+
+def build_npm_cache(package_path: str, output_path: str) -> None:
+    """
+    Build step: install `package_path` into a throwaway prefix with a fresh
+    npm cache, so the cache ends up holding the package's whole dependency
+    closure, then pack that cache into `output_path` to ship next to the
+    package. Needs registry access; installing from the result does not.
+
+    Raises:
+        RuntimeError: If npm fails
+    """
+    import tarfile
+    with tempfile.TemporaryDirectory(prefix="mint-npm-cache-") as work_dir:
+        cache_dir = os.path.join(work_dir, "cache")
+        # A throwaway prefix does not need the npm lock
+        result = run_npm(["install", "-g", os.path.abspath(package_path), "--prefix", os.path.join(work_dir, "prefix"),
+                          "--cache", cache_dir, "--no-audit", "--no-fund"], lock=False)
+        if not result.ok:
+            raise RuntimeError(f"Building the cache failed: {result.summary}")
+        # Only the content-addressed store and its index are needed offline
+        with tarfile.open(output_path, "w:gz") as tar:
+            tar.add(os.path.join(cache_dir, "_cacache"), arcname="_cacache")
+    logger.info(f"Built npm cache {output_path} ({os.path.getsize(output_path)} bytes)")
+
+
+def bundled_cache_path(package_path: str) -> Optional[str]:
+    """The cache archive shipped next to `package_path`, if there is one."""
+    cache_path = os.path.join(os.path.dirname(os.path.abspath(package_path)), NPM_CACHE_NAME)
+    return cache_path if os.path.isfile(cache_path) else None
+
+
+def unpack_npm_cache(cache_archive: str) -> str:
+    """
+    Unpack a cache archive under ~/.mint/mcp_proxy, once per archive content,
+    and return the directory to pass to npm as --cache.
+    """
+    digest = tarball_digest(cache_archive)
+    cache_dir = os.path.join(str(Path.home()), APPLICATION_DIR_NAME, NPM_CACHE_DIR_NAME, digest[:16])
+    if os.path.exists(os.path.join(cache_dir, _UNPACKED_MARKER)):
+        logger.debug(f"npm cache already unpacked at {cache_dir}")
+        return cache_dir
+
+    import tarfile
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir)
+    with tarfile.open(cache_archive, "r:gz") as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(cache_dir, filter="data")
+        else:
+            tar.extractall(cache_dir)
+    Path(cache_dir, _UNPACKED_MARKER).touch()
+    logger.info(f"Unpacked npm cache to {cache_dir}")
+    return cache_dir
+
+
+def offline_install_args(package_path: str) -> List[str]:
+    """
+    Extra `npm install` arguments that resolve every dependency from the
+    bundled cache without touching the network, or [] when none is bundled.
+    """
+    cache_archive = bundled_cache_path(package_path)
+    if cache_archive is None:
+        return []
+    # Imported here so that runs without a bundled cache don't load tarfile
+    import tarfile
+    try:
+        return ["--offline", "--cache", unpack_npm_cache(cache_archive), "--no-audit", "--no-fund"]
+    except (OSError, tarfile.TarError) as e:
+        logger.warning(f"Could not use the bundled npm cache {cache_archive}: {e}")
+        return []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Build the npm dependency cache shipped with the installer')
+    parser.add_argument('--package', default=PACKAGE_NAME, help=f'Package tarball (default: {PACKAGE_NAME})')
+    parser.add_argument('--output', default=NPM_CACHE_NAME, help=f'Cache archive to write (default: {NPM_CACHE_NAME})')
+    args = parser.parse_args()
+    try:
+        build_npm_cache(args.package, args.output)
+        print(f"Wrote {args.output}")
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
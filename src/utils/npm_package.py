@@ -0,0 +1,156 @@
+import os
+import json
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.consts import APPLICATION_DIR_NAME, APPLICATION_NAME
+from src.utils.atomic_write import commit_text
+from src.utils.npm_runner import run_npm
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+PACKAGE_STAMP_FILE_NAME = "installed_package.json"
+_TARBALL_MANIFEST = "package/package.json"
+
+
+def read_tarball_manifest(tarball_path: str) -> Dict[str, Any]:
+    """
+    Read package/package.json from an npm tarball as a stream: members are
+    decompressed in order and nothing is extracted to disk. npm packs
+    package.json near the start, so the read usually stops early.
+
+    Raises:
+        ValueError: If the tarball is corrupt or has no package/package.json
+    """
+    # Imported here so that runs which never read a tarball don't load tarfile
+    import tarfile
+    try:
+        with tarfile.open(tarball_path, mode="r|gz") as tar:
+            for member in tar:
+                if member.isfile() and member.name.removeprefix("./") == _TARBALL_MANIFEST:
+                    return json.load(tar.extractfile(member))
+    except tarfile.TarError as e:
+        raise ValueError(f"Could not read {tarball_path}: {e}") from e
+    raise ValueError(f"No {_TARBALL_MANIFEST} in {tarball_path}")
+
+
+def tarball_digest(tarball_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(tarball_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _prefix_from_npmrc() -> Optional[str]:
+    try:
+        with open(os.path.join(str(Path.home()), ".npmrc"), 'r') as f:
+            for line in f:
+                key, _, value = line.partition("=")
+                if key.strip() == "prefix" and value.strip():
+                    return os.path.expanduser(value.strip())
+    except OSError:
+        pass
+    return None
+
+
+def package_dir_from_bin(bin_path: str, name: str) -> Optional[str]:
+    """Follow a global bin link (.../bin/name -> .../node_modules/name/...) to the package it belongs to."""
+    path = Path(os.path.realpath(bin_path)).parent
+    for directory in (path, *path.parents):
+        if directory.name == name and (directory / "package.json").is_file():
+            return str(directory)
+        if directory.name == "node_modules":
+            break
+    return None
+
+
+def global_prefixes() -> List[str]:
+    """npm global prefixes to try, without spawning npm: configured ones first, then the one Node.js implies."""
+    prefixes = [os.environ.get("npm_config_prefix") or os.environ.get("NPM_CONFIG_PREFIX"), _prefix_from_npmrc()]
+    node_path = shutil.which("node")
+    if node_path:
+        # npm's default global prefix is the prefix Node.js was installed to
+        prefixes.append(str(Path(os.path.realpath(node_path)).parent.parent))
+    return [prefix for prefix in prefixes if prefix]
+
+
+def find_global_package_dir(name: str = APPLICATION_NAME) -> Optional[str]:
+    """
+    Locate the globally installed package `name`, without spawning npm when
+    possible: through its bin link on PATH, then under the configured or
+    Node.js-derived global prefix, and only then by asking `npm root -g`.
+    """
+    bin_path = shutil.which(name)
+    package_dir = package_dir_from_bin(bin_path, name) if bin_path else None
+    if package_dir:
+        return package_dir
+
+    for prefix in global_prefixes():
+        candidate = os.path.join(prefix, "lib", "node_modules", name)
+        if os.path.isfile(os.path.join(candidate, "package.json")):
+            return candidate
+
+    result = run_npm(["root", "-g"], timeout=30, lock=False)
+    if not result.ok or not result.stdout:
+        logger.debug(f"Could not ask npm for its global root: {result.summary}")
+        return None
+    candidate = os.path.join(result.stdout[-1].strip(), name)
+    return candidate if os.path.isfile(os.path.join(candidate, "package.json")) else None
+
+
+def read_package_version(package_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(package_dir, "package.json"), 'r') as f:
+            return json.load(f).get("version")
+    except (OSError, ValueError) as e:
+        logger.debug(f"Unreadable package.json in {package_dir}: {e}")
+        return None
+
+
+def installed_version(name: str = APPLICATION_NAME) -> Optional[str]:
+    package_dir = find_global_package_dir(name)
+    return read_package_version(package_dir) if package_dir else None
+
+
+def _stamp_path() -> str:
+    return os.path.join(str(Path.home()), APPLICATION_DIR_NAME, PACKAGE_STAMP_FILE_NAME)
+
+
+def record_installed_tarball(tarball_path: str) -> None:
+    """Remember which tarball was installed, since npm itself does not keep its hash."""
+    try:
+        stamp = {"version": read_tarball_manifest(tarball_path).get("version"), "sha256": tarball_digest(tarball_path)}
+        os.makedirs(os.path.dirname(_stamp_path()), exist_ok=True)
+        commit_text(_stamp_path(), json.dumps(stamp))
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not record the installed tarball: {e}")
+
+
+def is_tarball_installed(tarball_path: str) -> bool:
+    """
+    Whether the package in `tarball_path` is already installed globally: the
+    installed version matches the tarball's and the tarball is the one we
+    last installed (same SHA-256).
+    """
+    try:
+        version = read_tarball_manifest(tarball_path).get("version")
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not read the tarball manifest: {e}")
+        return False
+
+    # The stamp is checked first: unlike finding the installed package, it never needs npm
+    try:
+        with open(_stamp_path(), 'r') as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if stamp.get("version") != version or stamp.get("sha256") != tarball_digest(tarball_path):
+        return False
+
+    current = installed_version()
+    logger.debug(f"Bundled version: {version}, installed version: {current}")
+    return current == version
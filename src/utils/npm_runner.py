@@ -0,0 +1,176 @@
+import os
+import time
+import signal
+import threading
+import subprocess
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from src.consts import APPLICATION_DIR_NAME
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+NPM_TIMEOUT_SECONDS = 300
+# How long to wait for another installer run to finish with npm
+NPM_LOCK_TIMEOUT_SECONDS = 600
+# Between SIGTERM and SIGKILL when a run times out
+NPM_KILL_GRACE_SECONDS = 5
+NPM_LOCK_FILE_NAME = "npm.lock"
+
+
+class NpmLockTimeout(Exception):
+    """Raised when the npm lock could not be taken in time"""
+    pass
+
+
+class NpmResult:
+    """How an npm run ended. `returncode` is None when npm could not be started or was killed."""
+
+    def __init__(self, args: List[str], returncode: Optional[int], stdout: List[str], stderr: List[str],
+                 duration: float, timed_out: bool = False, error: Optional[str] = None):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+        self.timed_out = timed_out
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    @property
+    def summary(self) -> str:
+        if self.ok:
+            return f"npm {' '.join(self.args)} succeeded in {self.duration:.1f}s"
+        if self.error:
+            return f"npm {' '.join(self.args)} failed: {self.error}"
+        errors = [line for line in self.stderr if line.startswith(("npm error", "npm ERR!"))]
+        detail = errors[0] if errors else f"exit code {self.returncode}"
+        return f"npm {' '.join(self.args)} failed: {detail}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "args": self.args,
+            "returncode": self.returncode,
+            "duration": round(self.duration, 3),
+            "timed_out": self.timed_out,
+            "error": self.error
+        }
+
+
+@contextmanager
+def npm_lock(timeout: float = NPM_LOCK_TIMEOUT_SECONDS) -> Iterator[None]:
+    """
+    Hold ~/.mint/mcp_proxy/npm.lock, so installer runs on the same machine,
+    and threads within one, never run npm against the global prefix at once.
+    Where flock is unavailable (Windows) this does nothing.
+
+    Raises:
+        NpmLockTimeout: If the lock is still held by someone else after `timeout` seconds
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+
+    lock_path = os.path.join(str(Path.home()), APPLICATION_DIR_NAME, NPM_LOCK_FILE_NAME)
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    deadline = time.monotonic() + timeout
+    with open(lock_path, 'a') as lock_file:
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise NpmLockTimeout(f"{lock_path} is still held after {timeout}s")
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _pump(stream, lines: List[str], is_stderr: bool) -> None:
+    for line in stream:
+        line = line.rstrip("\n")
+        lines.append(line)
+        if is_stderr and line.startswith(("npm error", "npm ERR!")):
+            logger.warning(f"npm: {line}")
+        else:
+            logger.debug(f"npm: {line}")
+    stream.close()
+
+
+def _kill(process: subprocess.Popen) -> None:
+    """Stop npm and everything it spawned (node, install scripts): SIGTERM to its process group, then SIGKILL."""
+    if not hasattr(os, "killpg"):
+        process.kill()
+        return
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            return
+        try:
+            process.wait(NPM_KILL_GRACE_SECONDS)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def _run(args: List[str], timeout: float) -> NpmResult:
+    started = time.monotonic()
+    try:
+        process = subprocess.Popen(["npm", *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   stdin=subprocess.DEVNULL, text=True, start_new_session=True)
+    except OSError as e:
+        return NpmResult(args, None, [], [], time.monotonic() - started, error=str(e))
+
+    stdout: List[str] = []
+    stderr: List[str] = []
+    pumps = [threading.Thread(target=_pump, args=(process.stdout, stdout, False), daemon=True),
+             threading.Thread(target=_pump, args=(process.stderr, stderr, True), daemon=True)]
+    for pump in pumps:
+        pump.start()
+
+    timed_out = False
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        logger.error(f"npm {' '.join(args)} did not finish within {timeout}s, killing it")
+        timed_out = True
+        _kill(process)
+    for pump in pumps:
+        pump.join(NPM_KILL_GRACE_SECONDS)
+
+    duration = time.monotonic() - started
+    if timed_out:
+        return NpmResult(args, None, stdout, stderr, duration, timed_out=True, error=f"timed out after {timeout}s")
+    return NpmResult(args, process.returncode, stdout, stderr, duration)
+
+
+def run_npm(args: List[str], timeout: Optional[float] = None, lock: bool = True) -> NpmResult:
+    """
+    Run `npm <args>`, logging its output line by line as it comes. The run
+    is killed, with everything it started, after `timeout` seconds
+    (NPM_TIMEOUT_SECONDS by default). With `lock`, the run holds the npm
+    lock; read-only commands and throwaway prefixes do not need it.
+    """
+    timeout = timeout or NPM_TIMEOUT_SECONDS
+    logger.debug(f"Running npm {' '.join(args)} (timeout {timeout}s)")
+    if not lock:
+        result = _run(args, timeout)
+    else:
+        try:
+            with npm_lock():
+                result = _run(args, timeout)
+        except NpmLockTimeout as e:
+            result = NpmResult(args, None, [], [], 0.0, error=str(e))
+    logger.debug(result.summary)
+    return result
@@ -1,5 +1,10 @@
+import os
 import platform
 from enum import Enum, auto
+from typing import Optional, Tuple
+
+# (inode, size, mtime_ns) of a file on disk
+Fingerprint = Tuple[int, int, int]
 
 class OperatingSystem(Enum):
     """Enum representing supported operating systems"""
@@ -26,4 +31,13 @@ def get_current_os() -> OperatingSystem:
     elif system == "windows":
         return OperatingSystem.WINDOWS
     else:
-        raise RuntimeError(f"Unsupported operating system: {system}") 
\ No newline at end of file
+        raise RuntimeError(f"Unsupported operating system: {system}")
+
+
+def file_fingerprint(path: str) -> Optional[Fingerprint]:
+    """Return the (inode, size, mtime_ns) fingerprint of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
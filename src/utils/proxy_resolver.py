@@ -0,0 +1,63 @@
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from src.consts import APPLICATION_NAME
+from src.utils.npm_package import global_prefixes, package_dir_from_bin, read_package_version
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+_resolved: Dict[str, Optional["ResolvedBinary"]] = {}
+_resolved_lock = threading.Lock()
+
+
+class ResolvedBinary:
+    """Where a command was found and the version of the npm package it belongs to (None if unknown)."""
+
+    def __init__(self, path: str, version: Optional[str] = None):
+        self.path = path
+        self.version = version
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"path": self.path, "version": self.version}
+
+    def __repr__(self) -> str:
+        return f"ResolvedBinary({self.path!r}, {self.version!r})"
+
+
+def _search_dirs() -> List[str]:
+    """PATH first, like a shell would, then the npm global bin directories, which may not be on PATH."""
+    dirs = [directory for directory in os.environ.get("PATH", "").split(os.pathsep) if directory]
+    dirs.extend(os.path.join(prefix, "bin") for prefix in global_prefixes())
+    # Keep the first occurrence of each directory
+    return list(dict.fromkeys(dirs))
+
+
+def _scan(name: str) -> Optional[ResolvedBinary]:
+    for directory in _search_dirs():
+        candidate = os.path.join(directory, name)
+        if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+            package_dir = package_dir_from_bin(candidate, name)
+            version = read_package_version(package_dir) if package_dir else None
+            return ResolvedBinary(candidate, version)
+    return None
+
+
+def resolve_binary(name: str = APPLICATION_NAME) -> Optional[ResolvedBinary]:
+    """
+    Find `name` in-process by scanning PATH and the npm global bin
+    directories. Results, including misses, are memoized for the life of the
+    process; call `invalidate_binaries` after anything that installs or
+    removes packages.
+    """
+    with _resolved_lock:
+        if name not in _resolved:
+            _resolved[name] = _scan(name)
+            logger.debug(f"Resolved {name}: {_resolved[name]}")
+        return _resolved[name]
+
+
+def invalidate_binaries() -> None:
+    with _resolved_lock:
+        _resolved.clear()
@@ -0,0 +1,156 @@
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from src.consts import APPLICATION_DIR_NAME, APPLICATION_NAME
+from src.utils.atomic_write import commit_text
+from src.utils.proxy_resolver import resolve_binary
+from src.utils.logger import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+RECEIPT_FILE_NAME = "receipt.json"
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_record(path: str) -> Dict[str, Any]:
+    """Size, mtime_ns and content hash of `path`; a missing file is recorded as such."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {"path": path, "missing": True}
+    return {"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": _sha256(path)}
+
+
+def _record_matches(record: Dict[str, Any]) -> bool:
+    """
+    Whether a file is still as recorded. A matching stat is enough; when it
+    differs (e.g. the file was touched or copied back) the content hash decides.
+    """
+    try:
+        stat = os.stat(record["path"])
+    except FileNotFoundError:
+        return record.get("missing", False)
+    if record.get("missing"):
+        return False
+    if stat.st_size == record["size"] and stat.st_mtime_ns == record["mtime_ns"]:
+        return True
+    return stat.st_size == record["size"] and _sha256(record["path"]) == record["sha256"]
+
+
+def _state_digest(state: Any) -> str:
+    return hashlib.sha256(json.dumps(state).encode('utf-8')).hexdigest()
+
+
+def _client_record(path: str, state: Any) -> Dict[str, Any]:
+    """Size and mtime_ns of a client file plus the digest of the state we own in it."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {"path": path, "missing": True, "owned": _state_digest(state)}
+    return {"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "owned": _state_digest(state)}
+
+
+def _stat_matches(record: Dict[str, Any]) -> bool:
+    try:
+        stat = os.stat(record["path"])
+    except FileNotFoundError:
+        return record.get("missing", False)
+    return not record.get("missing") and stat.st_size == record.get("size") and stat.st_mtime_ns == record.get("mtime_ns")
+
+
+class Receipt:
+    """
+    What the last successful run left behind, stored in ~/.mint/mcp_proxy:
+    the package version with the installed proxy binary, and for each
+    installed client the files it touched. A later run skips whatever still
+    matches, so re-running an unchanged machine costs a few stat calls.
+
+    Clients rewrite their own files all the time (Claude Code's
+    ~/.claude.json on every session, Cursor's state.vscdb on every UI
+    change), so a client's files are not compared whole: when one changed
+    since the last run, only the state the installer owns in it (see
+    BaseInstaller.owned_state) is compared.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(str(Path.home()), APPLICATION_DIR_NAME, RECEIPT_FILE_NAME)
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(self.path, 'r') as f:
+                self._data = json.load(f)
+        except FileNotFoundError:
+            self._data = {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable receipt: {e}")
+            self._data = {}
+        self._data.setdefault("package", None)
+        self._data.setdefault("clients", {})
+
+    def package_matches(self, version: str) -> bool:
+        """Whether `version` of the proxy was installed and its binary is unchanged."""
+        package = self._data["package"]
+        return bool(package) and package["version"] == version and _record_matches(package["binary"])
+
+    def record_package(self, version: str) -> None:
+        resolved = resolve_binary(APPLICATION_NAME)
+        if resolved is None:
+            logger.debug(f"{APPLICATION_NAME} was not found, not recording it")
+            return
+        with self._lock:
+            self._data["package"] = {"version": version, "binary": _file_record(os.path.realpath(resolved.path))}
+            self._dirty = True
+
+    def client_matches(self, client: str, paths: List[str], owned_state: Callable[[], Dict[str, Any]]) -> bool:
+        """
+        Whether `client` was installed by an earlier run and what it owns in
+        `paths` is unchanged since. `owned_state` is only called when a file
+        changed; a match then refreshes the recorded stats.
+        """
+        records = self._data["clients"].get(client)
+        if not records or sorted(record["path"] for record in records) != sorted(paths):
+            return False
+        if all(_stat_matches(record) for record in records):
+            return True
+        try:
+            state = owned_state()
+        except Exception as e:
+            logger.debug(f"Could not read the state {client} owns: {e}")
+            return False
+        if any(record.get("owned") != _state_digest(state.get(record["path"])) for record in records):
+            return False
+        logger.debug(f"Only what {client} does not own changed since the last run")
+        self.record_client(client, paths, state)
+        return True
+
+    def record_client(self, client: str, paths: List[str], state: Dict[str, Any]) -> None:
+        records = [_client_record(path, state.get(path)) for path in paths]
+        with self._lock:
+            self._data["clients"][client] = records
+            self._dirty = True
+
+    def forget_client(self, client: str) -> None:
+        with self._lock:
+            if self._data["clients"].pop(client, None) is not None:
+                self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            commit_text(self.path, json.dumps(self._data, indent=2))
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Could not write receipt {self.path}: {e}")
@@ -0,0 +1,149 @@
+"""
+Benchmark of installing into a large ~/.claude.json: the full load/dump path
+every other client uses against the Claude Code splice path, on synthetic
+configs of a few sizes. Each measurement runs in a fresh interpreter so its
+peak RSS is its own.
+
+    python tests/bench_claude_config.py --sizes 1 50 200
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import shutil
+import resource
+import tempfile
+import subprocess
+from typing import Any, Dict, List, Optional, TextIO
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from src.utils.json_format import JsonFormat
+
+MODES = ("load_dump", "splice")
+
+# Claude Code writes its config with a two-space indent
+CLAUDE_FORMAT = JsonFormat(indent=2)
+
+# One prompt of project history, about 300 bytes once formatted
+PROMPT = {"display": "refactor the parser and keep the tests green " * 4, "pastedContents": {}}
+# Prompts per project: about 4 KB of history each
+HISTORY_ENTRIES = 12
+
+
+def _server(name: str) -> Dict[str, Any]:
+    return {"command": "npx", "args": ["-y", f"@example/{name}"], "env": {}}
+
+
+def _member(f: TextIO, key: str, value: Any, first: bool) -> None:
+    f.write(("\n" if first else ",\n") + "  " + json.dumps(key) + ": " + CLAUDE_FORMAT.dumps(value, base_indent="  "))
+
+
+def write_config(path: str, projects: int, servers: int, history_entries: int = HISTORY_ENTRIES) -> None:
+    """
+    Write a Claude Code config with `projects` projects of `history_entries`
+    prompts each and `servers` MCP servers, half of them global and the rest spread evenly
+    over the projects. The projects object is streamed out one project at a
+    time, so large fixtures do not need a large tree in memory.
+    """
+    global_servers = {f"global-{n}": _server(f"global-{n}") for n in range(servers // 2)}
+    project_servers = servers - len(global_servers)
+    history = [PROMPT] * history_entries
+    step = max(projects // project_servers, 1) if project_servers else 0
+    with open(path, 'w') as f:
+        f.write("{")
+        _member(f, "numStartups", 40, first=True)
+        _member(f, "mcpServers", global_servers, first=False)
+        f.write(',\n  "projects": {')
+        for n in range(projects):
+            project: Dict[str, Any] = {"allowedTools": [], "history": history, "hasTrustDialogAccepted": True}
+            if step and n % step == 0 and n // step < project_servers:
+                project["mcpServers"] = {f"local-{n}": _server(f"local-{n}")}
+            key = json.dumps(f"/Users/dev/src/project-{n}")
+            f.write(("\n" if n == 0 else ",\n") + "    " + key + ": " + CLAUDE_FORMAT.dumps(project, base_indent="    "))
+        f.write("\n  }" if projects else "}")
+        _member(f, "theme", "dark", first=False)
+        f.write("\n}\n")
+
+
+def projects_for_size(size: int) -> int:
+    """Number of projects that makes a config of about `size` bytes."""
+    project = {"allowedTools": [], "history": [PROMPT] * HISTORY_ENTRIES, "hasTrustDialogAccepted": True}
+    return max(size // (len(CLAUDE_FORMAT.dumps(project, base_indent="    ")) + 40), 1)
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS of this process since it started."""
+    try:
+        # Linux resets the high-water mark on exec; ru_maxrss keeps the forking parent's
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)
+
+
+def _child(mode: str) -> None:
+    """Install into $HOME/.claude.json once with `mode` and print the cost as JSON."""
+    from src.base.plan import Plan
+    from src.base.config_creator import ConfigCreator
+    from src.installers.claude_code.mac.mcp_config_creator import ClaudeCodeMacMCPConfigEditor
+
+    editor = ClaudeCodeMacMCPConfigEditor({})
+    start = time.perf_counter()
+    if mode == "load_dump":
+        # The generic path every other client takes: load the whole document and dump it back
+        Plan(ConfigCreator.plan_update(editor)).apply()
+    else:
+        editor.update_config()
+    seconds = time.perf_counter() - start
+    print(json.dumps({"seconds": seconds, "peak_rss_mb": peak_rss_mb()}))
+
+
+def measure(mode: str, config_path: str) -> Dict[str, float]:
+    """Install into a copy of `config_path` with `mode` in a fresh interpreter, returning its wall time and peak RSS."""
+    with tempfile.TemporaryDirectory() as home:
+        target = os.path.join(home, ".claude.json")
+        shutil.copyfile(config_path, target)
+        env = dict(os.environ, HOME=home)
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode],
+                                cwd=REPO_DIR, env=env, capture_output=True, text=True, check=True)
+        return json.loads(result.stdout.splitlines()[-1])
+
+
+def run(sizes_mb: List[int], servers: int = 20, out: Optional[TextIO] = None) -> Dict[int, Dict[str, Dict[str, float]]]:
+    """Measure every mode on a config of each size and print a table to `out`."""
+    results: Dict[int, Dict[str, Dict[str, float]]] = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size_mb in sizes_mb:
+            config_path = os.path.join(work_dir, f"claude-{size_mb}mb.json")
+            write_config(config_path, projects_for_size(size_mb * 1024 * 1024), servers)
+            results[size_mb] = {mode: measure(mode, config_path) for mode in MODES}
+            os.remove(config_path)
+            if out is not None:
+                row = "   ".join(f"{mode} {cost['seconds']:6.2f}s / {cost['peak_rss_mb']:5.0f} MB"
+                               for mode, cost in results[size_mb].items())
+                print(f"{size_mb:4d} MB:   {row}", file=out)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 50, 200], help="config sizes in MB")
+    parser.add_argument("--servers", type=int, default=20, help="MCP servers in each config")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child)
+    else:
+        run(args.sizes, args.servers, out=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark of the mcpServers index on ~/.claude.json: once the index is
+stored, planning an update should cost in proportion to the servers, not to
+the projects. Compares a full load that walks every project, the cold scan
+that builds the index, and planning an update from the stored index.
+
+    python tests/bench_mcp_index.py --projects 1000 10000 --servers 20 200
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import Dict, List, Optional, TextIO
+from unittest import mock
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from src.utils import mcp_index
+from src.utils.mcp_index import McpServerIndex, get_mcp_index, save_mcp_index
+from src.installers.claude_code.mac.mcp_config_creator import ClaudeCodeMacMCPConfigEditor
+from tests.bench_claude_config import write_config
+
+# A prompt per project keeps 10k projects at a few MB, like a real config of that many
+HISTORY_ENTRIES = 1
+
+
+def bytes_read() -> Optional[int]:
+    """Bytes this process has read through read(2) so far, where the OS reports it."""
+    try:
+        with open("/proc/self/io", 'r') as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def measure(projects: int, servers: int) -> Dict[str, float]:
+    """
+    Time the three ways of finding the servers of a config with `projects`
+    projects and `servers` servers, and count the bytes the warm plan reads.
+    """
+    with tempfile.TemporaryDirectory() as home, mock.patch.dict(os.environ, {"HOME": home}):
+        config_path = os.path.join(home, ".claude.json")
+        write_config(config_path, projects, servers, HISTORY_ENTRIES)
+        result: Dict[str, float] = {"config_bytes": os.path.getsize(config_path)}
+
+        start = time.perf_counter()
+        with open(config_path, 'r') as f:
+            document = json.load(f)
+        found = len(document.get("mcpServers", {}))
+        for project in document.get("projects", {}).values():
+            found += len(project.get("mcpServers", {}))
+        result["full_load_s"] = time.perf_counter() - start
+        del document
+
+        start = time.perf_counter()
+        McpServerIndex.build(config_path)
+        result["cold_scan_s"] = time.perf_counter() - start
+
+        # Store the index as an install would, then forget it like a new process
+        get_mcp_index(config_path)
+        save_mcp_index(config_path)
+        mcp_index._indexes.clear()
+
+        editor = ClaudeCodeMacMCPConfigEditor({})
+        read_before = bytes_read()
+        start = time.perf_counter()
+        editor.plan_update()
+        result["warm_plan_s"] = time.perf_counter() - start
+        read_after = bytes_read()
+        if read_before is not None and read_after is not None:
+            result["warm_plan_bytes_read"] = read_after - read_before
+        mcp_index._indexes.clear()
+        return result
+
+
+def run(projects: List[int], servers: List[int], out: Optional[TextIO] = None) -> Dict[int, Dict[int, Dict[str, float]]]:
+    """Measure every combination of project and server counts and print a table to `out`."""
+    results: Dict[int, Dict[int, Dict[str, float]]] = {}
+    for project_count in projects:
+        for server_count in servers:
+            cost = measure(project_count, server_count)
+            results.setdefault(project_count, {})[server_count] = cost
+            if out is not None:
+                print(f"{project_count:6d} projects {server_count:4d} servers ({cost['config_bytes'] / 1e6:5.1f} MB):"
+                      f"   full load {cost['full_load_s'] * 1000:7.1f} ms"
+                      f"   cold scan {cost['cold_scan_s'] * 1000:7.1f} ms"
+                      f"   warm plan {cost['warm_plan_s'] * 1000:6.2f} ms"
+                      f" / {cost.get('warm_plan_bytes_read', 0) / 1024:6.1f} KB read", file=out)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, nargs="+", default=[1000, 10000], help="project counts")
+    parser.add_argument("--servers", type=int, nargs="+", default=[20, 200], help="MCP server counts")
+    args = parser.parse_args()
+    run(args.projects, args.servers, out=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
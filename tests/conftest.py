@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make `src` importable however pytest is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
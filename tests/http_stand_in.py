@@ -0,0 +1,98 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class StandIn:
+    """
+    A local HTTP server standing in for the download host. It serves
+    `artifacts` by path with a strong ETag, honours Range, If-Range and
+    If-None-Match, can cut the connection partway through a body, and counts
+    the body bytes it sends.
+    """
+
+    def __init__(self):
+        self.artifacts: Dict[str, bytes] = {}
+        self.support_range = True
+        # Body bytes sent before the connection is cut, for the next `disconnects` responses
+        self.disconnect_after = 0
+        self.disconnects = 0
+        self.bytes_served = 0
+        self.requests: List[Dict[str, str]] = []
+        self.statuses: List[int] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def __enter__(self) -> "StandIn":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}{path}"
+
+    @staticmethod
+    def etag(content: bytes) -> str:
+        return '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+
+    def _respond(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.requests.append(dict(handler.headers))
+        content = self.artifacts.get(handler.path)
+        if content is None:
+            self._send(handler, 404, {}, b"")
+            return
+        etag = self.etag(content)
+        headers = {"ETag": etag, "Accept-Ranges": "bytes" if self.support_range else "none"}
+        if handler.headers.get("If-None-Match") == etag:
+            self._send(handler, 304, headers, b"")
+            return
+
+        range_header = handler.headers.get("Range")
+        if_range = handler.headers.get("If-Range")
+        if self.support_range and range_header and (if_range is None or if_range == etag):
+            start = int(range_header.split("=")[1].split("-")[0])
+            if start >= len(content):
+                self._send(handler, 416, dict(headers, **{"Content-Range": f"bytes */{len(content)}"}), b"")
+                return
+            headers["Content-Range"] = f"bytes {start}-{len(content) - 1}/{len(content)}"
+            self._send(handler, 206, headers, content[start:])
+            return
+        self._send(handler, 200, headers, content)
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, headers: Dict[str, str], body: bytes) -> None:
+        with self._lock:
+            self.statuses.append(status)
+            cut: Optional[int] = None
+            if body and self.disconnects:
+                self.disconnects -= 1
+                cut = self.disconnect_after
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        sent = body if cut is None else body[:cut]
+        handler.wfile.write(sent)
+        handler.wfile.flush()
+        with self._lock:
+            self.bytes_served += len(sent)
+        if cut is not None:
+            handler.close_connection = True
+
+    def _handler_class(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in._respond(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
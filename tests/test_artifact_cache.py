@@ -0,0 +1,74 @@
+import os
+import json
+import tempfile
+import unittest
+from src.utils.artifact_cache import ArtifactCache
+from tests.http_stand_in import StandIn
+
+ARTIFACT_SIZE = 64 * 1024
+
+
+class ArtifactCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.work_dir.name, "artifacts")
+        self.stand_in = StandIn().__enter__()
+        self.stand_in.artifacts["/a/package.tgz"] = os.urandom(ARTIFACT_SIZE)
+        self.stand_in.artifacts["/b/package.tgz"] = os.urandom(ARTIFACT_SIZE)
+
+    def tearDown(self):
+        self.stand_in.__exit__(None, None, None)
+        self.work_dir.cleanup()
+
+    def read(self, path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_cold_fetch_downloads_once(self):
+        path = ArtifactCache(self.root).fetch(self.stand_in.url("/a/package.tgz"))
+
+        self.assertEqual(self.read(path), self.stand_in.artifacts["/a/package.tgz"])
+        self.assertEqual(self.stand_in.bytes_served, ARTIFACT_SIZE)
+        self.assertEqual(self.stand_in.statuses, [200])
+
+    def test_warm_fetch_is_a_304_with_no_body(self):
+        url = self.stand_in.url("/a/package.tgz")
+        cold_path = ArtifactCache(self.root).fetch(url)
+        served = self.stand_in.bytes_served
+
+        warm_path = ArtifactCache(self.root).fetch(url)
+
+        self.assertEqual(warm_path, cold_path)
+        self.assertEqual(self.stand_in.statuses, [200, 304])
+        self.assertEqual(self.stand_in.requests[1]["If-None-Match"], StandIn.etag(self.read(cold_path)))
+        self.assertEqual(self.stand_in.bytes_served - served, 0)
+
+    def test_changed_artifact_is_downloaded_again(self):
+        url = self.stand_in.url("/a/package.tgz")
+        ArtifactCache(self.root).fetch(url)
+        self.stand_in.artifacts["/a/package.tgz"] = changed = os.urandom(ARTIFACT_SIZE)
+
+        path = ArtifactCache(self.root).fetch(url)
+
+        self.assertEqual(self.read(path), changed)
+        self.assertEqual(self.stand_in.statuses, [200, 200])
+
+    def test_eviction_keeps_the_cache_within_max_bytes(self):
+        cache = ArtifactCache(self.root, max_bytes=ARTIFACT_SIZE + ARTIFACT_SIZE // 2)
+        first_path = cache.fetch(self.stand_in.url("/a/package.tgz"))
+        second_path = cache.fetch(self.stand_in.url("/b/package.tgz"))
+
+        self.assertFalse(os.path.exists(first_path))
+        self.assertTrue(os.path.exists(second_path))
+        with open(os.path.join(self.root, "index.json"), 'r') as f:
+            self.assertEqual(list(json.load(f)), [self.stand_in.url("/b/package.tgz")])
+
+        # The evicted artifact is downloaded again, not revalidated
+        cache.fetch(self.stand_in.url("/a/package.tgz"))
+        self.assertEqual(self.stand_in.statuses, [200, 200, 200])
+        self.assertNotIn("If-None-Match", self.stand_in.requests[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import time
+import tempfile
+import unittest
+from unittest import mock
+from src.utils.backup_store import BackupStore
+
+
+class BackupStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.work_dir.name, "backups")
+        self.config_path = os.path.join(self.work_dir.name, "mcp.json")
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write_config(self, text: str) -> None:
+        with open(self.config_path, 'w') as f:
+            f.write(text)
+
+    def test_generations_with_matches_snapshot_and_writes_nothing(self):
+        store = BackupStore(self.root, max_generations=2)
+        for created, text in ((100.0, '{"a": 1}'), (200.0, '{"a": 2}')):
+            self.write_config(text)
+            store.snapshot("cursor", self.config_path, created=created)
+        index_before = open(store.index_path).read()
+
+        self.write_config('{"a": 3}')
+        pending = store.pending_generation("cursor", self.config_path, created=300.0)
+        preview = store.generations_with(pending)
+
+        self.assertEqual(open(store.index_path).read(), index_before)
+        store.snapshot("cursor", self.config_path, created=300.0)
+        actual = BackupStore(self.root).generations("cursor")
+        self.assertEqual([generation.to_dict() for generation in preview],
+                         [generation.to_dict() for generation in actual])
+        self.assertEqual([generation.created for generation in actual], [300.0, 200.0])
+
+    def test_generations_with_an_unchanged_config_adds_nothing(self):
+        store = BackupStore(self.root)
+        self.write_config('{"a": 1}')
+        store.snapshot("cursor", self.config_path, created=100.0)
+        pending = store.pending_generation("cursor", self.config_path, created=200.0)
+        self.assertEqual([generation.created for generation in store.generations_with(pending)], [100.0])
+
+    def test_retention_comes_from_the_environment(self):
+        day = 86400
+        now = time.time()
+        with mock.patch.dict(os.environ, {"MINT_BACKUP_RETENTION": "4", "MINT_BACKUP_MAX_AGE_DAYS": "7"}):
+            store = BackupStore(self.root)
+            for created, text in ((now - 30 * day, '{"a": 1}'), (now - 10 * day, '{"a": 2}'),
+                                  (now - 2 * day, '{"a": 3}'), (now - day, '{"a": 4}'), (now, '{"a": 5}')):
+                self.write_config(text)
+                store.snapshot("cursor", self.config_path, created=created)
+
+        self.assertEqual((store.max_generations, store.max_age_days), (4, 7.0))
+        # The four newest, less the one older than a week
+        self.assertEqual([generation.created for generation in store.generations("cursor")], [now, now - day, now - 2 * day])
+
+    def test_the_newest_backup_is_kept_whatever_its_age(self):
+        self.write_config('{"a": 1}')
+        with mock.patch.dict(os.environ, {"MINT_BACKUP_MAX_AGE_DAYS": "7"}):
+            store = BackupStore(self.root)
+            store.snapshot("cursor", self.config_path, created=time.time() - 90 * 86400)
+        self.assertEqual(len(store.generations("cursor")), 1)
+
+    def test_no_age_limit_by_default(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("MINT_BACKUP_MAX_AGE_DAYS", None)
+            self.assertIsNone(BackupStore(self.root).max_age_days)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import hashlib
+import tempfile
+import unittest
+from unittest import mock
+from src.utils import downloader
+from src.utils.downloader import DownloadError, fetch_file
+from tests.http_stand_in import StandIn
+
+ARTIFACT = os.urandom(300 * 1024)
+CUT = 100 * 1024
+
+
+class DownloaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.local_path = os.path.join(self.work_dir.name, "package.tgz")
+        self.part_path = self.local_path + ".part"
+        backoff = mock.patch.object(downloader, "DOWNLOAD_BACKOFF_SECONDS", 0)
+        backoff.start()
+        self.addCleanup(backoff.stop)
+        self.stand_in = StandIn().__enter__()
+        self.stand_in.artifacts["/package.tgz"] = ARTIFACT
+        self.url = self.stand_in.url("/package.tgz")
+
+    def tearDown(self):
+        self.stand_in.__exit__(None, None, None)
+        self.work_dir.cleanup()
+
+    def read_local(self) -> bytes:
+        with open(self.local_path, 'rb') as f:
+            return f.read()
+
+    def test_resumes_after_a_disconnect(self):
+        self.stand_in.disconnects, self.stand_in.disconnect_after = 1, CUT
+        fetch_file(self.url, self.local_path, retries=2)
+
+        self.assertEqual(self.read_local(), ARTIFACT)
+        self.assertEqual(self.stand_in.statuses, [200, 206])
+        resumed_at = int(self.stand_in.requests[1]["Range"][len("bytes="):-1])
+        # Resumed from what reached the disk: at most the last partial chunk is sent again
+        self.assertGreater(resumed_at, CUT - downloader.DOWNLOAD_CHUNK_SIZE)
+        self.assertLessEqual(resumed_at, CUT)
+        self.assertEqual(self.stand_in.requests[1]["If-Range"], StandIn.etag(ARTIFACT))
+        self.assertEqual(self.stand_in.bytes_served, len(ARTIFACT) + CUT - resumed_at)
+        self.assertFalse(os.path.exists(self.part_path))
+        self.assertFalse(os.path.exists(self.part_path + ".validator"))
+
+    def test_server_ignoring_range_is_downloaded_again_whole(self):
+        self.stand_in.support_range = False
+        self.stand_in.disconnects, self.stand_in.disconnect_after = 1, CUT
+        fetch_file(self.url, self.local_path, retries=2)
+
+        self.assertEqual(self.read_local(), ARTIFACT)
+        self.assertEqual(self.stand_in.statuses, [200, 200])
+
+    def test_changed_artifact_is_not_appended_to_the_old_prefix(self):
+        self.stand_in.disconnects, self.stand_in.disconnect_after = 1, CUT
+        with self.assertRaises(DownloadError):
+            fetch_file(self.url, self.local_path, retries=0)
+        self.assertGreater(os.path.getsize(self.part_path), 0)
+
+        changed = os.urandom(len(ARTIFACT))
+        self.stand_in.artifacts["/package.tgz"] = changed
+        fetch_file(self.url, self.local_path, retries=0)
+
+        self.assertEqual(self.read_local(), changed)
+        self.assertEqual(self.stand_in.requests[1]["If-Range"], StandIn.etag(ARTIFACT))
+        self.assertEqual(self.stand_in.statuses[-1], 200)
+
+    def test_part_without_validator_or_hash_is_discarded(self):
+        with open(self.part_path, 'wb') as f:
+            f.write(b"stale bytes from another version")
+        fetch_file(self.url, self.local_path, retries=0)
+
+        self.assertEqual(self.read_local(), ARTIFACT)
+        self.assertNotIn("Range", self.stand_in.requests[0])
+
+    def test_part_without_validator_is_resumed_when_hashed(self):
+        with open(self.part_path, 'wb') as f:
+            f.write(ARTIFACT[:CUT])
+        fetch_file(self.url, self.local_path, sha256=hashlib.sha256(ARTIFACT).hexdigest(), retries=0)
+
+        self.assertEqual(self.read_local(), ARTIFACT)
+        self.assertEqual(self.stand_in.statuses, [206])
+
+    def test_sha256_mismatch(self):
+        with self.assertRaises(DownloadError) as raised:
+            fetch_file(self.url, self.local_path, sha256="0" * 64, retries=1)
+
+        self.assertIn("SHA-256 mismatch", str(raised.exception))
+        self.assertFalse(os.path.exists(self.local_path))
+        # The corrupt part is not resumed on the retry
+        self.assertFalse(os.path.exists(self.part_path))
+        self.assertNotIn("Range", self.stand_in.requests[1])
+
+    def test_404_is_not_retried(self):
+        with self.assertRaises(DownloadError) as raised:
+            fetch_file(self.stand_in.url("/missing.tgz"), self.local_path, retries=3)
+
+        self.assertFalse(raised.exception.retryable)
+        self.assertEqual(self.stand_in.statuses, [404])
+        self.assertFalse(os.path.exists(self.local_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
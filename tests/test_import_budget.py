@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+from typing import List, Tuple
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+RUNS = 3
+
+
+def import_profile() -> Tuple[List[str], int]:
+    """
+    Run `python -X importtime main.py --help` and return the modules the
+    installer imports (everything after `site`) and their cumulative import
+    time in microseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "main.py", "--help"],
+                            cwd=REPO_DIR, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    # import time:  self [us] | cumulative | imported package, nested imports indented by two more spaces
+    rows = [line.split("|") for line in result.stderr.splitlines()
+            if line.startswith("import time:") and "imported package" not in line]
+    site_row = max(index for index, row in enumerate(rows) if row[2] == " site")
+    rows = rows[site_row + 1:]
+    cumulative = sum(int(row[1]) for row in rows if not row[2].startswith("  "))
+    # A submodule imported through its package is listed twice
+    return list(dict.fromkeys(row[2].strip() for row in rows)), cumulative
+
+
+class ImportBudgetTest(unittest.TestCase):
+    """
+    Startup must stay cheap: `main.py --help` may import no more modules and
+    take no longer than tests/import_budget.json allows, and never the heavy
+    modules that are only loaded when a feature needs them. When a change
+    legitimately needs more, raise the budget in the same commit.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        with open(BUDGET_PATH, 'r') as f:
+            cls.budget = json.load(f)
+        profiles = [import_profile() for _ in range(RUNS)]
+        cls.modules = profiles[0][0]
+        # The fastest run is the least disturbed by the rest of the machine
+        cls.cumulative_ms = min(cumulative for _, cumulative in profiles) / 1000
+
+    def test_module_count(self):
+        self.assertLessEqual(len(self.modules), self.budget["max_modules"],
+                             f"main.py imports {len(self.modules)} modules: {self.modules}")
+
+    def test_cumulative_time(self):
+        self.assertLessEqual(self.cumulative_ms, self.budget["max_cumulative_ms"],
+                             f"Imports took {self.cumulative_ms:.1f} ms")
+
+    def test_deferred_modules(self):
+        loaded = sorted(set(self.budget["deferred_modules"]) & set(self.modules))
+        self.assertEqual(loaded, [], f"Imported at startup although only some runs need them: {loaded}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import importlib.util
+import unittest
+from src.utils import json_codec
+
+# Input the fast decoders are stricter about, or that they would encode differently
+FALLBACK_DOCUMENTS = [
+    '{"a": NaN}',
+    '{"a": Infinity, "b": -Infinity}',
+    '{"a": 1e400}',
+    '{"a": [1, {"b": NaN}], "c": null}',
+    '{"a": 123456789012345678901234567890}',
+    '{"a": -9223372036854775809}',
+    '{"a": 18446744073709551616}',
+    '{"a": "\\ud800"}',
+]
+# Input the fast backends handle themselves
+FAST_DOCUMENTS = [
+    '{"a": null, "b": 1.5, "c": [true, false]}',
+    '{"z": 1, "a": {"y": "x"}, "m": []}',
+    '{"a": "caf\\u00e9", "b": "\\u2603"}',
+    '{"a": 9223372036854775807, "b": -9223372036854775808}',
+]
+LAYOUTS = [
+    {"indent": None, "separators": (",", ":")},
+    {"indent": None, "separators": (", ", ": ")},
+    {"indent": 2, "separators": (",", ": ")},
+    {"indent": 4, "separators": (",", ": ")},
+    {"indent": "\t", "separators": (",", ": ")},
+]
+
+
+def available_codecs():
+    codecs = [json_codec._stdlib_codec()]
+    if importlib.util.find_spec("orjson"):
+        codecs.append(json_codec._orjson_codec())
+    if importlib.util.find_spec("msgspec"):
+        codecs.append(json_codec._msgspec_codec())
+    return codecs
+
+
+class JsonCodecTest(unittest.TestCase):
+    """Every backend must read and write exactly what the stdlib does, whichever path it takes."""
+
+    def assert_like_stdlib(self, codec, document):
+        expected = json.loads(document)
+        value = codec.loads(document)
+        # Compared as stdlib text, since NaN != NaN
+        self.assertEqual(json.dumps(value), json.dumps(expected), f"{codec.name} decoding {document}")
+        for layout in LAYOUTS:
+            for ensure_ascii in (True, False):
+                self.assertEqual(codec.dumps(value, ensure_ascii=ensure_ascii, **layout),
+                                 json.dumps(expected, ensure_ascii=ensure_ascii, **layout),
+                                 f"{codec.name} encoding {document} with {layout}")
+
+    def test_fallback_documents(self):
+        for codec in available_codecs():
+            for document in FALLBACK_DOCUMENTS:
+                self.assert_like_stdlib(codec, document)
+
+    def test_fast_documents(self):
+        for codec in available_codecs():
+            for document in FAST_DOCUMENTS:
+                self.assert_like_stdlib(codec, document)
+
+    def test_non_finite_floats_are_not_written_as_null(self):
+        for codec in available_codecs():
+            self.assertEqual(codec.dumps({"a": float("nan")}, separators=(",", ":")), '{"a":NaN}')
+            self.assertEqual(codec.dumps([float("inf")], indent=2), '[\n  Infinity\n]')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+from src.utils.json_format import JsonFormat, detect_format
+from src.installers.claude_code.mac.mcp_config_creator import ClaudeCodeMacMCPConfigEditor
+from src.installers.cursor.mac.mcp_config_creator import CursorMacMCPConfigEditor
+
+DOCUMENT = {
+    "mcpServers": {"filesystem": {"command": "npx", "args": ["-y", "@modelcontextprotocol/server-filesystem", "/tmp"]}},
+    "numStartups": 12,
+    "tips": [],
+    "theme": "dark",
+    "nested": {"a": [1, 2, {"b": None}], "c": True},
+}
+
+# (indent, separators, newline, trailing newline) of the styles clients write
+STYLES = {
+    "compact": (None, (",", ":"), "\n", False),
+    "spaced": (None, (", ", ": "), "\n", False),
+    "indent 2": (2, (",", ": "), "\n", True),
+    "indent 4": (4, (",", ": "), "\n", False),
+    "tabs": ("\t", (",", ": "), "\n", True),
+    "CRLF": (2, (",", ": "), "\r\n", True),
+}
+
+
+def render(value, indent, separators, newline, trailing_newline) -> str:
+    text = json.dumps(value, indent=indent, separators=separators).replace("\n", newline)
+    return text + (newline if trailing_newline else "")
+
+
+def large_compact_config(target_size: int) -> dict:
+    """A Claude Code config of about `target_size` bytes: mostly project history, a few servers."""
+    projects = {}
+    history = [{"display": "refactor the parser " * 8, "pastedContents": {}} for _ in range(4)]
+    size = 0
+    while size < target_size:
+        project = {"allowedTools": [], "history": history, "hasTrustDialogAccepted": True}
+        if len(projects) % 1000 == 0:
+            project["mcpServers"] = {f"local-{len(projects)}": {"command": "node", "args": ["server.js"]}}
+        projects[f"/Users/dev/src/project-{len(projects)}"] = project
+        size += len(json.dumps(project, separators=(",", ":"))) + 40
+    return {"numStartups": 40, "mcpServers": DOCUMENT["mcpServers"], "projects": projects}
+
+
+class DetectFormatTest(unittest.TestCase):
+
+    def test_styles_are_detected(self):
+        for name, (indent, separators, newline, trailing_newline) in STYLES.items():
+            detected = detect_format(render(DOCUMENT, indent, separators, newline, trailing_newline))
+            self.assertEqual((detected.indent, detected.separators, detected.newline, detected.trailing_newline),
+                             (indent, separators, newline, trailing_newline), name)
+
+    def test_styles_round_trip(self):
+        for name, style in STYLES.items():
+            text = render(DOCUMENT, *style)
+            self.assertEqual(detect_format(text).dumps_document(json.loads(text)), text, name)
+
+    def test_single_separator_documents_stay_in_their_style(self):
+        self.assertEqual(detect_format('{"a":1}').separators, (",", ":"))
+        self.assertEqual(detect_format('{"a": 1}').separators, (", ", ": "))
+        self.assertEqual(detect_format('[1,2]').separators, (",", ":"))
+        self.assertEqual(detect_format('[1, 2]').separators, (", ", ": "))
+        # Neither separator: the defaults
+        self.assertEqual(detect_format('[]').separators, (", ", ": "))
+
+    def test_non_ascii_is_kept_raw_only_if_it_was(self):
+        self.assertFalse(detect_format('{"a": "café"}').ensure_ascii)
+        self.assertTrue(detect_format('{"a": "caf\\u00e9"}').ensure_ascii)
+
+    def test_empty_document_uses_the_default(self):
+        default = JsonFormat(indent=2)
+        self.assertIs(detect_format("  \n", default), default)
+
+
+class InstallSizeTest(unittest.TestCase):
+    """Installing into a compact config must only add our entries, not reformat the file."""
+
+    CONFIG_SIZE = 20 * 1024 * 1024
+
+    @classmethod
+    def setUpClass(cls):
+        cls.text = json.dumps(large_compact_config(cls.CONFIG_SIZE), separators=(",", ":"))
+
+    def setUp(self):
+        self.home = tempfile.TemporaryDirectory()
+        home = mock.patch.dict(os.environ, {"HOME": self.home.name})
+        home.start()
+        self.addCleanup(home.stop)
+
+    def tearDown(self):
+        self.home.cleanup()
+
+    def check_install(self, editor):
+        path = editor.config_file_path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(self.text)
+        before = os.path.getsize(path)
+
+        self.assertTrue(editor.update_config())
+        after = os.path.getsize(path)
+        print(f"\n{editor.app_name}: {before} bytes before install, {after} after (+{after - before})")
+        # Our main proxy entry plus the wrapping of the existing servers, nothing else
+        self.assertLess(after - before, 8 * 1024)
+        with open(path, 'r') as f:
+            self.assertEqual(detect_format(f.read()).separators, (",", ":"))
+
+        editor.restore_config()
+        with open(path, 'r') as f:
+            self.assertEqual(f.read(), self.text)
+
+    def test_claude_code_splice(self):
+        self.check_install(ClaudeCodeMacMCPConfigEditor({}))
+
+    def test_full_rewrite(self):
+        self.check_install(CursorMacMCPConfigEditor({}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+from src.utils import json_stream
+from src.utils.json_format import detect_format
+from src.utils.json_splice import scan_mcp_servers
+from src.utils.mcp_index import McpServerIndex
+from tests import bench_claude_config, bench_mcp_index
+
+SERVERS = {"filesystem": {"command": "npx", "args": ["-y", "server-filesystem", "/tmp/ü"]}}
+
+DOCUMENT = {
+    "numStartups": 3,
+    "tips": ["a \"quoted\" \\ tip", {"nested": [1, 2.5e-3, None, True]}],
+    "mcpServers": SERVERS,
+    "projects": {
+        "/Users/dev/café": {"allowedTools": [], "mcpServers": {"local": {"command": "node"}}},
+        "/Users/dev/other": {"history": [{"display": "{[\"}"}], "mcpServers": {}},
+    },
+    "theme": "dark",
+}
+
+
+class ScanTest(unittest.TestCase):
+    """The streaming scan must find the same spans, as byte offsets, at any chunk boundary."""
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.work_dir.name, "config.json")
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write(self, data: bytes) -> None:
+        with open(self.path, 'wb') as f:
+            f.write(data)
+
+    def check_spans(self, data: bytes) -> None:
+        self.write(data)
+        for chunk_size in (1, 3, 7, 64, json_stream.READ_CHUNK_SIZE):
+            with mock.patch.object(json_stream, "READ_CHUNK_SIZE", chunk_size):
+                scan = scan_mcp_servers(self.path)
+            document = json.loads(data.decode('utf-8-sig'))
+            self.assertEqual([span.path for span in scan.spans], [
+                ("mcpServers",),
+                ("projects", "/Users/dev/café", "mcpServers"),
+                ("projects", "/Users/dev/other", "mcpServers"),
+            ], chunk_size)
+            for span in scan.spans:
+                value = document
+                for key in span.path:
+                    value = value[key]
+                self.assertEqual(json.loads(data[span.start:span.end]), value, chunk_size)
+                line_start = data.rfind(b"\n", 0, span.start) + 1
+                line = data[line_start:span.start].decode('utf-8')
+                self.assertEqual(span.indent, line[:len(line) - len(line.lstrip(" \t"))], chunk_size)
+            self.assertEqual(data[scan.root_start - 1:scan.root_start], b"{")
+            self.assertEqual(data[scan.root_last_value_end - 1:scan.root_last_value_end], b'"')
+            self.assertEqual(scan.trailing_newline, data.endswith(b"\n"))
+            self.assertEqual(scan.is_ascii, data.isascii())
+
+    def test_styles(self):
+        for indent, ensure_ascii in ((None, True), (None, False), (2, False), (4, True), ("\t", False)):
+            text = json.dumps(DOCUMENT, indent=indent, ensure_ascii=ensure_ascii)
+            self.check_spans(text.encode('utf-8'))
+            self.check_spans((text + "\n").replace("\n", "\r\n").encode('utf-8'))
+
+    def test_byte_order_mark(self):
+        self.check_spans(b"\xef\xbb\xbf" + json.dumps(DOCUMENT, indent=2).encode('utf-8'))
+
+    def test_member_indent(self):
+        self.write(json.dumps(DOCUMENT, indent=3).encode('utf-8'))
+        self.assertEqual(scan_mcp_servers(self.path).member_indent, "   ")
+        self.write(b'{}')
+        scan = scan_mcp_servers(self.path)
+        self.assertEqual((scan.spans, scan.root_last_value_end, scan.member_indent), ([], None, ""))
+
+    def test_invalid_documents_are_rejected(self):
+        for data in (b"", b"[]", b'{"a": 1', b'{"a": 1} x', b'{"a" 1}', b'{"a": tru}', b'{"a": 1,}',
+                     b'{"mcpServers": {"a": 1}', b'{"a": "unterminated}'):
+            self.write(data)
+            with self.assertRaises(ValueError, msg=data):
+                scan_mcp_servers(self.path)
+
+
+class IndexBuildTest(unittest.TestCase):
+
+    def test_format_matches_the_whole_document(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, "config.json")
+            for indent, ensure_ascii in ((None, True), (2, False), ("\t", True)):
+                text = json.dumps(DOCUMENT, indent=indent, ensure_ascii=ensure_ascii) + "\n"
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                index = McpServerIndex.build(path)
+                self.assertEqual(index.format.to_dict(), detect_format(text).to_dict())
+                self.assertEqual(index.read_global_servers(), SERVERS)
+
+
+class SpliceMemoryTest(unittest.TestCase):
+    """Runs tests/bench_claude_config.py on two small sizes; run it by hand for the 1/50/200 MB table."""
+
+    def test_splice_memory_does_not_follow_the_file_size(self):
+        results = bench_claude_config.run([2, 16])
+        print(f"\n{results}")
+        self.assertLess(results[16]["splice"]["peak_rss_mb"] - results[2]["splice"]["peak_rss_mb"], 6)
+        self.assertGreater(results[16]["load_dump"]["peak_rss_mb"] - results[2]["load_dump"]["peak_rss_mb"], 20)
+
+
+class ScalingTest(unittest.TestCase):
+    """Runs tests/bench_mcp_index.py: with a stored index, planning follows the servers, not the projects."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.results = bench_mcp_index.run([1000, 10000], [20, 200])
+
+    def test_warm_plan_does_not_read_the_projects(self):
+        small, large = self.results[1000][20], self.results[10000][20]
+        if "warm_plan_bytes_read" not in large:
+            self.skipTest("The OS does not report bytes read")
+        self.assertLess(abs(large["warm_plan_bytes_read"] - small["warm_plan_bytes_read"]), 4096)
+        self.assertLess(large["warm_plan_bytes_read"], large["config_bytes"] / 20)
+
+    def test_warm_plan_follows_the_servers(self):
+        few, many = self.results[10000][20], self.results[10000][200]
+        if "warm_plan_bytes_read" not in few:
+            self.skipTest("The OS does not report bytes read")
+        self.assertGreater(many["warm_plan_bytes_read"], 5 * few["warm_plan_bytes_read"])
+
+    def test_warm_plan_is_cheaper_than_a_scan(self):
+        cost = self.results[10000][20]
+        self.assertLess(cost["warm_plan_s"], cost["cold_scan_s"] / 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import stat
+import shutil
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+from src.base.base_installer import BaseInstaller
+from src.consts import NPM_CACHE_NAME, PACKAGE_NAME
+from src.utils.proxy_resolver import invalidate_binaries
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Logs its arguments, and installs by creating the package and its bin link
+# under $npm_config_prefix; FAKE_NPM_MODE makes offline installs fail or hang
+FAKE_NPM = """#!/bin/sh
+printf '%s\\n' "$*" >> "$FAKE_NPM_LOG"
+if [ "$1" = root ]; then
+    echo "$npm_config_prefix/lib/node_modules"
+    exit 0
+fi
+case "$FAKE_NPM_MODE:$*" in
+    hang:*--offline*) exec sleep 60 ;;
+    fail-offline:*--offline*) echo "npm error ENOTCACHED" >&2; exit 1 ;;
+esac
+package_dir="$npm_config_prefix/lib/node_modules/mint-mcp-proxy-server"
+mkdir -p "$package_dir" "$npm_config_prefix/bin"
+echo '{"name": "mint-mcp-proxy-server", "version": "2.1.0"}' > "$package_dir/package.json"
+printf '#!/bin/sh\\n' > "$package_dir/cli.js"
+chmod +x "$package_dir/cli.js"
+ln -sf "$package_dir/cli.js" "$npm_config_prefix/bin/mint-mcp-proxy-server"
+"""
+
+
+class OfflineInstallTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        work = self.work_dir.name
+        bin_dir = os.path.join(work, "bin")
+        os.makedirs(bin_dir)
+        npm_path = os.path.join(bin_dir, "npm")
+        with open(npm_path, 'w') as f:
+            f.write(FAKE_NPM)
+        os.chmod(npm_path, os.stat(npm_path).st_mode | stat.S_IXUSR)
+
+        self.npm_log = os.path.join(work, "npm.log")
+        self.prefix = os.path.join(work, "prefix")
+        environment = mock.patch.dict(os.environ, {
+            "HOME": os.path.join(work, "home"),
+            "PATH": bin_dir + os.pathsep + os.environ.get("PATH", ""),
+            "npm_config_prefix": self.prefix,
+            "FAKE_NPM_LOG": self.npm_log,
+            "FAKE_NPM_MODE": "ok",
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+        invalidate_binaries()
+        self.addCleanup(invalidate_binaries)
+
+        self.package_path = os.path.join(work, "dist", PACKAGE_NAME)
+        os.makedirs(os.path.dirname(self.package_path))
+        shutil.copy(os.path.join(REPO_DIR, PACKAGE_NAME), self.package_path)
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def bundle_cache(self) -> None:
+        cacache = os.path.join(self.work_dir.name, "_cacache")
+        os.makedirs(os.path.join(cacache, "index-v5"))
+        with tarfile.open(os.path.join(os.path.dirname(self.package_path), NPM_CACHE_NAME), "w:gz") as tar:
+            tar.add(cacache, arcname="_cacache")
+
+    def npm_installs(self):
+        with open(self.npm_log, 'r') as f:
+            return [line.split() for line in f.read().splitlines() if line.startswith("install")]
+
+    def test_installs_offline_from_the_bundled_cache(self):
+        self.bundle_cache()
+        self.assertTrue(BaseInstaller.install_application(self.package_path))
+
+        [install] = self.npm_installs()
+        self.assertEqual(install[:3], ["install", "-g", self.package_path])
+        self.assertIn("--offline", install)
+        cache_dir = install[install.index("--cache") + 1]
+        self.assertTrue(cache_dir.startswith(os.path.join(os.environ["HOME"], ".mint")))
+        self.assertTrue(os.path.isdir(os.path.join(cache_dir, "_cacache", "index-v5")))
+        self.assertTrue(BaseInstaller.is_application_installed())
+
+    def test_without_a_bundled_cache_installs_from_the_registry(self):
+        self.assertTrue(BaseInstaller.install_application(self.package_path))
+        self.assertEqual(self.npm_installs(), [["install", "-g", self.package_path]])
+
+    def test_failed_offline_install_retries_against_the_registry(self):
+        self.bundle_cache()
+        os.environ["FAKE_NPM_MODE"] = "fail-offline"
+        self.assertTrue(BaseInstaller.install_application(self.package_path))
+
+        installs = self.npm_installs()
+        self.assertEqual(len(installs), 2)
+        self.assertIn("--offline", installs[0])
+        self.assertEqual(installs[1], ["install", "-g", self.package_path])
+
+    def test_timed_out_offline_install_is_not_retried(self):
+        self.bundle_cache()
+        os.environ["FAKE_NPM_MODE"] = "hang"
+        self.assertFalse(BaseInstaller.install_application(self.package_path, npm_timeout=1))
+
+        installs = self.npm_installs()
+        self.assertEqual(len(installs), 1)
+        self.assertIn("--offline", installs[0])
+        self.assertFalse(BaseInstaller.is_application_installed())
+
+    def test_already_installed_package_skips_npm(self):
+        self.assertTrue(BaseInstaller.install_application(self.package_path))
+        self.assertTrue(BaseInstaller.install_application(self.package_path))
+        self.assertEqual(len(self.npm_installs()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
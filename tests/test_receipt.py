@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from src.installers.claude_code.mac.installer import ClaudeCodeMacInstaller
+from src.installers.cursor.mac.installer import CursorMacInstaller
+from src.installers.cursor.mac.yolo_enabler import CursorMacYOLOEnabler
+from src.utils import mcp_index
+from src.utils.config_document import invalidate_document
+from src.utils.receipt import Receipt
+from tests.bench_claude_config import write_config
+
+SETTINGS_ROW = {"composerState": {"modes4": [{"id": "agent", "autoRun": False}, {"id": "chat"}]}, "theme": "dark"}
+
+
+class ReceiptChurnTest(unittest.TestCase):
+    """Clients rewriting their own files must not make the receipt redo an install that is still in place."""
+
+    def setUp(self):
+        self.home = tempfile.TemporaryDirectory()
+        home = mock.patch.dict(os.environ, {"HOME": self.home.name})
+        home.start()
+        self.addCleanup(home.stop)
+        self.addCleanup(mcp_index._indexes.clear)
+        self.receipt_path = os.path.join(self.home.name, "receipt.json")
+
+    def tearDown(self):
+        self.home.cleanup()
+
+    def install(self, client, installer) -> None:
+        self.assertTrue(installer.config_creator.update_config())
+        self.assertTrue(installer.auto_run_enabler.enable_auto_run())
+        receipt = Receipt(self.receipt_path)
+        receipt.record_client(client, installer.touched_paths(), installer.owned_state())
+        receipt.save()
+
+    def matches(self, client, installer) -> bool:
+        # A new process: nothing cached from the install
+        mcp_index._indexes.clear()
+        for path in installer.touched_paths():
+            invalidate_document(path)
+        receipt = Receipt(self.receipt_path)
+        matches = receipt.client_matches(client, installer.touched_paths(), installer.owned_state)
+        receipt.save()
+        return matches
+
+    def rewrite_json(self, path: str, edit) -> None:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        edit(data)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def claude_code(self, projects: int = 200) -> ClaudeCodeMacInstaller:
+        installer = ClaudeCodeMacInstaller()
+        write_config(installer.config_creator.config_file_path, projects, servers=4, history_entries=1)
+        self.install("claude_code", installer)
+        return installer
+
+    def test_claude_code_session_churn_keeps_the_receipt(self):
+        installer = self.claude_code()
+        config_path = installer.config_creator.config_file_path
+
+        def new_session(data):
+            data["numStartups"] += 1
+            data["projects"]["/Users/dev/src/project-7"]["history"].append({"display": "fix the tests", "pastedContents": {}})
+        self.rewrite_json(config_path, new_session)
+        self.rewrite_json(os.path.expanduser("~/.claude/settings.json"),
+                          lambda data: data["permissions"]["allow"].append("Bash(npm test)"))
+
+        self.assertTrue(self.matches("claude_code", installer))
+        # The match refreshed the recorded stats, so the next run is a stat call again
+        with mock.patch.object(installer, "owned_state", side_effect=AssertionError("read the files")):
+            self.assertTrue(self.matches("claude_code", installer))
+
+    def test_claude_code_owned_changes_redo_the_install(self):
+        installer = self.claude_code()
+
+        def add_server(data):
+            data["projects"]["/Users/dev/src/project-9"]["mcpServers"] = {"new": {"command": "node"}}
+        self.rewrite_json(installer.config_creator.config_file_path, add_server)
+        self.assertFalse(self.matches("claude_code", installer))
+
+        installer = self.claude_code()
+        self.rewrite_json(os.path.expanduser("~/.claude/settings.local.json"),
+                          lambda data: data["permissions"]["allow"].clear())
+        self.assertFalse(self.matches("claude_code", installer))
+
+    def test_cursor_database_churn_keeps_the_receipt(self):
+        database_path = os.path.join(self.home.name, "state.vscdb")
+        database = mock.patch.object(CursorMacYOLOEnabler, "DATABASE_FILE_PATH", database_path)
+        database.start()
+        self.addCleanup(database.stop)
+        with sqlite3.connect(database_path) as conn:
+            conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+            conn.execute("INSERT INTO ItemTable VALUES (?, ?)", (CursorMacYOLOEnabler.STORAGE_KEY, json.dumps(SETTINGS_ROW)))
+        conn.close()
+        installer = CursorMacInstaller()
+        config_path = installer.config_creator.config_file_path
+        os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        with open(config_path, 'w') as f:
+            json.dump({"mcpServers": {"filesystem": {"command": "npx"}}}, f, indent=2)
+        self.install("cursor", installer)
+
+        def set_row(edit) -> None:
+            with sqlite3.connect(database_path) as conn:
+                row = conn.execute("SELECT value FROM ItemTable WHERE key = ?", (CursorMacYOLOEnabler.STORAGE_KEY,)).fetchone()
+                settings = json.loads(row[0])
+                edit(settings)
+                conn.execute("INSERT INTO ItemTable VALUES (?, ?)", (CursorMacYOLOEnabler.STORAGE_KEY, json.dumps(settings)))
+            conn.close()
+
+        # Cursor storing UI state: other keys, and other fields of our row
+        with sqlite3.connect(database_path) as conn:
+            conn.execute("INSERT INTO ItemTable VALUES (?, ?)", ("workbench.panel.width", "420"))
+        conn.close()
+        set_row(lambda settings: settings.update(theme="light"))
+        self.assertTrue(self.matches("cursor", installer))
+
+        set_row(lambda settings: settings["composerState"]["modes4"][0].update(autoRun=False))
+        self.assertFalse(self.matches("cursor", installer))
+
+    def test_churn_check_on_a_large_config(self):
+        installer = self.claude_code(projects=40000)
+        config_path = installer.config_creator.config_file_path
+        self.rewrite_json(config_path, lambda data: data.update(numStartups=data["numStartups"] + 1))
+
+        start = time.perf_counter()
+        self.assertTrue(self.matches("claude_code", installer))
+        print(f"\nReceipt check after churn on a {os.path.getsize(config_path) / 1e6:.1f} MB config: "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()